@@ -0,0 +1,139 @@
+"""
+Tracker 层压测
+
+默认在本地启动站点替身服务器，通过真实的 HTTP 路径（传输层、限流器、熔断器、解析）
+压测 MTeamTracker，输出每秒搜索次数和 p50/p99 延迟。调整限流、连接池等参数后用它对比效果。
+
+用法（在仓库根目录执行）：
+    python -m benchmarks.bench_trackers --requests 500 --concurrency 16 --latency 0.02 --jitter 0.01
+    python -m benchmarks.bench_trackers --mode async --throttle-rate 0.02 --fixtures recorded.json
+    python -m benchmarks.bench_trackers --url http://127.0.0.1:8765   # 使用已运行的替身服务器
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from torrentbotx.trackers.breaker import CircuitBreaker
+from torrentbotx.trackers.mteam import MTeamTracker
+from torrentbotx.trackers.ratelimit import AdaptiveRateLimiter
+from benchmarks.standin import StandInTracker, load_fixtures
+from torrentbotx.trackers.transport import TrackerTransport
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """
+    计算百分位数（最近秩法）
+    :param samples: 已排序的样本
+    :param pct: 百分位，0-100
+    :return: 百分位数，样本为空时为 0
+    """
+    if not samples:
+        return 0.0
+    rank = max(0, min(len(samples) - 1, int(round(pct / 100 * len(samples))) - 1))
+    return samples[rank]
+
+
+def build_tracker(args, base_url: str) -> MTeamTracker:
+    """按命令行参数创建压测用的 Tracker，关闭搜索缓存以测量真实请求"""
+    tracker = MTeamTracker(
+        api_key="bench",
+        base_url=base_url,
+        rate_limiter=AdaptiveRateLimiter(rate=args.rate, burst=args.burst, max_concurrency=args.concurrency),
+        transport=TrackerTransport(pool_maxsize=args.concurrency),
+        circuit_breaker=CircuitBreaker("bench", failure_threshold=args.failure_threshold),
+    )
+    tracker.search_cache = None
+    return tracker
+
+
+def timed(func, *args) -> tuple:
+    started = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - started, result is not None
+
+
+def run_sync(tracker: MTeamTracker, args) -> List[tuple]:
+    """线程池并发调用同步 search_torrents"""
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        futures = [executor.submit(timed, tracker.search_torrents, args.keyword, 1, args.page_size)
+                   for _ in range(args.requests)]
+        return [future.result() for future in futures]
+
+
+def run_async(tracker: MTeamTracker, args) -> List[tuple]:
+    """单个事件循环内以信号量控制并发调用 async_search_torrents"""
+    async def run():
+        semaphore = asyncio.Semaphore(args.concurrency)
+        async with tracker.transport.new_async_client() as client:
+            async def one():
+                async with semaphore:
+                    started = time.perf_counter()
+                    result = await tracker.async_search_torrents(args.keyword, 1, args.page_size, client=client,
+                                                                 use_cache=False)
+                    return time.perf_counter() - started, result is not None
+
+            return await asyncio.gather(*(one() for _ in range(args.requests)))
+
+    return asyncio.run(run())
+
+
+def report(samples: List[tuple], elapsed: float, standin: Optional[StandInTracker], tracker: MTeamTracker) -> None:
+    latencies = sorted(latency for latency, _ in samples)
+    ok = sum(1 for _, success in samples if success)
+    print(f"请求数: {len(samples)}  成功: {ok}  失败: {len(samples) - ok}")
+    print(f"耗时: {elapsed:.2f}s  吞吐: {len(samples) / elapsed:.1f} 次搜索/秒")
+    print(f"延迟 p50: {percentile(latencies, 50) * 1000:.1f}ms  "
+          f"p99: {percentile(latencies, 99) * 1000:.1f}ms  max: {latencies[-1] * 1000:.1f}ms")
+    print(f"限流器: {tracker.rate_limiter.stats}")
+    print(f"熔断器: {tracker.circuit_breaker.stats}")
+    if standin is not None:
+        print(f"替身服务器: {standin.stats}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Tracker 层压测")
+    parser.add_argument("--url", help="已运行的替身服务器地址，为空时在本进程内启动")
+    parser.add_argument("--mode", choices=("sync", "async"), default="sync")
+    parser.add_argument("--requests", type=int, default=200, help="搜索请求总数")
+    parser.add_argument("--concurrency", type=int, default=8, help="并发数（同时作为限流器并发上限和连接池大小）")
+    parser.add_argument("--rate", type=float, default=1000.0, help="限流器每秒请求数")
+    parser.add_argument("--burst", type=int, default=100, help="限流器突发请求数")
+    parser.add_argument("--failure-threshold", type=int, default=1000, help="熔断阈值")
+    parser.add_argument("--keyword", default="bench")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--fixtures", help="录制的响应文件（JSON）")
+    parser.add_argument("--latency", type=float, default=0.0, help="替身服务器基础延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.0, help="替身服务器延迟抖动（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="替身服务器返回 500 的概率")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="替身服务器返回 429 的概率")
+    parser.add_argument("--retry-after", type=int, default=0, help="429 响应的 Retry-After（秒）")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    standin = None
+    if args.url:
+        base_url = args.url
+    else:
+        standin = StandInTracker(
+            fixtures=load_fixtures(args.fixtures) if args.fixtures else None,
+            latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+            throttle_rate=args.throttle_rate, retry_after=args.retry_after, seed=args.seed,
+        ).start()
+        base_url = standin.url
+
+    tracker = build_tracker(args, base_url)
+    try:
+        started = time.perf_counter()
+        samples = run_sync(tracker, args) if args.mode == "sync" else run_async(tracker, args)
+        report(samples, time.perf_counter() - started, standin, tracker)
+    finally:
+        tracker.transport.close()
+        if standin is not None:
+            standin.stop()
+
+
+if __name__ == "__main__":
+    main()
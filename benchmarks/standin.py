@@ -0,0 +1,255 @@
+"""
+站点替身服务器
+
+在本地提供 M-Team 风格的 /api/torrent/search、/detail、/genDlToken 接口，回放录制的响应，
+并可注入延迟、抖动、错误率和 429 限流，用于离线测试和压测 Tracker 层，而不请求真实站点。
+
+录制：record_fixtures(tracker, keywords, torrent_ids, path)
+运行：python -m benchmarks.standin --port 8765 --latency 0.05 --throttle-rate 0.01
+"""
+
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, Optional
+
+from torrentbotx.trackers.common import BaseTracker
+from torrentbotx.utils.logger import get_logger
+
+logger = get_logger("benchmarks.standin")
+
+SEARCH_PATH = "/api/torrent/search"
+DETAIL_PATH = "/api/torrent/detail"
+DOWNLOAD_PATH = "/api/torrent/genDlToken"
+
+
+def default_fixtures(page_size: int = 50) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    生成一组合成的响应，没有录制文件时使用
+    :param page_size: 搜索结果每页的种子数量
+    :return: 接口路径 -> 响应列表
+    """
+    torrents = [
+        {
+            "id": str(100000 + i),
+            "name": f"Stand-In.Torrent.{i}.2024.1080p.WEB-DL",
+            "smallDescr": f"替身种子 {i}",
+            "size": str((i + 1) * 1024 ** 3),
+            "category": "401",
+            "createdDate": "2024-01-01 00:00:00",
+            "status": {"seeders": str(i % 50), "leechers": str(i % 7), "discount": "NORMAL"},
+        }
+        for i in range(page_size)
+    ]
+    return {
+        SEARCH_PATH: [{"message": "SUCCESS", "data": {
+            "pageNumber": "1", "pageSize": str(page_size), "total": str(page_size), "totalPages": "1",
+            "data": torrents,
+        }}],
+        DETAIL_PATH: [{"message": "SUCCESS", "data": torrents[0]}],
+        DOWNLOAD_PATH: [{"message": "SUCCESS", "data": "https://stand-in.invalid/download?credential=token"}],
+    }
+
+
+def load_fixtures(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    读取录制的响应文件，单个响应会被视为只有一项的列表
+    :param path: JSON 文件路径，格式为 {接口路径: 响应或响应列表}
+    :return: 接口路径 -> 响应列表
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {route: value if isinstance(value, list) else [value] for route, value in data.items()}
+
+
+def record_fixtures(tracker: BaseTracker, keywords: Iterable[str], torrent_ids: Iterable[str] = (),
+                    path: Optional[str] = None, page_size: int = 50) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    请求真实站点并录制原始响应
+    :param tracker: Tracker 实例
+    :param keywords: 需要录制的搜索关键词
+    :param torrent_ids: 需要录制详情和下载链接的种子ID
+    :param path: 保存的 JSON 文件路径，为空时不保存
+    :param page_size: 搜索结果每页的种子数量
+    :return: 接口路径 -> 响应列表
+    """
+    fixtures: Dict[str, List[Dict[str, Any]]] = {SEARCH_PATH: [], DETAIL_PATH: [], DOWNLOAD_PATH: []}
+    requests_to_record = [(SEARCH_PATH, tracker.search_path, {"json": tracker.build_search_payload(k, 1, page_size)})
+                          for k in keywords]
+    for torrent_id in torrent_ids:
+        requests_to_record.append((DETAIL_PATH, tracker.detail_path, {"data": {"id": torrent_id}}))
+        requests_to_record.append((DOWNLOAD_PATH, tracker.download_path, {"data": {"id": torrent_id}}))
+
+    for route, site_path, kwargs in requests_to_record:
+        response = tracker._post(f"{tracker.base_url}{site_path}", **kwargs)
+        response.raise_for_status()
+        fixtures[route].append(response.json())
+
+    fixtures = {route: responses for route, responses in fixtures.items() if responses}
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(fixtures, f, ensure_ascii=False, indent=2)
+        logger.info(f"已录制 {sum(len(v) for v in fixtures.values())} 个 {tracker.display_name} 响应到 {path}")
+    return fixtures
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # 响应头和响应体分两次写出，关闭 Nagle 算法以免与延迟确认叠加出 40ms 的额外延迟
+    disable_nagle_algorithm = True
+    server: "ThreadingHTTPServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        status, response, headers = self.server.standin.handle(self.path.split("?")[0], body)
+        self._send(status, response, headers)
+
+
+class StandInTracker:
+    def __init__(self, fixtures: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 throttle_rate: float = 0.0, retry_after: int = 1,
+                 host: str = "127.0.0.1", port: int = 0, seed: Optional[int] = None):
+        """
+        站点替身服务器
+        :param fixtures: 接口路径 -> 按顺序循环回放的响应列表，为空时使用 default_fixtures
+        :param latency: 每个请求的基础延迟（秒）
+        :param jitter: 延迟的随机抖动幅度（秒），实际延迟在 latency ± jitter 之间
+        :param error_rate: 返回 500 的概率
+        :param throttle_rate: 返回 429 的概率
+        :param retry_after: 429 响应携带的 Retry-After（秒）
+        :param host: 监听地址
+        :param port: 监听端口，0 表示随机可用端口
+        :param seed: 随机数种子，便于复现
+        """
+        self.fixtures = fixtures or default_fixtures()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.host = host
+        self.port = port
+
+        self.stats: Dict[str, int] = {"requests": 0, "errors": 0, "throttled": 0, "not_found": 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._cycles = {route: itertools.cycle(responses) for route, responses in self.fixtures.items()}
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """服务器地址，可直接作为 Tracker 的 base_url"""
+        return f"http://{self.host}:{self.port}"
+
+    def handle(self, path: str, body: bytes) -> tuple:
+        """
+        生成一个请求的响应
+        :param path: 请求路径
+        :param body: 请求体（替身只用于回放，不校验参数）
+        :return: (状态码, 响应 JSON, 额外响应头)
+        """
+        with self._lock:
+            self.stats["requests"] += 1
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            roll = self._random.random()
+            if roll < self.throttle_rate:
+                outcome = "throttled"
+            elif roll < self.throttle_rate + self.error_rate:
+                outcome = "errors"
+            elif path not in self._cycles:
+                outcome = "not_found"
+            else:
+                outcome = None
+                response = next(self._cycles[path])
+            if outcome:
+                self.stats[outcome] += 1
+
+        if delay:
+            time.sleep(delay)
+        if outcome == "throttled":
+            return 429, {"message": "Too Many Requests"}, {"Retry-After": str(self.retry_after)}
+        if outcome == "errors":
+            return 500, {"message": "Stand-in injected error"}, {}
+        if outcome == "not_found":
+            return 404, {"message": f"Unknown endpoint {path}"}, {}
+        return 200, response, {}
+
+    def start(self) -> "StandInTracker":
+        """在后台线程启动服务器"""
+        self._server = ThreadingHTTPServer((self.host, self.port), _StandInHandler)
+        self._server.daemon_threads = True
+        self._server.standin = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05},
+                                        name="standin-tracker", daemon=True)
+        self._thread.start()
+        logger.info(f"站点替身服务器已启动: {self.url}")
+        return self
+
+    def stop(self) -> None:
+        """停止服务器"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "StandInTracker":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="M-Team 风格站点替身服务器")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", help="录制的响应文件（JSON）")
+    parser.add_argument("--latency", type=float, default=0.0, help="基础延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.0, help="延迟抖动（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回 500 的概率")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="返回 429 的概率")
+    parser.add_argument("--retry-after", type=int, default=1, help="429 响应的 Retry-After（秒）")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    standin = StandInTracker(
+        fixtures=load_fixtures(args.fixtures) if args.fixtures else None,
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate, retry_after=args.retry_after,
+        host=args.host, port=args.port, seed=args.seed,
+    ).start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        standin.stop()
+
+
+if __name__ == "__main__":
+    main()
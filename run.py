@@ -15,8 +15,10 @@ def main():
     )
     core_manager = CoreManager(config=config, notifier=notifier)
     core_manager.start()
-
-    start_bot(config.get("TG_BOT_TOKEN_MT"), core_manager)
+    try:
+        start_bot(config.get("TG_BOT_TOKEN_MT"), core_manager)
+    finally:
+        core_manager.close()
 
 
 if __name__ == "__main__":
@@ -1 +1,6 @@
 # 这个文件用于将 tests 目录标记为一个 Python 包
+import os
+import tempfile
+
+# 使用临时配置文件，避免在源码目录生成 config.yaml；在导入任何 torrentbotx 模块之前设置
+os.environ.setdefault("TORRENTBOTX_CONFIG", os.path.join(tempfile.mkdtemp(), "config.yaml"))
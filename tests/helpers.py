@@ -0,0 +1,31 @@
+"""测试共用的辅助对象"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+
+class Config(dict):
+    """只提供 get 方法的简易配置对象，可代替 Config 传给 CoreManager、注册表等"""
+
+    def get(self, key, default=None):
+        return super().get(key, default)
+
+
+class TempDatabaseTestCase(unittest.TestCase):
+    """每个测试使用独立的临时数据库，测试结束后关闭连接"""
+
+    # 为 False 时不执行迁移，由测试自行建表
+    create_schema = True
+
+    def setUp(self):
+        from torrentbotx.db import connection
+        from torrentbotx.db.models import create_tables
+
+        db_patch = patch.object(connection, "DB_PATH", os.path.join(tempfile.mkdtemp(), "test.db"))
+        db_patch.start()
+        self.addCleanup(db_patch.stop)
+        self.addCleanup(lambda: connection.get_database().close())
+        if self.create_schema:
+            create_tables()
@@ -0,0 +1,143 @@
+import json
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+import websocket
+
+from torrentbotx.downloaders.aria2_monitor import Aria2Monitor
+
+
+def _notification(method, gid):
+    return json.dumps({"jsonrpc": "2.0", "method": method, "params": [{"gid": gid}]})
+
+
+def _refuse():
+    raise ConnectionRefusedError()
+
+
+class TestAria2Monitor(unittest.TestCase):
+
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.TELL_ACTIVE, self.client.TELL_WAITING, self.client.TELL_STOPPED = "a", "w", "s"
+        self.client.tell_status.side_effect = lambda gid, keys: {
+            "gid": gid, "status": "complete", "bittorrent": {"info": {"name": f"name-{gid}"}}}
+        self.monitor = Aria2Monitor(self.client, reconnect_delay=0.01)
+
+    def test_event_updates_mirror_and_notifies(self):
+        # 测试收到通知后立即更新镜像并触发订阅者
+        completed = []
+        self.monitor.subscribe("bt_complete", completed.append)
+        self.monitor.handle_event("bt_complete", "g1")
+        self.assertEqual(completed[0]["gid"], "g1")
+        self.assertEqual(self.monitor.get_downloads("complete")[0]["name"], "name-g1")
+        with self.assertRaises(ValueError):
+            self.monitor.subscribe("unknown", print)
+
+    @patch("torrentbotx.downloaders.aria2_monitor.websocket.create_connection")
+    def test_listener_dispatches_notifications(self, create_connection):
+        # 测试后台线程分发 WebSocket 通知，连接断开后自动重连
+        received = threading.Event()
+        first, second = MagicMock(), MagicMock()
+        first.recv.side_effect = websocket.WebSocketConnectionClosedException()
+        second.recv.side_effect = [websocket.WebSocketTimeoutException(),
+                                   _notification("aria2.onDownloadError", "g2"),
+                                   websocket.WebSocketConnectionClosedException()]
+        sockets = iter([first, second])
+        create_connection.side_effect = lambda *args, **kwargs: next(sockets, None) or _refuse()
+
+        self.monitor.subscribe("error", lambda status: received.set())
+        self.monitor.start()
+        self.assertTrue(received.wait(2))
+        self.monitor.stop()
+        self.assertEqual(self.client.tell_status.call_args[0][0], "g2")
+        first.close.assert_called_once()
+
+    def test_reconcile_skips_when_unchanged(self):
+        # 测试任务数量不变且没有活动任务时，对账只调用 getGlobalStat
+        self.monitor._connected = True
+        self.monitor._thread = MagicMock()
+        self.client.get_global_stat.return_value = {"numActive": "0", "numWaiting": "0", "numStoppedTotal": "1"}
+        self.client.multicall2.return_value = [[[{"gid": "g1", "status": "active"}]], [[]],
+                                               [[{"gid": "g3", "status": "complete"}]]]
+        self.monitor.reconcile()
+        self.assertEqual(len(self.monitor.get_downloads()), 2)
+
+        self.monitor.reconcile()
+        self.assertEqual(self.client.multicall2.call_count, 1)
+
+        self.client.get_global_stat.return_value = {"numActive": "1", "numWaiting": "0", "numStoppedTotal": "1"}
+        self.monitor.reconcile()
+        self.monitor.reconcile()
+        self.assertEqual(len(self.client.multicall2.call_args[0][0]), 1)
+
+    @patch("torrentbotx.downloaders.aria2_monitor.websocket.create_connection")
+    def test_listening_only_while_connected(self, create_connection):
+        # 测试连接失败时不视为监听中，连接打开后才视为监听中，断开后立即清除
+        attempted = threading.Event()
+
+        def refuse(*args, **kwargs):
+            attempted.set()
+            _refuse()
+
+        create_connection.side_effect = refuse
+        self.monitor.reconnect_delay = 10
+        self.monitor.start()
+        self.assertTrue(attempted.wait(2))
+        self.assertFalse(self.monitor.listening)
+        self.monitor.stop()
+
+        opened, closing = threading.Event(), threading.Event()
+        socket = MagicMock()
+
+        def recv():
+            opened.set()
+            closing.wait(2)
+            raise websocket.WebSocketConnectionClosedException()
+
+        socket.recv.side_effect = recv
+        create_connection.side_effect = [socket]
+        self.monitor.start()
+        self.assertTrue(opened.wait(2))
+        self.assertTrue(self.monitor.listening)
+        closing.set()
+        for _ in range(100):
+            if not self.monitor.listening:
+                break
+            threading.Event().wait(0.01)
+        self.assertFalse(self.monitor.listening)
+        self.assertFalse(self.monitor.synced)
+        socket.close.assert_called_once()
+        self.monitor.stop()
+
+    def test_has_torrent_from_mirror(self):
+        # 测试在镜像中按 infohash 查找，已移除的下载不计入
+        self.monitor.downloads = {"g1": {"gid": "g1", "infoHash": "ABC", "status": "active"},
+                                  "g2": {"gid": "g2", "infoHash": "def", "status": "removed"}}
+        self.assertTrue(self.monitor.has_torrent("abc"))
+        self.assertFalse(self.monitor.has_torrent("def"))
+
+
+class TestAria2HasTorrent(unittest.TestCase):
+
+    def test_uses_mirror_when_synced(self):
+        # 测试监听在线且已对账时直接查镜像，断开后回退到 RPC
+        from torrentbotx.downloaders.aria2 import Aria2Downloader
+        downloader = Aria2Downloader.__new__(Aria2Downloader)
+        downloader.client = MagicMock()
+        downloader.monitor = MagicMock()
+        downloader.ensure_connected = MagicMock()
+        downloader.monitor.synced = True
+        downloader.monitor.has_torrent.return_value = True
+        self.assertTrue(downloader.has_torrent("abc"))
+        downloader.client.get_downloads.assert_not_called()
+
+        downloader.monitor.synced = False
+        downloader.client.get_downloads.return_value = [MagicMock(info_hash="ABC")]
+        self.assertTrue(downloader.has_torrent("abc"))
+        downloader.client.get_downloads.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
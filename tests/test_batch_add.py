@@ -0,0 +1,111 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from tests.helpers import Config
+from torrentbotx.core.manager import CoreManager
+from torrentbotx.core.pipeline import TorrentFile
+from torrentbotx.core.placement import GB, DownloaderLoad
+from torrentbotx.downloaders.aria2 import Aria2Downloader
+from torrentbotx.downloaders.qbittorrent import QBittorrentDownloader
+from torrentbotx.downloaders.transmission import TransmissionDownloader
+from torrentbotx.utils.bencode import parse_torrent
+
+TORRENT = b"d4:infod6:lengthi1e4:name1:a12:piece lengthi16384e6:pieces20:" + b"\x00" * 20 + b"ee"
+
+
+def _downloader(cls):
+    downloader = cls.__new__(cls)
+    downloader.client = MagicMock()
+    return downloader
+
+
+class TestNativeBatchAdd(unittest.TestCase):
+
+    def test_qbittorrent_single_call(self):
+        # 测试 qBittorrent 一次 torrents_add 提交所有链接和文件，无效文件不提交
+        downloader = _downloader(QBittorrentDownloader)
+        downloader.client.torrents_add.return_value = "Ok."
+        downloader.client.torrents_info.return_value = [{"hash": parse_torrent(TORRENT).info_hash}]
+        results = downloader.add_torrents(["magnet:?xt=1", TORRENT, b"<html>"])
+        self.assertEqual(results, [True, True, False])
+        downloader.client.torrents_add.assert_called_once_with(urls=["magnet:?xt=1"], torrent_files=[TORRENT])
+
+    @patch("torrentbotx.downloaders.qbittorrent.ADD_VERIFY_TIMEOUT", 0)
+    def test_qbittorrent_per_item_results(self):
+        # 测试整批返回 "Ok." 时按添加后实际存在的 infohash 逐个给出结果
+        downloader = _downloader(QBittorrentDownloader)
+        downloader.client.torrents_add.return_value = "Ok."
+        magnet = "magnet:?xt=urn:btih:" + "ab" * 20
+        downloader.client.torrents_info.return_value = [{"hash": "AB" * 20}]
+        self.assertEqual(downloader.add_torrents([TORRENT, magnet]), [False, True])
+        hashes = downloader.client.torrents_info.call_args.kwargs["torrent_hashes"]
+        self.assertEqual(set(hashes), {parse_torrent(TORRENT).info_hash, "ab" * 20})
+
+    def test_aria2_multicall(self):
+        # 测试 aria2 通过 multicall 批量添加，逐项解析结果
+        downloader = _downloader(Aria2Downloader)
+        rpc = downloader.client.client
+        rpc.ADD_TORRENT, rpc.ADD_URI = "aria2.addTorrent", "aria2.addUri"
+        rpc.multicall2.return_value = [["gid1"], {"faultCode": 1, "faultString": "duplicate"}]
+        self.assertEqual(downloader.add_torrents([TORRENT, "https://a/b.torrent"]), [True, False])
+        calls = rpc.multicall2.call_args[0][0]
+        self.assertEqual([method for method, _ in calls], ["aria2.addTorrent", "aria2.addUri"])
+
+    def test_transmission_pipelined(self):
+        # 测试 Transmission 逐项返回结果
+        downloader = _downloader(TransmissionDownloader)
+        downloader.client.add_torrent.side_effect = [None, RuntimeError("bad"), None]
+        downloader.pipeline_depth = 1
+        self.assertEqual(downloader.add_torrents([TORRENT, "u1", "u2"]), [True, False, True])
+
+
+class TestBatchDownloadTask(unittest.TestCase):
+
+    @patch("torrentbotx.core.manager.fetch_torrent")
+    @patch("torrentbotx.core.manager.get_tracker_by_name")
+    def test_batch_download(self, get_tracker_by_name, fetch_torrent):
+        # 测试批量下载：每个下载器只调用一次 add_torrents，结果按种子逐个给出
+        meta = parse_torrent(TORRENT)
+        fetch_torrent.side_effect = lambda tracker, torrent_id: (
+            None if torrent_id == "3" else TorrentFile(TORRENT, meta, "mteam", torrent_id))
+        downloader = MagicMock()
+        downloader.name = "qbittorrent"
+        downloader.has_torrent.return_value = False
+        downloader.add_torrents.return_value = [True]
+        with patch.object(CoreManager, "_init_downloaders", return_value=[downloader]):
+            manager = CoreManager(config=Config(), notifier=MagicMock())
+
+        results = manager.execute_task("batch_download", {"torrent_ids": ["1", "2", "3"]})
+        # 1 与 2 的 infohash 相同，只提交一次
+        downloader.add_torrents.assert_called_once_with([TORRENT])
+        self.assertEqual([bool(result) for result in results], [True, True, False])
+        self.assertEqual(results[0].results[0].status, "added")
+        self.assertIsNone(manager.execute_task("unknown", {}))
+
+    @patch("torrentbotx.core.manager.fetch_torrent")
+    @patch("torrentbotx.core.manager.get_tracker_by_name")
+    def test_batch_skips_existing_and_rolls_back_load(self, get_tracker_by_name, fetch_torrent):
+        # 测试批量下载跳过下载器中已存在的种子，未添加成功的种子不计入放置负载
+        other = TORRENT.replace(b"1:a", b"1:b")
+        files = {"1": TorrentFile(TORRENT, parse_torrent(TORRENT), "mteam", "1"),
+                 "2": TorrentFile(other, parse_torrent(other), "mteam", "2")}
+        fetch_torrent.side_effect = lambda tracker, torrent_id: files[torrent_id]
+        downloader = MagicMock()
+        downloader.name = "qbittorrent"
+        downloader.available = True
+        downloader.get_load.return_value = DownloaderLoad(free_space=100 * GB, active=0)
+        downloader.has_torrent.side_effect = lambda info_hash: info_hash == files["1"].info_hash
+        downloader.add_torrents.return_value = [False]
+        with patch.object(CoreManager, "_init_downloaders", return_value=[downloader]):
+            manager = CoreManager(config=Config(), notifier=MagicMock())
+
+        results = manager.execute_task("batch_download", {"torrent_ids": ["1", "2"]})
+        downloader.add_torrents.assert_called_once_with([other])
+        self.assertEqual(results[0].results[0].status, "skipped")
+        self.assertEqual(results[1].results[0].status, "failed")
+        load = manager.placement.load_of(downloader)
+        self.assertEqual((load.active, load.free_space), (0, 100 * GB))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import hashlib
+import unittest
+from unittest.mock import MagicMock, patch
+
+from tests.helpers import Config
+from torrentbotx.core.manager import CoreManager
+from torrentbotx.core.pipeline import fetch_torrent
+from torrentbotx.utils.bencode import BencodeError, decode, parse_torrent
+
+
+def _encode(value):
+    # 测试用的最小 bencode 编码器
+    if isinstance(value, int):
+        return b"i%de" % value
+    if isinstance(value, str):
+        value = value.encode()
+    if isinstance(value, bytes):
+        return b"%d:%s" % (len(value), value)
+    if isinstance(value, list):
+        return b"l" + b"".join(_encode(item) for item in value) + b"e"
+    return b"d" + b"".join(_encode(k) + _encode(value[k]) for k in sorted(value)) + b"e"
+
+
+def _torrent(info):
+    encoded_info = _encode(info)
+    data = b"d8:announce" + _encode("https://tracker.example/announce") + b"4:info" + encoded_info + b"e"
+    return data, encoded_info
+
+
+class TestBencode(unittest.TestCase):
+
+    def test_decode(self):
+        # 测试完整解码嵌套结构
+        self.assertEqual(decode(b"d1:ai-3e1:bl1:xdee1:cdee"), {b"a": -3, b"b": [b"x", {}], b"c": {}})
+        with self.assertRaises(BencodeError):
+            decode(b"l1:a")
+
+    def test_single_file_v1(self):
+        # 测试单文件 v1 种子：infohash 为原始 info 片段的 SHA-1
+        data, info = _torrent({"name": "movie.mkv", "length": 1000, "piece length": 16384,
+                               "pieces": b"\x00" * 40, "private": 1})
+        meta = parse_torrent(data)
+        self.assertEqual(meta.info_hash, hashlib.sha1(info).hexdigest())
+        self.assertIsNone(meta.info_hash_v2)
+        self.assertEqual((meta.name, meta.total_size, meta.file_count), ("movie.mkv", 1000, 1))
+        self.assertTrue(meta.private)
+        self.assertEqual(meta.announce, "https://tracker.example/announce")
+
+    def test_multi_file_v1(self):
+        # 测试多文件 v1 种子的总大小与文件数
+        files = [{"length": 10 * (i + 1), "path": ["dir", f"{i}.flac"]} for i in range(100)]
+        data, _ = _torrent({"name": "album", "files": files, "piece length": 16384, "pieces": b"\x01" * 20})
+        meta = parse_torrent(data)
+        self.assertEqual((meta.total_size, meta.file_count), (sum(f["length"] for f in files), 100))
+
+    def test_v2_and_hybrid(self):
+        # 测试纯 v2 种子使用 SHA-256，混合种子同时计算两种 infohash
+        tree = {"a": {"": {"length": 5, "pieces root": b"r" * 32}},
+                "sub": {"b": {"": {"length": 7, "pieces root": b"s" * 32}}}}
+        data, info = _torrent({"name": "v2", "meta version": 2, "file tree": tree, "piece length": 16384})
+        meta = parse_torrent(data)
+        self.assertIsNone(meta.info_hash_v1)
+        self.assertEqual(meta.info_hash_v2, hashlib.sha256(info).hexdigest())
+        self.assertEqual(meta.info_hash, meta.info_hash_v2[:40])
+        self.assertEqual((meta.total_size, meta.file_count), (12, 2))
+
+        data, info = _torrent({"name": "hybrid", "meta version": 2, "file tree": tree, "length": 12,
+                               "piece length": 16384, "pieces": b"\x00" * 20})
+        meta = parse_torrent(data)
+        self.assertEqual(meta.info_hash, hashlib.sha1(info).hexdigest())
+        self.assertEqual(meta.info_hash_v2, hashlib.sha256(info).hexdigest())
+
+    def test_invalid_torrent(self):
+        # 测试无效数据抛出 BencodeError
+        for data in (b"", b"<html>", b"d8:announce3:abce", b"d4:infod4:name"):
+            with self.assertRaises(BencodeError):
+                parse_torrent(data)
+
+
+class TestDownloadPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.data, _ = _torrent({"name": "movie.mkv", "length": 1000, "piece length": 16384,
+                                 "pieces": b"\x00" * 20})
+        self.tracker = MagicMock()
+        self.tracker.site = "mteam"
+        self.tracker.download_torrent.return_value = self.data
+
+    def test_fetch_torrent(self):
+        # 测试下载并解析种子文件，解析失败时返回 None
+        torrent = fetch_torrent(self.tracker, "1")
+        self.assertEqual(torrent.name, "movie.mkv")
+        self.assertEqual(torrent.data, self.data)
+
+        self.tracker.download_torrent.return_value = b"<html>"
+        self.assertIsNone(fetch_torrent(self.tracker, "1"))
+
+    @patch("torrentbotx.core.manager.get_tracker_by_name")
+    def test_download_task_fetches_once(self, get_tracker_by_name):
+        # 测试种子文件只下载一次，已存在该种子的下载器被跳过（添加到所有下载器）
+        get_tracker_by_name.return_value = self.tracker
+        existing, fresh = MagicMock(), MagicMock()
+        existing.has_torrent.return_value = True
+        fresh.has_torrent.return_value = False
+        fresh.add_torrent_file.return_value = True
+        with patch.object(CoreManager, "_init_downloaders", return_value=[existing, fresh]):
+            manager = CoreManager(config=Config(PLACEMENT={"strategy": "all"}), notifier=MagicMock())
+
+        self.assertTrue(manager.execute_download_task({"torrent_id": "1"}))
+        self.tracker.download_torrent.assert_called_once_with("1")
+        existing.add_torrent_file.assert_not_called()
+        fresh.add_torrent_file.assert_called_once_with(self.data)
+
+
+if __name__ == "__main__":
+    unittest.main()
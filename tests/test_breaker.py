@@ -0,0 +1,99 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import MagicMock
+
+import requests
+
+from torrentbotx.trackers.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from torrentbotx.trackers.mteam import MTeamTracker
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_open_after_threshold(self):
+        # 测试连续失败达到阈值后打开，冷却期内拒绝请求
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+        breaker.record_failure("timeout")
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.record_failure("timeout")
+        self.assertEqual(breaker.state, OPEN)
+        self.assertFalse(breaker.allow())
+        self.assertFalse(breaker.available)
+        self.assertEqual(breaker.stats["last_error"], "timeout")
+
+    def test_half_open_single_probe(self):
+        # 测试冷却时间过后只放行一个探测请求，探测成功后关闭
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertFalse(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertTrue(breaker.allow())
+
+    def test_failed_probe_reopens(self):
+        # 测试探测失败后重新打开
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=0)
+        for _ in range(3):
+            breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+
+
+class TestTrackerCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        self.tracker = MTeamTracker(api_key="key", circuit_breaker=CircuitBreaker(failure_threshold=2,
+                                                                                   recovery_timeout=60))
+        self.tracker.search_cache = None
+        self.tracker.transport = MagicMock()
+
+    def test_fast_fail_when_open(self):
+        # 测试站点连续超时后熔断，之后的调用不再发送请求
+        self.tracker.transport.post.side_effect = requests.exceptions.Timeout("timed out")
+        self.assertIsNone(self.tracker.get_download_link("1"))
+        self.assertIsNone(self.tracker.get_download_link("1"))
+        self.assertFalse(self.tracker.available)
+
+        self.tracker.transport.post.reset_mock()
+        self.assertIsNone(self.tracker.search_torrents("test"))
+        self.tracker.transport.post.assert_not_called()
+
+    def test_server_error_counts_as_failure(self):
+        # 测试 5xx 计为失败，正常响应清零失败计数
+        response = self.tracker.transport.post.return_value
+        response.status_code = 500
+        response.headers = {}
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError("500")
+        self.tracker.get_download_link("1")
+        self.assertEqual(self.tracker.circuit_breaker.failures, 1)
+
+        response.status_code = 200
+        response.raise_for_status.side_effect = None
+        response.json.return_value = {"message": "SUCCESS", "data": "https://example.com/dl"}
+        self.assertEqual(self.tracker.get_download_link("1"), "https://example.com/dl")
+        self.assertEqual(self.tracker.circuit_breaker.failures, 0)
+
+    def test_cancelled_probe_waiting_on_limiter(self):
+        # 测试半开探测在等待限流时被取消，探测名额被归还，之后仍能放行请求
+        tracker = MTeamTracker(api_key="key", circuit_breaker=CircuitBreaker(failure_threshold=1,
+                                                                               recovery_timeout=0.1))
+        tracker.search_cache = None
+        tracker.circuit_breaker.record_failure("down")
+        tracker.rate_limiter.acquire()
+        tracker.rate_limiter.release(503, 5.0)
+        time.sleep(0.15)
+
+        client = MagicMock()
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(asyncio.wait_for(tracker._async_post(client, "https://example.com"), 0.3))
+        client.post.assert_not_called()
+        self.assertEqual(tracker.rate_limiter.in_flight, 0)
+        self.assertTrue(tracker.circuit_breaker.allow())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from torrentbotx.config.config import load_config
+from torrentbotx.downloaders.qbittorrent import QBittorrentDownloader
+
+
+class TestConfigReload(unittest.TestCase):
+
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), "config.yaml")
+        self._write("QBIT_HOST: a\nDOWNLOADER_TIMEOUT: 10\n")
+        self.config = load_config(self.path)
+
+    def _write(self, content):
+        with open(self.path, "w", encoding="utf-8") as fh:
+            fh.write(content)
+        # 确保修改时间一定变化
+        mtime = time.time() + getattr(self, "_bump", 0)
+        self._bump = getattr(self, "_bump", 0) + 1
+        os.utime(self.path, (mtime, mtime))
+
+    def test_load_config_is_cached(self):
+        # 测试同一配置文件只解析一次，refresh 时重新创建
+        self.assertIs(load_config(self.path), self.config)
+        self.assertIsNot(load_config(self.path, refresh=True), self.config)
+
+    def test_reload_notifies_only_changed_keys(self):
+        # 测试修改时间变化时重新加载，只通知订阅了变化配置的组件
+        qbit, trackers = MagicMock(), MagicMock()
+        self.config.subscribe("QBIT_", qbit)
+        self.config.subscribe(("PT_SITES", "TRACKER_"), trackers)
+        self.assertEqual(self.config.check_for_changes(), {})
+
+        self._write("QBIT_HOST: b\nDOWNLOADER_TIMEOUT: 10\n")
+        changes = self.config.check_for_changes()
+        self.assertEqual(changes, {"QBIT_HOST": ("a", "b")})
+        qbit.assert_called_once_with({"QBIT_HOST": ("a", "b")})
+        trackers.assert_not_called()
+        self.assertEqual(self.config.get("QBIT_HOST"), "b")
+
+    def test_invalid_file_keeps_current_settings(self):
+        # 测试配置文件格式错误时保留当前配置
+        self._write("DOWNLOADER_TIMEOUT: [not a number\n")
+        self.assertEqual(self.config.check_for_changes(), {})
+        self.assertEqual(self.config.get("DOWNLOADER_TIMEOUT"), 10)
+
+    def test_downloader_reconnects_on_change(self):
+        # 测试 qBittorrent 相关配置变化时断开连接，下次使用时按新配置重连
+        downloader = QBittorrentDownloader(self.config)
+        downloader.client = MagicMock()
+        self._write("QBIT_HOST: c\nDOWNLOADER_TIMEOUT: 10\n")
+        self.config.check_for_changes()
+        self.assertFalse(downloader.connected)
+        self.assertTrue(downloader.available)
+
+
+    def test_closed_downloader_unsubscribes(self):
+        # 测试下载器关闭后取消配置订阅，配置变化不再回调已关闭的实例
+        downloader = QBittorrentDownloader(self.config)
+        downloader.close()
+        downloader.client = MagicMock()
+        self._write("QBIT_HOST: d\nDOWNLOADER_TIMEOUT: 10\n")
+        self.assertEqual(self.config.check_for_changes(), {"QBIT_HOST": ("a", "d")})
+        self.assertTrue(downloader.connected)
+        self.assertEqual(self.config._subscribers, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,212 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from tests.helpers import TempDatabaseTestCase
+from torrentbotx.db import connection, operations
+from torrentbotx.db.connection import Database, get_database
+
+
+class TestDatabase(unittest.TestCase):
+
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), "test.db")
+        self.db = Database(self.path, readers=2, pragmas=connection._pragmas({}))
+        with self.db.transaction() as conn:
+            conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, value TEXT)")
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_wal_and_pragmas(self):
+        # 测试写连接和读连接都启用 WAL 与调优后的 PRAGMA
+        self.assertEqual(self.db.writer.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        with self.db.read() as conn:
+            self.assertEqual(conn.execute("PRAGMA busy_timeout").fetchone()[0], 5000)
+            self.assertEqual(conn.execute("PRAGMA cache_size").fetchone()[0], -16384)
+            self.assertEqual(conn.execute("PRAGMA query_only").fetchone()[0], 1)
+
+    def test_connections_are_reused(self):
+        # 测试重复读写不会重新打开连接
+        self._count()
+        with patch("sqlite3.connect", side_effect=AssertionError("不应重新连接")):
+            for i in range(10):
+                with self.db.transaction() as conn:
+                    conn.execute("INSERT INTO items (value) VALUES (?)", (str(i),))
+                with self.db.read() as conn:
+                    conn.execute("SELECT count(*) FROM items").fetchone()
+        with self.db.read() as conn:
+            self.assertEqual(conn.execute("SELECT count(*) FROM items").fetchone()[0], 10)
+
+    def test_rollback_on_error(self):
+        # 测试事务内抛出异常时回滚
+        with self.assertRaises(ValueError):
+            with self.db.transaction() as conn:
+                conn.execute("INSERT INTO items (value) VALUES ('a')")
+                raise ValueError("boom")
+        with self.db.read() as conn:
+            self.assertEqual(conn.execute("SELECT count(*) FROM items").fetchone()[0], 0)
+        # 写连接可以继续使用
+        with self.db.transaction() as conn:
+            conn.execute("INSERT INTO items (value) VALUES ('b')")
+        with self.db.read() as conn:
+            self.assertEqual(conn.execute("SELECT value FROM items").fetchone()["value"], "b")
+
+    def test_original_error_kept_when_already_rolled_back(self):
+        # 测试 SQLite 已自动回滚时保留原始异常
+        with self.assertRaises(ValueError):
+            with self.db.transaction() as conn:
+                conn.execute("ROLLBACK")
+                raise ValueError("original")
+        self.assertFalse(self.db.writer.in_transaction)
+
+    def test_foreign_keys_unchanged(self):
+        # 测试连接不改变 SQLite 默认的外键检查设置
+        self.assertEqual(self.db.writer.execute("PRAGMA foreign_keys").fetchone()[0], 0)
+
+    def test_nested_transaction_joins_outer(self):
+        # 测试嵌套事务并入外层事务，外层回滚时一起回滚
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction() as conn:
+                conn.execute("INSERT INTO items (value) VALUES ('a')")
+                with self.db.transaction() as inner:
+                    inner.execute("INSERT INTO items (value) VALUES ('b')")
+                raise RuntimeError
+        with self.db.read() as conn:
+            self.assertEqual(conn.execute("SELECT count(*) FROM items").fetchone()[0], 0)
+
+    def test_reader_not_blocked_by_open_write(self):
+        # 测试写事务未提交时读连接仍能读取已提交的数据
+        with self.db.transaction() as conn:
+            conn.execute("INSERT INTO items (value) VALUES ('committed')")
+        with self.db.transaction() as conn:
+            conn.execute("INSERT INTO items (value) VALUES ('pending')")
+            result = []
+            reader = threading.Thread(target=lambda: result.append(self._count()))
+            reader.start()
+            reader.join(timeout=2)
+            self.assertEqual(result, [1])
+        self.assertEqual(self._count(), 2)
+
+    def _count(self):
+        with self.db.read() as conn:
+            return conn.execute("SELECT count(*) FROM items").fetchone()[0]
+
+    def test_concurrent_threads(self):
+        # 测试多个线程同时读写时写入不丢失，读连接数不超过上限
+        errors = []
+
+        def worker(n):
+            try:
+                for i in range(20):
+                    with self.db.transaction() as conn:
+                        conn.execute("INSERT INTO items (value) VALUES (?)", (f"{n}-{i}",))
+                    self._count()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(self._count(), 160)
+        self.assertLessEqual(self.db._reader_count, 2)
+
+    def test_closed_database_raises(self):
+        # 测试关闭后再使用会抛出异常
+        self.db.close()
+        with self.assertRaises(sqlite3.ProgrammingError):
+            with self.db.transaction():
+                pass
+
+
+class TestGetDatabase(TempDatabaseTestCase):
+
+    def test_same_instance_per_path(self):
+        # 测试同一路径返回同一个连接管理器
+        self.assertIs(get_database(), get_database())
+
+    def test_operations_use_shared_connections(self):
+        # 测试数据库操作复用共享连接
+        get_database().writer
+        operations.get_feed_state("mteam", "latest")
+        with patch("sqlite3.connect", side_effect=AssertionError("不应重新连接")):
+            operations.insert_torrent("a", "hash-a", "movie", "downloading", 0, 0.0, 0.0)
+            operations.save_feed_state("mteam", "latest", 10, None, None, None)
+        self.assertEqual(operations.get_torrent_by_hash("hash-a")["name"], "a")
+        self.assertEqual(operations.get_feed_state("mteam", "latest")["last_id"], 10)
+
+    def test_operation_errors_are_swallowed(self):
+        # 测试写入违反约束时回滚并返回，不影响后续操作
+        operations.insert_torrent("a", "hash-a", "movie", "downloading", 0, 0.0, 0.0)
+        operations.insert_torrent("b", "hash-a", "movie", "downloading", 0, 0.0, 0.0)
+        self.assertEqual(operations.get_torrent_by_hash("hash-a")["name"], "a")
+        self.assertFalse(get_database().writer.in_transaction)
+
+
+class TestUpsertTorrents(TempDatabaseTestCase):
+
+    @staticmethod
+    def _records(count, state="downloading", progress=0.5):
+        for i in range(count):
+            yield {"hash": f"h{i}", "name": f"t{i}", "category": "movie", "state": state,
+                   "added_on": 1000 + i, "progress": progress, "ratio": 0.0}
+
+    def _total_changes(self):
+        return get_database().writer.total_changes
+
+    def test_insert_then_update_changed_only(self):
+        # 测试首次同步插入，再次同步只更新有变化的种子
+        self.assertEqual(operations.upsert_torrents(self._records(100)), 100)
+        before = self._total_changes()
+        self.assertEqual(operations.upsert_torrents(self._records(100)), 100)
+        self.assertEqual(self._total_changes(), before)
+
+        records = list(self._records(100))
+        records[3].update(state="seeding", progress=1.0, ratio=1.5)
+        operations.upsert_torrents(records)
+        self.assertEqual(self._total_changes(), before + 1)
+        row = operations.get_torrent_by_hash("h3")
+        self.assertEqual((row["state"], row["progress"], row["ratio"], row["added_on"]), ("seeding", 1.0, 1.5, 1003))
+
+    def test_chunked_transactions_and_streaming(self):
+        # 测试按块提交事务，生成器按需消费，缺少 hash 的记录被跳过
+        database = get_database()
+        records = self._records(25)
+        with patch.object(database, "transaction", wraps=database.transaction) as transaction:
+            count = operations.upsert_torrents(iter([{"name": "no-hash"}, *records]), chunk_size=10)
+        self.assertEqual(count, 25)
+        self.assertEqual(transaction.call_count, 3)
+
+    def test_sync_ten_thousand_torrents(self):
+        # 测试 1 万个种子的同步耗时
+        operations.upsert_torrents(self._records(10000))
+        start = time.perf_counter()
+        operations.upsert_torrents(self._records(10000, state="seeding", progress=1.0))
+        self.assertLess(time.perf_counter() - start, 1.0)
+        with get_database().read() as conn:
+            self.assertEqual(conn.execute("SELECT count(*) FROM torrents WHERE state = 'seeding'").fetchone()[0],
+                             10000)
+
+    def test_manager_sync(self):
+        # 测试 CoreManager 从快照同步种子到数据库
+        from torrentbotx.core.manager import CoreManager
+        from torrentbotx.models.torrent_store import from_qbittorrent
+        downloader = MagicMock()
+        downloader.name = "qbittorrent"
+        downloader.get_snapshot_records.return_value = [
+            from_qbittorrent({"hash": "AB", "name": "movie", "state": "uploading", "progress": 1.0, "ratio": 2.0})]
+        with patch.object(CoreManager, "_init_downloaders", return_value=[downloader]):
+            manager = CoreManager(config=MagicMock(get=lambda key, default=None: default), notifier=MagicMock())
+        self.assertEqual(manager.sync_torrents_to_db(), 1)
+        self.assertEqual(operations.get_torrent_by_hash("ab")["state"], "seeding")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import sqlite3
+import unittest
+from unittest.mock import patch
+
+from tests.helpers import TempDatabaseTestCase
+from torrentbotx.db import models
+from torrentbotx.db.connection import get_database
+
+
+class TestMigrations(TempDatabaseTestCase):
+    create_schema = False
+
+    def setUp(self):
+        super().setUp()
+        self.db = get_database()
+
+    def _indexes(self):
+        with self.db.read() as conn:
+            return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+    def test_fresh_database(self):
+        # 测试新数据库执行全部迁移并建立索引
+        models.create_tables()
+        self.assertEqual(models.get_schema_version(), models.SCHEMA_VERSION)
+        self.assertTrue({"idx_tasks_status", "idx_tasks_torrent_id", "idx_torrents_state",
+                         "idx_torrents_category", "idx_torrents_added_on"} <= self._indexes())
+
+    def test_current_schema_skips_write_lock(self):
+        # 测试结构已是最新时不开启写事务
+        models.migrate()
+        with patch.object(self.db, "transaction", side_effect=AssertionError("不应开启写事务")):
+            self.assertEqual(models.migrate(), models.SCHEMA_VERSION)
+
+    def test_upgrade_unversioned_database(self):
+        # 测试引入版本号之前创建的数据库保留数据并升级
+        with self.db.transaction() as conn:
+            models._create_initial_schema(conn.cursor())
+            conn.execute("INSERT INTO torrents (name, hash) VALUES ('a', 'h1')")
+        self.assertEqual(models.get_schema_version(), 0)
+        models.migrate()
+        self.assertEqual(models.get_schema_version(), models.SCHEMA_VERSION)
+        with self.db.read() as conn:
+            self.assertEqual(conn.execute("SELECT name FROM torrents").fetchone()[0], "a")
+
+    def test_failed_migration_rolls_back(self):
+        # 测试迁移失败时回滚该迁移，版本号停留在上一个成功的迁移
+        def broken(cursor):
+            cursor.execute("CREATE TABLE broken (id INTEGER)")
+            raise sqlite3.OperationalError("boom")
+
+        migrations = [*models.MIGRATIONS, broken]
+        with patch.object(models, "MIGRATIONS", migrations), patch.object(models, "SCHEMA_VERSION", len(migrations)):
+            with self.assertRaises(sqlite3.OperationalError):
+                models.migrate()
+        self.assertEqual(models.get_schema_version(), len(migrations) - 1)
+        with self.db.read() as conn:
+            self.assertIsNone(conn.execute("SELECT name FROM sqlite_master WHERE name = 'broken'").fetchone())
+
+    def test_hot_queries_use_indexes(self):
+        # 测试状态和清理查询使用覆盖索引而不是全表扫描
+        models.migrate()
+        queries = {
+            "SELECT count(*) FROM torrents WHERE state = 'seeding' AND added_on < 100": "idx_torrents_state",
+            "SELECT state FROM torrents WHERE category = 'movie'": "idx_torrents_category",
+            "SELECT id FROM tasks WHERE status = 'pending' ORDER BY scheduled_time": "idx_tasks_status",
+            "SELECT status FROM tasks WHERE torrent_id = 1": "idx_tasks_torrent_id",
+        }
+        with self.db.read() as conn:
+            for sql, index in queries.items():
+                plan = " ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+                self.assertIn(f"COVERING INDEX {index}", plan, sql)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from tests.helpers import Config
+from torrentbotx.core.manager import CoreManager
+from torrentbotx.downloaders.base import BaseDownloader, DownloaderUnavailable, with_connection
+
+
+class _FakeDownloader(BaseDownloader):
+    connection_errors = (ConnectionError,)
+
+    def __init__(self, failures=0, delay=0.0, **config):
+        super().__init__(Config(DOWNLOADER_RECONNECT_DELAY=0.05, **config))
+        self.connect_calls = 0
+        self.remaining_failures = failures
+        self.delay = delay
+
+    def connect(self):
+        self.connect_calls += 1
+        time.sleep(self.delay)
+        if self.remaining_failures:
+            self.remaining_failures -= 1
+            raise ConnectionError("refused")
+        self.client = MagicMock()
+
+    def ping(self):
+        self.client.ping()
+
+    @with_connection
+    def add_torrent(self, torrent_url):
+        return self.client.add(torrent_url)
+
+    def add_torrent_file(self, torrent_data):
+        return False
+
+    def has_torrent(self, info_hash):
+        return False
+
+    def get_torrents(self):
+        return []
+
+    def pause_torrent(self, torrent_id):
+        return False
+
+    def resume_torrent(self, torrent_id):
+        return False
+
+
+class TestDownloaderConnection(unittest.TestCase):
+
+    def test_lazy_connect_on_first_use(self):
+        # 测试构造时不连接，首次调用时才连接且只连接一次
+        downloader = _FakeDownloader()
+        self.assertEqual(downloader.connect_calls, 0)
+        self.assertEqual(downloader.health["state"], "disconnected")
+        downloader.add_torrent("u1")
+        downloader.add_torrent("u2")
+        self.assertEqual(downloader.connect_calls, 1)
+        self.assertEqual(downloader.health["state"], "connected")
+
+    def test_backoff_after_failures(self):
+        # 测试连接失败后进入指数退避，退避期间不再尝试连接
+        downloader = _FakeDownloader(failures=2)
+        with self.assertRaises(DownloaderUnavailable):
+            downloader.add_torrent("u")
+        with self.assertRaises(DownloaderUnavailable):
+            downloader.add_torrent("u")
+        self.assertEqual(downloader.connect_calls, 1)
+        self.assertFalse(downloader.available)
+        self.assertEqual(downloader.health["state"], "backoff")
+
+        time.sleep(0.06)
+        self.assertFalse(downloader.check_health())
+        # 第二次失败后退避间隔翻倍
+        self.assertGreater(downloader.retry_in, 0.06)
+        time.sleep(0.11)
+        self.assertTrue(downloader.check_health())
+        self.assertEqual(downloader.failures, 0)
+
+    def test_connection_error_triggers_reconnect(self):
+        # 测试 RPC 抛出连接类异常时断开连接，ping 失败时同样断开
+        downloader = _FakeDownloader()
+        downloader.ensure_connected()
+        downloader.client.add.side_effect = ConnectionError("reset")
+        with self.assertRaises(ConnectionError):
+            downloader.add_torrent("u")
+        self.assertFalse(downloader.connected)
+
+        time.sleep(0.06)
+        self.assertTrue(downloader.check_health())
+        downloader.client.ping.side_effect = OSError("timeout")
+        self.assertFalse(downloader.check_health())
+        self.assertEqual(downloader.health["last_error"], "timeout")
+
+
+class TestBackgroundConnect(unittest.TestCase):
+
+    def test_start_does_not_wait_for_downloaders(self):
+        # 测试启动不等待响应慢的下载器，后台健康检查线程并行完成连接
+        slow, fast = _FakeDownloader(delay=0.5), _FakeDownloader()
+        with patch.object(CoreManager, "_init_downloaders", return_value=[slow, fast]):
+            manager = CoreManager(config=Config(), notifier=MagicMock())
+        started = time.monotonic()
+        manager.start()
+        self.assertLess(time.monotonic() - started, 0.3)
+        try:
+            deadline = time.monotonic() + 2
+            while not (slow.connected and fast.connected) and time.monotonic() < deadline:
+                time.sleep(0.02)
+            self.assertEqual([health["state"] for health in manager.execute_task("downloader_health", {})],
+                             ["connected", "connected"])
+        finally:
+            manager.stop()
+
+    def test_refresh_state_on_interval(self):
+        # 测试健康检查线程按 refresh_interval 刷新已连接下载器的本地状态镜像
+        downloader = _FakeDownloader()
+        downloader.ensure_connected()
+        downloader.refresh_interval = 0.5
+        downloader.refresh_state = MagicMock()
+        with patch.object(CoreManager, "_init_downloaders", return_value=[downloader]):
+            manager = CoreManager(config=Config(), notifier=MagicMock())
+        manager.start()
+        try:
+            deadline = time.monotonic() + 3
+            while downloader.refresh_state.call_count < 2 and time.monotonic() < deadline:
+                time.sleep(0.05)
+            self.assertGreaterEqual(downloader.refresh_state.call_count, 2)
+        finally:
+            manager.stop()
+
+
+    def test_restart_after_stop(self):
+        # 测试 stop 后线程池仍可用，管理器可以再次启动并执行任务
+        downloader = _FakeDownloader()
+        with patch.object(CoreManager, "_init_downloaders", return_value=[downloader]):
+            manager = CoreManager(config=Config(), notifier=MagicMock())
+        manager.start()
+        manager.stop()
+        manager.start()
+        try:
+            self.assertTrue(manager._executor.submit(lambda: True).result(timeout=1))
+        finally:
+            manager.close()
+        self.assertFalse(downloader.connected)
+
+
+if __name__ == "__main__":
+    unittest.main()
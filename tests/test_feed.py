@@ -0,0 +1,62 @@
+import unittest
+from unittest.mock import MagicMock
+
+from tests.helpers import TempDatabaseTestCase
+from torrentbotx.trackers.common import FeedPage
+from torrentbotx.trackers.feed import FeedPoller
+from torrentbotx.trackers.mteam import MTeamTracker
+
+
+def _items(*ids):
+    return [{"id": str(i), "name": f"Torrent {i}"} for i in ids]
+
+
+class TestFeedPoller(TempDatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tracker = MagicMock()
+        self.tracker.site = "mteam"
+
+    def test_only_new_torrents_are_emitted(self):
+        # 测试首次轮询只记录高水位标记，之后只产出新种子
+        poller = FeedPoller(self.tracker, page_size=3)
+        self.tracker.fetch_latest.return_value = FeedPage(_items(12, 11, 10), etag='"v1"')
+        self.assertEqual(poller.poll(), [])
+
+        self.tracker.fetch_latest.return_value = FeedPage(_items(14, 13, 12), etag='"v2"')
+        self.assertEqual([item["id"] for item in poller.poll()], ["13", "14"])
+        self.tracker.fetch_latest.assert_called_with(1, 3, etag='"v1"', last_modified=None)
+
+    def test_not_modified_and_catch_up(self):
+        # 测试 304 时不产出种子，整页都是新种子时继续翻页追赶
+        poller = FeedPoller(self.tracker, page_size=2)
+        self.tracker.fetch_latest.return_value = FeedPage(_items(10, 9))
+        poller.poll()
+
+        self.tracker.fetch_latest.return_value = FeedPage([], not_modified=True)
+        self.assertEqual(poller.poll(), [])
+
+        self.tracker.fetch_latest.side_effect = [FeedPage(_items(14, 13)), FeedPage(_items(12, 11)),
+                                                 FeedPage(_items(10, 9))]
+        self.assertEqual([item["id"] for item in poller.poll()], ["11", "12", "13", "14"])
+
+
+class TestFetchLatest(unittest.TestCase):
+
+    def test_conditional_request(self):
+        # 测试携带 ETag 发送条件请求，站点返回 304 时标记为未变化
+        tracker = MTeamTracker(api_key="key")
+        tracker.transport = MagicMock()
+        tracker.transport.post.return_value.status_code = 304
+        tracker.transport.post.return_value.headers = {}
+
+        page = tracker.fetch_latest(etag='"v1"')
+        self.assertTrue(page.not_modified)
+        headers = tracker.transport.post.call_args.kwargs["headers"]
+        self.assertEqual(headers["If-None-Match"], '"v1"')
+        self.assertEqual(headers["x-api-key"], "key")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import json
+import subprocess
+import sys
+import unittest
+
+# 只应在用到时才导入的重量级依赖
+HEAVY_MODULES = ("telegram", "aria2p", "qbittorrentapi", "transmission_rpc", "apscheduler", "httpx", "requests")
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"elapsed": elapsed, "loaded": sorted(m for m in {heavy!r} if m in sys.modules)}}))
+"""
+
+
+def _cold_import(code: str) -> dict:
+    # 每次在新的解释器中测量，避免受已导入模块的影响
+    output = subprocess.run([sys.executable, "-c", _PROBE.format(code=code, heavy=HEAVY_MODULES)],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_package_import_is_lazy(self):
+        # 测试导入包和核心模块不会加载任何下载器、站点或通知渠道的依赖
+        for code in ("import torrentbotx", "from torrentbotx import CoreManager",
+                     "import torrentbotx.trackers, torrentbotx.downloaders, torrentbotx.notifications"):
+            result = _cold_import(code)
+            self.assertEqual(result["loaded"], [], code)
+
+    def test_only_configured_downloader_is_imported(self):
+        # 测试只导入配置中用到的下载器模块
+        result = _cold_import("from torrentbotx.downloaders.base import _downloader_registry\n"
+                              "_downloader_registry.get('transmission')")
+        self.assertIn("transmission_rpc", result["loaded"])
+        self.assertNotIn("qbittorrentapi", result["loaded"])
+        self.assertNotIn("aria2p", result["loaded"])
+
+    def test_import_time_benchmark(self):
+        # 冷启动导入耗时基准：阈值较宽松，只用于发现重新引入的全量导入
+        result = _cold_import("import torrentbotx.core.manager")
+        self.assertLess(result["elapsed"], 2.0, f"导入 CoreManager 耗时 {result['elapsed']:.3f}s")
+
+
+if __name__ == "__main__":
+    unittest.main()
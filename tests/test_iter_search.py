@@ -0,0 +1,102 @@
+import asyncio
+import json
+import unittest
+from unittest.mock import MagicMock
+
+import httpx
+import requests
+
+from torrentbotx.trackers.common import SearchPageError
+from torrentbotx.trackers.mteam import MTeamTracker
+
+
+def _page(page_number, page_size, total_pages=3):
+    items = [{"id": f"{page_number}-{i}"} for i in range(page_size)] if page_number <= total_pages else []
+    return {"data": items, "pageNumber": str(page_number), "totalPages": str(total_pages)}
+
+
+class TestIterSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.tracker = MTeamTracker(api_key="key")
+        self.requested_pages = []
+
+        def post(url, json=None, **kwargs):
+            self.requested_pages.append(json["pageNumber"])
+            response = MagicMock()
+            response.status_code = 200
+            response.headers = {}
+            response.json.return_value = {"message": "SUCCESS", "data": _page(json["pageNumber"], json["pageSize"])}
+            return response
+
+        self.tracker.transport = MagicMock()
+        self.tracker.transport.post.side_effect = post
+
+    def test_iterates_all_pages(self):
+        # 测试逐页产出所有结果，并在最后一页后停止
+        items = list(self.tracker.iter_search("test", page_size=2))
+        self.assertEqual(len(items), 6)
+        self.assertEqual(self.requested_pages, [1, 2, 3])
+
+    def test_stops_at_max_results(self):
+        # 测试达到 max_results 后不再请求后续页面
+        items = list(self.tracker.iter_search("test", max_results=3, page_size=2))
+        self.assertEqual([item["id"] for item in items], ["1-0", "1-1", "2-0"])
+        self.assertEqual(self.requested_pages, [1, 2])
+
+    def test_failed_page_raises(self):
+        # 测试第 2 页请求失败时抛出 SearchPageError，而不是当作最后一页静默结束
+        post = self.tracker.transport.post.side_effect
+
+        def failing_post(url, json=None, **kwargs):
+            if json["pageNumber"] == 2:
+                response = MagicMock()
+                response.status_code = 500
+                response.headers = {}
+                response.raise_for_status.side_effect = requests.HTTPError("500")
+                return response
+            return post(url, json=json, **kwargs)
+
+        self.tracker.transport.post.side_effect = failing_post
+        items = []
+        with self.assertRaises(SearchPageError) as context:
+            for item in self.tracker.iter_search("test", page_size=2):
+                items.append(item)
+        self.assertEqual(context.exception.page, 2)
+        self.assertEqual([item["id"] for item in items], ["1-0", "1-1"])
+
+    def test_async_iter_search_failed_page_raises(self):
+        # 测试异步迭代器在第 2 页失败时同样抛出 SearchPageError
+        def handler(request):
+            body = json.loads(request.content)
+            if body["pageNumber"] == 2:
+                return httpx.Response(500)
+            return httpx.Response(200, json={"message": "SUCCESS",
+                                             "data": _page(body["pageNumber"], body["pageSize"])})
+
+        async def run():
+            items = []
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                with self.assertRaises(SearchPageError):
+                    async for item in self.tracker.aiter_search("test", page_size=2, client=client):
+                        items.append(item["id"])
+            return items
+
+        self.assertEqual(asyncio.run(run()), ["1-0", "1-1"])
+
+    def test_async_iter_search(self):
+        # 测试异步迭代器同样逐页产出结果
+        def handler(request):
+            body = json.loads(request.content)
+            return httpx.Response(200, json={"message": "SUCCESS",
+                                             "data": _page(body["pageNumber"], body["pageSize"])})
+
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return [item["id"] async for item in self.tracker.aiter_search("test", page_size=2, client=client)]
+
+        self.assertEqual(len(asyncio.run(run())), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from tests.helpers import TempDatabaseTestCase
+from torrentbotx.trackers.local_index import LocalIndex, async_local_search, local_search
+from torrentbotx.trackers.mteam import MTeamTracker
+
+
+class TestLocalIndex(TempDatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.index = LocalIndex()
+
+    def test_search_results_are_indexed(self):
+        # 测试经过 search_torrents 的种子被写入索引，并可按标题/副标题搜索
+        tracker = MTeamTracker(api_key="key")
+        tracker.search_cache = None
+        tracker.local_index = self.index
+        tracker.transport = MagicMock()
+        tracker.transport.post.return_value.status_code = 200
+        tracker.transport.post.return_value.headers = {}
+        tracker.transport.post.return_value.json.return_value = {"message": "SUCCESS", "data": {"data": [
+            {"id": "1", "name": "Dune.Part.Two.2024.2160p", "smallDescr": "沙丘2", "size": "1024",
+             "category": "401", "status": {"seeders": "50"}},
+            {"id": "2", "name": "Oppenheimer.2023.1080p", "smallDescr": "奥本海默", "size": "2048",
+             "category": "401", "status": {"seeders": "80"}},
+        ]}}
+        tracker.search_torrents("2023")
+
+        results = self.index.search("dune 2160p")
+        self.assertEqual([row["torrent_id"] for row in results], ["1"])
+        self.assertEqual(results[0]["seeders"], 50)
+        self.assertEqual([row["title"] for row in self.index.search("沙丘")], ["Dune.Part.Two.2024.2160p"])
+
+    def test_upsert_updates_existing_torrent(self):
+        # 测试重复写入同一种子时更新而不是重复插入
+        self.index.add("mteam", [{"id": "1", "name": "Old Title", "status": {"seeders": "1"}}])
+        self.index.add("mteam", [{"id": "1", "name": "New Title", "status": {"seeders": "9"}}])
+        self.assertEqual(self.index.search("old title"), [])
+        results = self.index.search("new title")
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["seeders"], 9)
+
+    def test_local_search_falls_back_to_remote(self):
+        # 测试本地未命中时回退到远程搜索，命中时不请求站点
+        self.index.add("mteam", [{"id": "1", "name": "Local Torrent"}])
+        remote = MagicMock()
+        remote.items = [{"id": "9", "name": "Remote Torrent", "site": "carpt"}]
+        with patch("torrentbotx.trackers.local_index.search_all", return_value=remote) as search_all:
+            self.assertEqual(local_search("local", index=self.index)[0]["torrent_id"], "1")
+            search_all.assert_not_called()
+            self.assertEqual(local_search("remote", index=self.index)[0]["site"], "carpt")
+            search_all.assert_called_once()
+
+    def test_async_local_search_inside_event_loop(self):
+        # 测试在运行中的事件循环内搜索：本地命中直接返回，未命中时使用异步并发搜索
+        self.index.add("mteam", [{"id": "1", "name": "Local Torrent"}])
+        remote = MagicMock()
+        remote.items = [{"id": "9", "name": "Remote Torrent", "site": "carpt"}]
+
+        async def run():
+            with patch("torrentbotx.trackers.local_index.async_search_all", AsyncMock(return_value=remote)) as search:
+                local = await async_local_search("local", index=self.index)
+                search.assert_not_called()
+                return local, await async_local_search("remote", index=self.index)
+
+        local, fallback = asyncio.run(run())
+        self.assertEqual(local[0]["torrent_id"], "1")
+        self.assertEqual(fallback[0]["site"], "carpt")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
+import time
 import unittest
-from torrentbotx.core.manager import TorrentManager
-from unittest.mock import MagicMock
+from tests.helpers import Config
+from torrentbotx.core.manager import CoreManager, TorrentManager
+from unittest.mock import MagicMock, patch
 
 class TestTorrentManager(unittest.TestCase):
 
@@ -26,3 +28,44 @@ class TestTorrentManager(unittest.TestCase):
         # 清理资源
         del self.manager
         del self.qb_client_mock
+
+
+class TestCoreManagerFanOut(unittest.TestCase):
+
+    def _manager(self, downloaders, timeout=5.0):
+        with patch.object(CoreManager, "_init_downloaders", return_value=downloaders):
+            return CoreManager(config=Config(DOWNLOADER_TIMEOUT=timeout), notifier=MagicMock())
+
+    def _downloader(self, name, delay=0.0, result=True, error=None):
+        downloader = MagicMock()
+        downloader.name = name
+
+        def add(_):
+            time.sleep(delay)
+            if error:
+                raise error
+            return result
+
+        downloader.has_torrent.return_value = False
+        downloader.add_torrent_file.side_effect = add
+        return downloader
+
+    def test_concurrent_fan_out(self):
+        # 测试并发添加：总耗时约等于最慢的下载器，结果按下载器逐个给出
+        downloaders = [self._downloader("qbittorrent", 0.2), self._downloader("transmission", 0.2),
+                       self._downloader("aria2", 0.2, error=RuntimeError("rpc error"))]
+        manager = self._manager(downloaders)
+        started = time.monotonic()
+        results = manager._fan_out(lambda d: d.add_torrent_file(b""))
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual([r.status for r in results], ["added", "added", "failed"])
+        self.assertEqual(results[2].error, "rpc error")
+        self.assertGreaterEqual(results[0].latency, 0.2)
+
+    def test_timeout(self):
+        # 测试卡住的下载器在超时后被标记为 timeout，不影响其他下载器
+        downloaders = [self._downloader("qbittorrent"), self._downloader("aria2", 1.0)]
+        manager = self._manager(downloaders, timeout=0.2)
+        results = manager._fan_out(lambda d: d.add_torrent_file(b""))
+        self.assertTrue(results[0].success)
+        self.assertEqual(results[1].status, "timeout")
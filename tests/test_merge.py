@@ -0,0 +1,51 @@
+import unittest
+
+from torrentbotx.trackers.merge import fingerprints, merge_results, normalize_title
+
+
+class TestMergeResults(unittest.TestCase):
+
+    def test_normalize_title(self):
+        # 测试标题规范化：忽略大小写与分隔符差异
+        self.assertEqual(normalize_title("Movie.Name_2023-1080p "), normalize_title("movie name 2023 1080P"))
+
+    def test_fingerprints(self):
+        # 测试指纹：已知 infohash 时同时生成两种指纹，缺少大小时不生成标题指纹
+        item = {"name": "Movie.2023", "size": "100", "infoHash": "ABC"}
+        self.assertEqual(fingerprints(item), ["ih:abc", "ts:movie 2023:100"])
+        self.assertEqual(fingerprints({"name": "Movie.2023"}), [])
+
+    def test_merge_by_title_and_size(self):
+        # 测试同名同大小的种子合并为一条，站点按促销和做种数排序
+        items = [
+            {"id": "1", "name": "Movie.2023.1080p", "size": "100", "seeders": 50, "site": "mteam"},
+            {"id": "2", "name": "Other", "size": "100", "seeders": 5, "site": "mteam"},
+            {"id": "3", "name": "movie 2023 1080p", "size": 100, "seeders": 10, "site": "carpt",
+             "status": {"discount": "FREE"}},
+            {"id": "4", "name": "Movie 2023 1080p", "size": 101, "seeders": 80, "site": "ptskit"},
+        ]
+        merged = merge_results(items)
+        self.assertEqual(len(merged), 3)
+        self.assertEqual(merged[0].sites, ["carpt", "mteam"])
+        self.assertEqual(merged[0].best["id"], "3")
+        self.assertEqual(merged[0].to_dict()["duplicates"], 2)
+
+    def test_merge_bridged_by_infohash(self):
+        # 测试按 infohash 桥接：先出现的两个分组被同一个种子连接后合并为一个
+        items = [
+            {"id": "1", "name": "A", "size": 1, "infoHash": "h1", "site": "mteam"},
+            {"id": "2", "name": "B", "size": 2, "site": "carpt"},
+            {"id": "3", "name": "B", "size": 2, "infoHash": "H1", "site": "ptskit"},
+        ]
+        merged = merge_results(items)
+        self.assertEqual(len(merged), 1)
+        self.assertEqual(sorted(merged[0].sites), ["carpt", "mteam", "ptskit"])
+
+    def test_merge_keeps_items_without_fingerprint(self):
+        # 测试无法生成指纹的种子各自保留
+        merged = merge_results([{"id": "1", "site": "mteam"}, {"id": "2", "site": "mteam"}])
+        self.assertEqual(len(merged), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
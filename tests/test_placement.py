@@ -0,0 +1,73 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from tests.helpers import Config
+from torrentbotx.core.manager import CoreManager
+from torrentbotx.core.pipeline import TorrentFile
+from torrentbotx.core.placement import GB, DownloaderLoad, PlacementEngine
+from torrentbotx.utils.bencode import parse_torrent
+
+
+def _downloader(name, load):
+    downloader = MagicMock()
+    downloader.name = name
+    downloader.get_load.return_value = load
+    downloader.has_torrent.return_value = False
+    downloader.add_torrent_file.return_value = True
+    return downloader
+
+
+class TestPlacementEngine(unittest.TestCase):
+
+    def test_prefers_idle_downloader(self):
+        # 测试优先选择下载任务少、速率低、空间大的下载器
+        busy = _downloader("qbittorrent", DownloaderLoad(free_space=100 * GB, active=10, download_speed=50_000_000))
+        idle = _downloader("transmission", DownloaderLoad(free_space=200 * GB, active=1, download_speed=1_000))
+        engine = PlacementEngine({"replicas": 1})
+        self.assertEqual(engine.choose([busy, idle]), [idle])
+
+    def test_free_space_and_category(self):
+        # 测试剩余空间不足的下载器被排除，分类亲和度优先于负载
+        full = _downloader("aria2", DownloaderLoad(free_space=5 * GB))
+        preferred = _downloader("qbittorrent", DownloaderLoad(free_space=100 * GB, active=5, download_speed=10))
+        other = _downloader("transmission", DownloaderLoad(free_space=100 * GB))
+        engine = PlacementEngine({"categories": {"movie": ["qbittorrent"]}})
+        self.assertEqual(engine.choose([full, preferred, other], size=GB, category="movie"), [preferred])
+        self.assertEqual(engine.choose([full, preferred, other], size=GB), [other])
+        self.assertEqual(engine.choose([full], size=GB), [])
+        self.assertEqual(PlacementEngine({"strategy": "all"}).choose([full, other]), [full, other])
+
+    def test_cached_load_spreads_placements(self):
+        # 测试负载在 state_ttl 内只获取一次，记录添加后后续种子分散到其他下载器
+        first = _downloader("qbittorrent", DownloaderLoad(free_space=100 * GB, active=1))
+        second = _downloader("transmission", DownloaderLoad(free_space=100 * GB, active=1))
+        engine = PlacementEngine({"state_ttl": 60})
+        chosen = []
+        for _ in range(4):
+            target = engine.choose([first, second])[0]
+            engine.record_added(target, GB)
+            chosen.append(target.name)
+        self.assertEqual(chosen.count("qbittorrent"), 2)
+        self.assertEqual(first.get_load.call_count, 1)
+
+
+class TestPlacementDownloadTask(unittest.TestCase):
+
+    @patch("torrentbotx.core.manager.fetch_torrent")
+    @patch("torrentbotx.core.manager.get_tracker_by_name")
+    def test_download_task_uses_placement(self, get_tracker_by_name, fetch_torrent):
+        # 测试单个下载任务只添加到得分最高的下载器
+        data = b"d4:infod6:lengthi1e4:name1:a12:piece lengthi16384e6:pieces20:" + b"\x00" * 20 + b"ee"
+        fetch_torrent.return_value = TorrentFile(data, parse_torrent(data), "mteam", "1")
+        busy = _downloader("qbittorrent", DownloaderLoad(free_space=100 * GB, active=10))
+        idle = _downloader("transmission", DownloaderLoad(free_space=100 * GB))
+        with patch.object(CoreManager, "_init_downloaders", return_value=[busy, idle]):
+            manager = CoreManager(config=Config(), notifier=MagicMock())
+
+        result = manager.execute_download_task({"torrent_id": "1"})
+        self.assertEqual([r.downloader for r in result.results], ["transmission"])
+        busy.add_torrent_file.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
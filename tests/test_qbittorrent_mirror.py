@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import MagicMock
+
+from torrentbotx.downloaders.qbittorrent import QBittorrentDownloader
+from torrentbotx.downloaders.qbittorrent_mirror import QBittorrentMirror
+
+
+class TestQBittorrentMirror(unittest.TestCase):
+
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.sync_maindata.side_effect = [
+            {"rid": 1, "full_update": True,
+             "torrents": {
+                 "aaa": {"name": "A", "state": "downloading", "progress": 0.5, "size": 100, "dlspeed": 10,
+                         "category": "movie", "tags": "hd, new"},
+                 "bbb": {"name": "B", "state": "stalledUP", "progress": 1, "size": 200, "upspeed": 0},
+             },
+             "categories": {"movie": {"savePath": "/movie"}}, "tags": ["hd", "new"],
+             "server_state": {"free_space_on_disk": 1000}},
+            {"rid": 2, "torrents": {"aaa": {"state": "uploading", "progress": 1}},
+             "torrents_removed": ["bbb"], "tags_removed": ["new"]},
+        ]
+        self.mirror = QBittorrentMirror(self.client, min_interval=60)
+
+    def test_full_then_delta(self):
+        # 测试首次全量同步后只合并变化的字段，并按 rid 请求增量
+        self.mirror.sync()
+        self.assertEqual(self.mirror.totals()["size"], 300)
+        self.assertEqual(len(self.mirror.get_torrents("downloading")), 1)
+        self.assertEqual(len(self.mirror.get_torrents(tag="hd")), 1)
+
+        self.mirror.sync()
+        self.client.sync_maindata.assert_called_with(rid=1)
+        torrent = self.mirror.get_torrent("aaa")
+        self.assertEqual((torrent["name"], torrent["state"], torrent["category"]), ("A", "uploading", "movie"))
+        self.assertIsNone(self.mirror.get_torrent("bbb"))
+        self.assertEqual(self.mirror.tags, {"hd"})
+        self.assertEqual(self.mirror.status_counts(), {"uploading": 1})
+        self.assertEqual(self.mirror.rid, 2)
+
+    def test_refresh_reads_local_within_interval(self):
+        # 测试最小同步间隔内的查询不请求 qBittorrent
+        self.mirror.refresh()
+        self.mirror.refresh()
+        self.assertEqual(self.client.sync_maindata.call_count, 1)
+        with self.assertRaises(ValueError):
+            self.mirror.get_torrents("unknown")
+
+
+class TestQBittorrentHasTorrent(unittest.TestCase):
+
+    def test_uses_mirror_when_synced(self):
+        # 测试镜像同步正常时直接查镜像，同步失败后回退到 torrents_info
+        downloader = QBittorrentDownloader.__new__(QBittorrentDownloader)
+        downloader.client = MagicMock()
+        downloader.mirror = QBittorrentMirror(downloader.client, min_interval=0)
+        downloader.client.sync_maindata.return_value = {"rid": 1, "full_update": True, "torrents": {"aaa": {}}}
+        self.assertTrue(downloader.has_torrent("AAA"))
+        self.assertFalse(downloader.has_torrent("bbb"))
+        downloader.client.torrents_info.assert_not_called()
+
+        downloader.client.sync_maindata.side_effect = ConnectionError("refused")
+        downloader.client.torrents_info.return_value = [{"hash": "bbb"}]
+        self.assertTrue(downloader.has_torrent("bbb"))
+        self.assertFalse(downloader.mirror.synced)
+        downloader.client.torrents_info.assert_called_once_with(torrent_hashes="bbb")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from unittest.mock import MagicMock
+
+from torrentbotx.trackers.mteam import MTeamTracker
+from torrentbotx.trackers.ratelimit import AdaptiveRateLimiter, parse_retry_after
+
+
+def _response(status_code, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = {"message": "SUCCESS", "data": "https://example.com/dl"}
+    return response
+
+
+class TestAdaptiveRateLimiter(unittest.TestCase):
+
+    def test_backoff_on_throttle_and_ramp_up(self):
+        # 测试收到 429 时并发窗口减半并遵守 Retry-After，成功后逐步恢复
+        limiter = AdaptiveRateLimiter(rate=100, burst=10, max_concurrency=8)
+        limiter.acquire()
+        limiter.release(429, retry_after=30)
+        self.assertEqual(limiter.concurrency, 4)
+        self.assertGreater(limiter.retry_delay, 29)
+        self.assertGreater(limiter._try_acquire(), 29)
+
+        limiter._blocked_until = 0
+        for _ in range(40):
+            limiter.acquire()
+            limiter.release(200)
+        self.assertEqual(limiter.concurrency, 8)
+
+    def test_concurrency_window(self):
+        # 测试进行中的请求达到并发窗口时不再放行
+        limiter = AdaptiveRateLimiter(rate=100, burst=10, max_concurrency=2)
+        limiter.acquire()
+        limiter.acquire()
+        self.assertGreater(limiter._try_acquire(), 0)
+        limiter.release(200)
+        self.assertEqual(limiter._try_acquire(), 0)
+
+    def test_parse_retry_after(self):
+        # 测试解析 Retry-After 秒数与 HTTP 日期
+        self.assertEqual(parse_retry_after("5"), 5)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0)
+        self.assertIsNone(parse_retry_after(None))
+
+    def test_tracker_retries_after_throttle(self):
+        # 测试 Tracker 收到 429 后按 Retry-After 等待并重试
+        tracker = MTeamTracker(api_key="key", rate_limiter=AdaptiveRateLimiter(rate=100))
+        tracker.transport = MagicMock()
+        tracker.transport.post.side_effect = [_response(429, {"Retry-After": "0"}), _response(200)]
+
+        self.assertEqual(tracker.get_download_link("12345"), "https://example.com/dl")
+        self.assertEqual(tracker.transport.post.call_count, 2)
+        self.assertEqual(tracker.rate_limiter.throttled, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from torrentbotx.trackers.cache import FRESH, SearchCache, TTLCache
+from torrentbotx.trackers.mteam import MTeamTracker
+
+
+class TestSearchCache(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        # 测试超过容量时淘汰最久未使用的条目
+        cache = TTLCache(max_entries=2, ttl=60)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats["evictions"], 1)
+
+    def test_stale_value_is_served_and_refreshed(self):
+        # 测试过期条目先返回旧值，并在后台刷新
+        cache = SearchCache(ttl=0, stale_ttl=60)
+        key = cache.make_key("mteam", "  Test  Keyword ", 1, 5)
+        cache.put(key, "old")
+        cache.set_site_ttl("mteam", 60)
+        refreshed = threading.Event()
+
+        def loader():
+            refreshed.set()
+            return "new"
+
+        self.assertEqual(cache.get_or_load(key, loader), "old")
+        self.assertTrue(refreshed.wait(1))
+        for _ in range(50):
+            if cache.get(key) == "new":
+                break
+            time.sleep(0.01)
+        self.assertEqual(cache.lookup(key), ("new", FRESH))
+        self.assertEqual(cache.stats["stale_hits"], 1)
+
+    def test_tracker_search_uses_cache(self):
+        # 测试重复搜索（关键词大小写/空白不同）只请求站点一次
+        tracker = MTeamTracker(api_key="key")
+        tracker.search_cache = SearchCache()
+        tracker.transport = MagicMock()
+        tracker.transport.post.return_value.status_code = 200
+        tracker.transport.post.return_value.json.return_value = {"message": "SUCCESS", "data": {"data": []}}
+
+        tracker.search_torrents("Test Keyword")
+        tracker.search_torrents("test  keyword")
+        self.assertEqual(tracker.transport.post.call_count, 1)
+        self.assertEqual(tracker.search_cache.stats["hits"], 1)
+
+        tracker.search_torrents("test keyword", page=2)
+        self.assertEqual(tracker.transport.post.call_count, 2)
+
+    def test_expired_entry_is_dropped(self):
+        # 测试超过 stale 窗口的条目视为未命中
+        cache = TTLCache(ttl=0, stale_ttl=0)
+        cache.put("a", 1)
+        self.assertEqual(cache.lookup("a"), (None, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+from benchmarks.standin import DOWNLOAD_PATH, SEARCH_PATH, StandInTracker, default_fixtures
+from torrentbotx.trackers.mteam import MTeamTracker
+from torrentbotx.trackers.ratelimit import AdaptiveRateLimiter
+
+
+class TestStandInTracker(unittest.TestCase):
+
+    def _tracker(self, standin):
+        tracker = MTeamTracker(api_key="key", base_url=standin.url,
+                               rate_limiter=AdaptiveRateLimiter(rate=100, burst=10))
+        tracker.search_cache = None
+        return tracker
+
+    def test_replay_fixtures(self):
+        # 测试通过真实 HTTP 请求回放录制的响应，同一接口的多个响应按顺序循环
+        fixtures = default_fixtures(page_size=3)
+        fixtures[DOWNLOAD_PATH] = [{"message": "SUCCESS", "data": "https://a"},
+                                   {"message": "SUCCESS", "data": "https://b"}]
+        with StandInTracker(fixtures=fixtures) as standin:
+            tracker = self._tracker(standin)
+            result = tracker.search_torrents("test")
+            links = [tracker.get_download_link("1") for _ in range(3)]
+        self.assertEqual(result, fixtures[SEARCH_PATH][0]["data"])
+        self.assertEqual(links, ["https://a", "https://b", "https://a"])
+        self.assertEqual(standin.stats["requests"], 4)
+
+    def test_inject_throttle_and_errors(self):
+        # 测试注入 429（Tracker 重试后仍失败）和 500
+        with StandInTracker(throttle_rate=1.0, retry_after=0) as standin:
+            tracker = self._tracker(standin)
+            self.assertIsNone(tracker.search_torrents("test"))
+        self.assertEqual(standin.stats["throttled"], tracker.rate_limiter.max_retries + 1)
+
+        with StandInTracker(error_rate=1.0) as standin:
+            self.assertIsNone(self._tracker(standin).get_torrent_details("1"))
+        self.assertEqual(standin.stats["errors"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
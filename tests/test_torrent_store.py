@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from torrentbotx.core.manager import CoreManager
+from torrentbotx.models.torrent_store import TorrentStore, from_aria2, from_qbittorrent, from_transmission
+
+
+class TestTorrentStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = TorrentStore()
+        self.store.replace("qbittorrent", [
+            from_qbittorrent({"hash": "A1", "name": "movie", "size": 100, "progress": 1.0, "state": "uploading",
+                              "category": "movie", "upspeed": 10, "ratio": 2.5, "added_on": 1000}),
+            from_qbittorrent({"hash": "b2", "name": "show", "size": 50, "progress": 0.5, "state": "downloading",
+                              "category": "tv", "dlspeed": 20, "ratio": 0.1, "added_on": 2000}),
+        ])
+        self.store.replace("transmission", [
+            from_transmission({"hashString": "c3", "name": "album", "totalSize": 30, "percentDone": 1.0,
+                               "status": 6, "labels": ["music"], "uploadRatio": 3.0, "addedDate": 500}),
+        ])
+        self.store.replace("aria2", [
+            from_aria2({"gid": "g1", "status": "paused", "totalLength": "40", "completedLength": "10",
+                        "uploadLength": "0", "bittorrent": {"info": {"name": "iso"}}}),
+        ])
+
+    def test_normalized_columns(self):
+        # 测试不同下载器的字段统一后写入列式快照，状态和分类为驻留字符串
+        self.assertEqual(len(self.store), 4)
+        row = self.store.get("qbittorrent", "a1")
+        self.assertEqual((row.name, row.state, row.ratio), ("movie", "seeding", 2.5))
+        self.assertEqual(self.store.get("aria2", "g1").to_dict()["progress"], 0.25)
+        self.assertIs(self.store.columns["state"][0], self.store.columns["state"][2])
+        with self.assertRaises(AttributeError):
+            row.missing
+
+    def test_select_sort_aggregate(self):
+        # 测试列上的筛选、排序和汇总
+        seeding = self.store.select(state="seeding", ratio=(">=", 2.0))
+        self.assertEqual({row.name for row in self.store.rows(seeding)}, {"movie", "album"})
+        self.assertEqual(self.store.select(downloader={"aria2", "transmission"}, category="music"), [2])
+        oldest = self.store.sort("added_on", seeding, limit=1)
+        self.assertEqual(self.store.rows(oldest)[0].name, "album")
+        self.assertEqual(self.store.sum("size"), 220)
+        self.assertEqual(self.store.group_by("state"), {"seeding": 2, "downloading": 1, "paused": 1})
+        self.assertEqual(self.store.group_by("downloader", "size")["qbittorrent"], 100 + 50)
+
+    def test_replace_removes_stale_rows(self):
+        # 测试替换下载器的列表时删除已不存在的种子，其余行的索引保持正确
+        self.store.replace("qbittorrent", [from_qbittorrent({"hash": "b2", "name": "show", "state": "pausedDL"})])
+        self.assertEqual(len(self.store), 3)
+        self.assertIsNone(self.store.get("qbittorrent", "a1"))
+        self.assertEqual(self.store.get("qbittorrent", "b2").state, "paused")
+        self.assertEqual(self.store.get("aria2", "g1").name, "iso")
+        self.assertEqual(len(self.store.columns["ratio"]), 3)
+
+    def test_manager_stats(self):
+        # 测试 CoreManager 从各下载器刷新快照并汇总统计，失败的下载器保留旧数据
+        downloader = MagicMock()
+        downloader.name = "qbittorrent"
+        downloader.get_snapshot_records.return_value = [from_qbittorrent({"hash": "a", "size": 7,
+                                                                          "state": "uploading"})]
+        with patch.object(CoreManager, "_init_downloaders", return_value=[downloader]):
+            manager = CoreManager(config=MagicMock(get=lambda key, default=None: default), notifier=MagicMock())
+        self.assertEqual(manager.execute_task("torrent_stats", {})["size"], 7)
+        downloader.get_snapshot_records.side_effect = RuntimeError("down")
+        self.assertEqual(manager.execute_task("torrent_stats", {})["by_state"], {"seeding": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
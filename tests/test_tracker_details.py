@@ -0,0 +1,96 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from torrentbotx.trackers.mteam import MTeamTracker
+from torrentbotx.trackers.ratelimit import AdaptiveRateLimiter
+
+
+class TestTorrentDetailsMany(unittest.TestCase):
+
+    def setUp(self):
+        # 模拟 M-Team 详情接口，每次请求耗时 50ms
+        self.tracker = MTeamTracker(api_key="key", details_limiter=AdaptiveRateLimiter(rate=1000, burst=100,
+                                                                                        max_concurrency=50))
+        self.tracker.transport = MagicMock()
+        self.requested = []
+        self.lock = threading.Lock()
+
+        def post(url, data=None, **kwargs):
+            with self.lock:
+                self.requested.append(data["id"])
+            time.sleep(0.05)
+            response = MagicMock()
+            response.status_code = 200
+            response.headers = {}
+            response.json.return_value = {"message": "SUCCESS", "data": {"id": data["id"]}}
+            return response
+
+        self.tracker.transport.post.side_effect = post
+
+    def test_many_deduplicates_and_runs_concurrently(self):
+        # 测试批量获取详情会去重，并发请求总耗时接近一次往返
+        ids = [str(i) for i in range(20)] + ["1", "2"]
+        started = time.monotonic()
+        results = self.tracker.get_torrent_details_many(ids, max_workers=20)
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(list(results), [str(i) for i in range(20)])
+        self.assertEqual(results["3"], {"id": "3"})
+        self.assertEqual(sorted(self.requested), sorted(str(i) for i in range(20)))
+        self.assertLess(elapsed, 0.5)
+
+        # 再次获取时命中详情缓存
+        self.tracker.get_torrent_details_many(["1", "2"])
+        self.assertEqual(len(self.requested), 20)
+
+    def test_default_limits_do_not_serialize_batch(self):
+        # 测试默认参数下批量获取 50 个详情不按搜索的限流速率排队，也不消耗搜索的令牌
+        tracker = MTeamTracker(api_key="key")
+        tracker.transport = self.tracker.transport
+        started = time.monotonic()
+        results = tracker.get_torrent_details_many([str(i) for i in range(50)])
+        self.assertLess(time.monotonic() - started, 2.0)
+        self.assertEqual(len([details for details in results.values() if details]), 50)
+        self.assertEqual(tracker.rate_limiter._tokens, tracker.rate_limiter.burst)
+
+    def test_concurrent_callers_share_one_request(self):
+        # 测试多个调用方同时请求同一 ID 时只发送一次请求
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            results = list(executor.map(self.tracker.get_torrent_details_cached, ["42"] * 5))
+        self.assertEqual(results, [{"id": "42"}] * 5)
+        self.assertEqual(self.requested, ["42"])
+
+
+
+class TestDownloadTorrent(unittest.TestCase):
+
+    def setUp(self):
+        self.tracker = MTeamTracker(api_key="key")
+        self.tracker.transport = MagicMock()
+        self.tracker.circuit_breaker = MagicMock()
+        response = MagicMock()
+        response.status_code = 200
+        response.headers = {}
+        response.content = b"torrent"
+        self.tracker.transport.get.return_value = response
+
+    def test_foreign_host_without_api_key(self):
+        # 测试其他主机的下载链接不携带 API Key，也不经过站点熔断器
+        self.tracker.get_download_link = MagicMock(return_value="https://cdn.example.com/t/1.torrent?sign=x")
+        self.assertEqual(self.tracker.download_torrent("1"), b"torrent")
+        self.tracker.transport.get.assert_called_once_with("https://cdn.example.com/t/1.torrent?sign=x")
+        self.tracker.circuit_breaker.record_success.assert_not_called()
+
+    def test_site_host_with_api_key(self):
+        # 测试站点自身的下载链接携带站点请求头
+        self.tracker.get_download_link = MagicMock(return_value=f"{self.tracker.base_url}/download/1")
+        self.assertEqual(self.tracker.download_torrent("1"), b"torrent")
+        headers = self.tracker.transport.get.call_args.kwargs["headers"]
+        self.assertEqual(headers["x-api-key"], "key")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import asyncio
+import unittest
+
+import httpx
+
+from tests.helpers import Config
+from torrentbotx.config.config import PTItem
+from torrentbotx.trackers import (CarptTracker, MTeamTracker, async_search_all, get_configured_trackers,
+                                  get_tracker_by_name, reset_trackers)
+from torrentbotx.trackers.transport import TrackerTransport
+
+
+def _make_response(items):
+    return httpx.Response(200, json={"message": "SUCCESS", "data": {"data": items, "total": len(items)}})
+
+
+class TestSearchAll(unittest.TestCase):
+
+    def setUp(self):
+        # 模拟两个站点：M-Team 立即返回，Carpt 响应缓慢
+        async def handler(request):
+            if request.url.host == "slow.example":
+                await asyncio.sleep(1)
+                return _make_response([{"id": "2", "name": "Slow Torrent"}])
+            return _make_response([{"id": "1", "name": "Fast Torrent"}])
+
+        self.transport = httpx.MockTransport(handler)
+        self.trackers = [
+            MTeamTracker(api_key="key", base_url="https://fast.example"),
+            CarptTracker(api_key="key", base_url="https://slow.example"),
+        ]
+        for tracker in self.trackers:
+            tracker.search_cache = None
+
+    def _search(self, deadline):
+        async def run():
+            async with httpx.AsyncClient(transport=self.transport) as client:
+                return await async_search_all("test", deadline=deadline, trackers=self.trackers, client=client)
+
+        return asyncio.run(run())
+
+    def test_partial_results_before_deadline(self):
+        # 测试截止时间到达时返回已完成站点的结果，并标记超时站点
+        result = self._search(deadline=0.2)
+        self.assertEqual(result.timed_out, ["carpt"])
+        self.assertEqual([item["name"] for item in result.items], ["Fast Torrent"])
+        self.assertEqual(result.items[0]["site"], "mteam")
+        self.assertLess(result.elapsed, 1)
+
+    def test_all_sites_within_deadline(self):
+        # 测试所有站点都在截止时间内返回
+        result = self._search(deadline=5)
+        self.assertTrue(result.complete)
+        self.assertEqual(sorted(item["site"] for item in result.items), ["carpt", "mteam"])
+
+
+class TestTrackerRegistry(unittest.TestCase):
+
+    def tearDown(self):
+        reset_trackers()
+
+    def test_instances_are_long_lived_and_share_transport(self):
+        # 测试注册表复用站点实例，所有站点共用同一个连接池
+        config = Config(LOCAL_INDEX_ENABLED=False, PT_SITES=[
+            PTItem(name="M-Team", api_key="mt-key", api_url="https://mt.example/"),
+            PTItem(name="carpt", api_key="carpt-key", api_url="https://carpt.example", rate_limit=5,
+                   details_burst=20),
+        ])
+        trackers = get_configured_trackers(config, refresh=True)
+        self.assertEqual([tracker.site for tracker in trackers], ["mteam", "carpt"])
+        self.assertIs(get_tracker_by_name("M-Team"), trackers[0])
+        self.assertIs(get_configured_trackers()[1], trackers[1])
+        self.assertIs(trackers[0].transport, trackers[1].transport)
+        self.assertEqual(trackers[0].base_url, "https://mt.example")
+        self.assertEqual(trackers[1].rate_limiter.rate, 5)
+        self.assertEqual(trackers[1].details_limiter.burst, 20)
+
+    def test_rebuild_closes_previous_transport(self):
+        # 测试重建站点时关闭旧传输层的连接池和异步客户端
+        config = Config(LOCAL_INDEX_ENABLED=False, PT_SITES=[PTItem(name="M-Team", api_key="k", api_url="https://mt.example")])
+        old = get_configured_trackers(config, refresh=True)[0].transport
+
+        async def use_async_client():
+            return old.get_async_client()
+
+        loop = asyncio.new_event_loop()
+        try:
+            client = loop.run_until_complete(use_async_client())
+            new = get_configured_trackers(config, refresh=True)[0].transport
+            self.assertIsNot(new, old)
+            self.assertTrue(client.is_closed)
+        finally:
+            loop.close()
+
+    def test_aclose_closes_current_loop_client(self):
+        # 测试在事件循环内 aclose 等待当前循环的客户端关闭
+        transport = TrackerTransport()
+
+        async def run():
+            client = transport.get_async_client()
+            await transport.aclose()
+            return client
+
+        self.assertTrue(asyncio.run(run()).is_closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
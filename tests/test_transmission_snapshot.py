@@ -0,0 +1,64 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from torrentbotx.downloaders.transmission_snapshot import STATUS_FIELDS, TransmissionSnapshot
+
+
+def _torrent(**fields):
+    torrent = MagicMock()
+    torrent.fields = fields
+    return torrent
+
+
+class TestTransmissionSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.get_torrents.return_value = [
+            _torrent(id=1, hashString="a", name="A", status=4, percentDone=0.5),
+            _torrent(id=2, hashString="b", name="B", status=6, percentDone=1.0),
+        ]
+        self.snapshot = TransmissionSnapshot(self.client, fields=STATUS_FIELDS, full_sync_interval=300)
+
+    def test_recently_active_merge(self):
+        # 测试首次全量同步，之后只合并 recently-active 返回的变化和删除
+        self.assertEqual(len(self.snapshot.poll()), 2)
+        self.client.get_torrents.assert_called_once_with(arguments=list(STATUS_FIELDS))
+
+        self.client.get_recently_active_torrents.return_value = (
+            [_torrent(id=1, hashString="a", status=6, percentDone=1.0)], [2])
+        changed = self.snapshot.poll()
+        self.assertEqual(len(changed), 1)
+        self.assertEqual(self.client.get_torrents.call_count, 1)
+        self.assertEqual(self.snapshot.get_torrents(),
+                         [{"id": 1, "hashString": "a", "name": "A", "status": 6, "percentDone": 1.0}])
+        self.assertEqual(len(self.snapshot.get_torrents(status="seeding")), 1)
+
+    def test_periodic_full_sync(self):
+        # 测试超过全量同步间隔后重新全量获取
+        self.snapshot.full_sync_interval = 0
+        self.snapshot.poll()
+        self.snapshot.poll()
+        self.assertEqual(self.client.get_torrents.call_count, 2)
+        self.client.get_recently_active_torrents.assert_not_called()
+
+    def test_full_sync_after_recently_active_window(self):
+        # 测试两次轮询间隔超过 recently-active 窗口时改为全量同步，不会漏掉期间的删除
+        with patch("torrentbotx.downloaders.transmission_snapshot.time.monotonic", return_value=1000.0) as clock:
+            self.snapshot.poll()
+            clock.return_value = 1010.0
+            self.client.get_recently_active_torrents.return_value = ([], [])
+            self.snapshot.poll()
+            self.assertEqual(self.client.get_torrents.call_count, 1)
+
+            # 种子 2 在间隔期间被删除，recently-active 已不再报告
+            self.client.get_torrents.return_value = [_torrent(id=1, hashString="a", name="A", status=6)]
+            clock.return_value = 1130.0
+            self.snapshot.poll()
+        self.assertEqual(self.client.get_torrents.call_count, 2)
+        self.assertEqual(self.client.get_recently_active_torrents.call_count, 1)
+        self.assertEqual([torrent["id"] for torrent in self.snapshot.get_torrents()], [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,14 +1,18 @@
 """
 torrentbotx 包初始化
-提供对外统一接口
+提供对外统一接口，各接口在第一次访问时才导入，
+短时运行的命令行和定时任务只加载实际用到的模块
 """
 
-# 导入核心功能类
-from torrentbotx.config.config import Config
-from torrentbotx.core.manager import CoreManager
-from torrentbotx.tasks.scheduler import TaskScheduler
-from torrentbotx.downloaders.base import get_downloader_instance
-from torrentbotx.enums.downloader_type import DownloaderType
+import importlib
+
+_EXPORTS = {
+    "Config": "torrentbotx.config.config",
+    "CoreManager": "torrentbotx.core.manager",
+    "TaskScheduler": "torrentbotx.tasks.scheduler",
+    "get_downloader_instance": "torrentbotx.downloaders.base",
+    "DownloaderType": "torrentbotx.enums.downloader_type",
+}
 
 __all__ = [
     "Config",
@@ -18,6 +22,20 @@ __all__ = [
     "DownloaderType"
 ]
 
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
+
+
 """
 使用示例:
 from torrentbotx import CoreManager, Config
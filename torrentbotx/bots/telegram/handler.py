@@ -1,6 +1,9 @@
+import asyncio
+
 from telegram import Update
 from telegram.ext import ContextTypes
 
+from torrentbotx.trackers import get_tracker_status
 from torrentbotx.utils.logger import get_logger
 
 logger = get_logger("telegram_handler")
@@ -23,8 +26,9 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         "<b>💡 机器人命令帮助：</b>\n\n"
         "/start - 启动并显示欢迎信息。\n"
         "/help - 显示帮助信息。\n"
-        "/add [M-Team ID] - 添加 M-Team ID 对应的种子到下载队列。\n"
+        "/add [M-Team ID ...] - 添加一个或多个 M-Team ID 对应的种子到下载队列。\n"
         "/qbtasks - 显示当前下载任务。\n"
+        "/sites - 查看各 PT 站点是否可用。\n"
         "/cancel - 取消当前操作。\n"
     )
     await update.message.reply_html(help_text)
@@ -32,18 +36,28 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 
 async def add_task(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
-    /add [M-Team ID] 命令处理，添加下载任务
+    /add [M-Team ID ...] 命令处理，添加一个或多个下载任务
     """
     if not context.args:
-        await update.message.reply_text("⚠️ 请输入 M-Team ID，例如: /add 12345")
+        await update.message.reply_text("⚠️ 请输入 M-Team ID，例如: /add 12345 或 /add 12345 12346")
+        return
+
+    core_manager = context.bot_data["core_manager"]
+    if len(context.args) > 1:
+        logger.info(f"用户请求批量添加 {len(context.args)} 个 M-Team 种子。")
+        # 批量添加会阻塞较长时间（逐个获取链接并等待下载器确认），放到线程中执行以免阻塞事件循环
+        results = await asyncio.to_thread(core_manager.execute_task, "batch_download",
+                                          {"torrent_ids": context.args})
+        lines = [f"{'✅' if result else '❌'} {torrent_id} {result.name if result else ''}".rstrip()
+                 for torrent_id, result in zip(context.args, results)]
+        await update.message.reply_text("📦 批量添加结果：\n" + "\n".join(lines))
         return
 
     mt_id = context.args[0]
     logger.info(f"用户请求添加 M-Team ID {mt_id} 的任务。")
-    core_manager = context.bot_data["core_manager"]
 
     # 执行下载任务
-    success = core_manager.execute_task("download", {"torrent_id": mt_id})
+    success = await asyncio.to_thread(core_manager.execute_task, "download", {"torrent_id": mt_id})
     if success:
         await update.message.reply_text(f"✅ 已成功添加种子 ID {mt_id} 到下载队列。")
     else:
@@ -79,3 +93,25 @@ async def cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         await update.message.reply_text("✅ 已成功取消当前任务。")
     else:
         await update.message.reply_text("❌ 无法取消任务，可能没有正在进行的任务。")
+
+
+async def sites(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    /sites 命令处理，根据熔断器状态显示各站点是否可用（不请求站点）
+    """
+    logger.info("用户请求查看站点状态。")
+    status = get_tracker_status()
+    if not status:
+        await update.message.reply_text("❌ 未配置任何 PT 站点。")
+        return
+
+    lines = []
+    for item in status.values():
+        if item["state"] == "closed":
+            lines.append(f"✅ {item['display_name']} - 正常")
+        elif item["state"] == "half_open":
+            lines.append(f"🔄 {item['display_name']} - 正在探测恢复")
+        else:
+            lines.append(f"⛔ {item['display_name']} - 暂不可用，{item['retry_in']:.0f}s 后重试"
+                         f"（{item['last_error'] or '未知错误'}）")
+    await update.message.reply_text("🌐 站点状态：\n" + "\n".join(lines))
@@ -1,6 +1,6 @@
 from telegram.ext import Application, CommandHandler, MessageHandler, filters
 
-from torrentbotx.bots.telegram.handler import start, help_command, add_task, qbtasks, cancel
+from torrentbotx.bots.telegram.handler import start, help_command, add_task, qbtasks, cancel, sites
 from torrentbotx.utils.logger import get_logger
 
 logger = get_logger("telegram_updater")
@@ -18,6 +18,7 @@ def setup_application(application: Application, bot_token: str):
     application.add_handler(CommandHandler("add", add_task))
     application.add_handler(CommandHandler("qbtasks", qbtasks))
     application.add_handler(CommandHandler("cancel", cancel))
+    application.add_handler(CommandHandler("sites", sites))
 
     # 其他消息处理
     application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_unknown))
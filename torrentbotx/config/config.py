@@ -4,8 +4,9 @@ from __future__ import annotations
 
 import os
 import shutil
+import threading
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Optional, Tuple
 
 import yaml
 from pydantic_settings import BaseSettings
@@ -18,11 +19,40 @@ DEFAULT_CONFIG_PATH = Path(__file__).with_name("config.yaml")
 EXAMPLE_CONFIG_PATH = Path(__file__).with_name("example.yaml")
 CONFIG_ENV_VAR = "TORRENTBOTX_CONFIG"
 
+# key -> (old value, new value)
+ConfigChanges = Dict[str, Tuple[Any, Any]]
+
 
 class PTItem(BaseSettings):
     name: str
     api_key: str
     api_url: str
+    # 搜索结果缓存的新鲜期（秒），为空时使用 SEARCH_CACHE_TTL
+    cache_ttl: Optional[float] = None
+    # 限流：每秒请求数、突发请求数、最大并发数
+    rate_limit: float = 2.0
+    rate_burst: int = 5
+    max_concurrency: int = 4
+    # 详情接口单独限流：每秒请求数、突发请求数，批量获取详情时使用
+    details_rate_limit: float = 10.0
+    details_burst: int = 50
+    # 熔断：连续失败多少次后熔断，熔断多久（秒）后发送探测请求
+    failure_threshold: int = 5
+    recovery_timeout: float = 30.0
+
+
+class PlacementPolicy(BaseSettings):
+    # all：添加到所有下载器；score：按负载评分，只添加到得分最高的 replicas 个下载器
+    strategy: str = "score"
+    replicas: int = 1
+    # 剩余空间低于该值（GB，含种子大小）的下载器不参与放置
+    min_free_space: float = 10.0
+    # 下载器负载的缓存时间（秒）
+    state_ttl: float = 10.0
+    # 评分权重：free_space、active、throughput、category，未设置的项使用默认值
+    weights: Dict[str, float] = {}
+    # 分类 -> 优先的下载器名称列表
+    categories: Dict[str, List[str]] = {}
 
 
 class Settings(BaseSettings):
@@ -32,6 +62,7 @@ class Settings(BaseSettings):
     QBIT_PASSWORD: str = "adminadmin"
     QBIT_VERIFY_CERT: bool = True
     QBIT_REQUESTS_ARGS: Dict[str, Any] = {"timeout": [10, 30]}
+    QBIT_SYNC_INTERVAL: float = 2.0
 
     TG_BOT_TOKEN_MT: str = ""
     TG_ALLOWED_CHAT_IDS: str = ""
@@ -40,11 +71,34 @@ class Settings(BaseSettings):
     TG_CHAT_ID: str = ""
     TG_MAX_DELETED_ITEMS_IN_REPORT: int = 20
 
+    TRANSMISSION_FULL_SYNC_INTERVAL: float = 300.0
+    ARIA2_NOTIFICATIONS: bool = True
+
     DOWNLOADERS: str = "qbittorrent"
+    DOWNLOADER_TIMEOUT: float = 30.0
+    DOWNLOADER_MAX_WORKERS: int = 8
+    DOWNLOADER_HEALTH_INTERVAL: float = 30.0
+    DOWNLOADER_RECONNECT_DELAY: float = 1.0
+    DOWNLOADER_MAX_RECONNECT_DELAY: float = 300.0
+    CONFIG_WATCH_INTERVAL: float = 2.0
+    PLACEMENT: PlacementPolicy = PlacementPolicy()
     PT_SITES: List[PTItem] = []
+    SEARCH_CACHE_SIZE: int = 256
+    SEARCH_CACHE_TTL: float = 60.0
+    SEARCH_CACHE_STALE_TTL: float = 300.0
+    LOCAL_INDEX_ENABLED: bool = True
+    TRACKER_POOL_CONNECTIONS: int = 10
+    TRACKER_POOL_MAXSIZE: int = 20
+    TRACKER_CONNECT_TIMEOUT: float = 5.0
+    TRACKER_READ_TIMEOUT: float = 20.0
+    TRACKER_MAX_RETRIES: int = 2
 
     LOG_LEVEL: str = "INFO"
     DB_PATH: str = "torrentbotx.db"
+    DB_READERS: int = 4
+    DB_BUSY_TIMEOUT: int = 5000
+    DB_CACHE_SIZE_KB: int = 16384
+    DB_MMAP_SIZE: int = 256 * 1024 * 1024
 
     MT_HOST: str = "https://api.m-team.cc"
     MT_APIKEY: str = ""
@@ -66,9 +120,24 @@ class Config:
         self.config_file = Path(
             config_file or os.getenv(CONFIG_ENV_VAR, DEFAULT_CONFIG_PATH)
         )
+        # 先记录 mtime 再读取，读取期间发生的修改会在下一次检查时重新加载
+        self.mtime = self._mtime()
         data = self._load_yaml(self.config_file)
         self.settings = Settings(**data)
+        if self.mtime is None:
+            # 配置文件刚从示例复制
+            self.mtime = self._mtime()
         self._validate_config()
+        self._subscribers: List[Tuple[Tuple[str, ...], Callable[[ConfigChanges], None]]] = []
+        self._reload_lock = threading.Lock()
+        self._watch_stopped = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    def _mtime(self) -> Optional[float]:
+        try:
+            return self.config_file.stat().st_mtime
+        except OSError:
+            return None
 
     @staticmethod
     def _load_yaml(path: Path) -> Dict[str, Any]:
@@ -113,20 +182,84 @@ class Config:
         return getattr(self.settings, key, default)
 
     def get_all(self) -> Dict[str, Any]:
-        return self.settings.dict()
+        return self.settings.model_dump()
 
     def set(self, key: str, value: Any) -> None:
+        old = getattr(self.settings, key, None)
         setattr(self.settings, key, value)
+        if old != value:
+            self._notify({key: (old, value)})
 
-    def reload(self) -> None:
-        data = self._load_yaml(self.config_file)
-        self.settings = Settings(**data)
+    def subscribe(self, prefixes: str | Tuple[str, ...], callback: Callable[[ConfigChanges], None]) -> None:
+        """Call ``callback`` with the changed keys whenever a key starting with one of ``prefixes`` changes.
+
+        A prefix matches whole keys too, e.g. ``"QBIT_"`` or ``"PT_SITES"``.
+        """
+        if isinstance(prefixes, str):
+            prefixes = (prefixes,)
+        self._subscribers.append((tuple(prefixes), callback))
+
+    def unsubscribe(self, callback: Callable[[ConfigChanges], None]) -> None:
+        """Stop calling ``callback`` on changes; unknown callbacks are ignored."""
+        self._subscribers = [(prefixes, cb) for prefixes, cb in self._subscribers if cb != callback]
+
+    def _notify(self, changes: ConfigChanges) -> None:
+        for prefixes, callback in list(self._subscribers):
+            matched = {key: change for key, change in changes.items() if key.startswith(prefixes)}
+            if not matched:
+                continue
+            try:
+                callback(matched)
+            except Exception as exc:
+                logger.error("配置变更回调执行失败：%s", exc)
+
+    def reload(self) -> ConfigChanges:
+        """Re-read the YAML file, swap in the new settings and notify subscribers of changed keys."""
+        with self._reload_lock:
+            self.mtime = self._mtime()
+            try:
+                settings = Settings(**self._load_yaml(self.config_file))
+            except Exception as exc:
+                # 配置写到一半或格式错误时保留当前配置，等待下一次修改
+                logger.error("重新加载配置失败，继续使用当前配置：%s", exc)
+                return {}
+            old, new = self.settings.model_dump(), settings.model_dump()
+            self.settings = settings
+        changes = {key: (old.get(key), value) for key, value in new.items() if old.get(key) != value}
+        if changes:
+            logger.info("配置已更新：%s", ", ".join(sorted(changes)))
+            self._notify(changes)
+        return changes
+
+    def check_for_changes(self) -> ConfigChanges:
+        """Reload only when the file's mtime changed since the last load."""
+        if self._mtime() == self.mtime:
+            return {}
+        return self.reload()
+
+    def _watch(self, interval: float) -> None:
+        while not self._watch_stopped.wait(interval):
+            self.check_for_changes()
+
+    def start_watching(self, interval: float = 2.0) -> None:
+        """Poll the config file's mtime in a daemon thread and hot-reload on change."""
+        if self._watcher is not None:
+            return
+        self._watch_stopped.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(interval,), name="config-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        self._watch_stopped.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=1)
+            self._watcher = None
 
     def save(self) -> None:
         try:
             with open(self.config_file, "w", encoding="utf-8") as fh:
                 yaml.dump(
-                    self.settings.dict(),
+                    self.settings.model_dump(),
                     fh,
                     default_flow_style=False,
                     allow_unicode=True,
@@ -136,7 +269,19 @@ class Config:
             logger.error("保存配置文件时出错：%s", exc)
 
 
-def load_config(config_file: str | Path | None = None) -> Config:
-    """Convenient helper to load configuration."""
+_configs: Dict[Path, Config] = {}
+_configs_lock = threading.Lock()
+
+
+def load_config(config_file: str | Path | None = None, refresh: bool = False) -> Config:
+    """Return the process-wide configuration for ``config_file``.
 
-    return Config(config_file)
+    The file is parsed once; later calls return the same object, which stays current
+    through :meth:`Config.reload` / :meth:`Config.start_watching`.
+    """
+    path = Path(config_file or os.getenv(CONFIG_ENV_VAR, DEFAULT_CONFIG_PATH)).resolve()
+    with _configs_lock:
+        config = _configs.get(path)
+        if config is None or refresh:
+            config = _configs[path] = Config(path)
+        return config
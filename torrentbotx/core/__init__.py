@@ -1,3 +1,13 @@
-from torrentbotx.core.manager import CoreManager, TorrentManager
+import importlib
+
+
+def __getattr__(name):
+    # 按需导入，导入 core.placement 等子模块时不会连带加载 CoreManager
+    if name in __all__:
+        value = getattr(importlib.import_module("torrentbotx.core.manager"), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ['CoreManager', 'TorrentManager']
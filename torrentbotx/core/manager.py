@@ -1,10 +1,17 @@
-from typing import Optional, List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, List, Optional
 
 from torrentbotx.config.config import load_config
+from torrentbotx.core.pipeline import TorrentFile, fetch_torrent
+from torrentbotx.core.placement import PlacementEngine
 from torrentbotx.downloaders.base import get_downloader_instance
-from torrentbotx.enums.downloader_type import DownloaderType
-from torrentbotx.notifications import Notifier
-from torrentbotx.notifications.telegram_notifier import TelegramNotifier
+from torrentbotx.models.download_result import (ADDED, FAILED, SKIPPED, TIMEOUT, DownloaderResult,
+                                                DownloadTaskResult)
+from torrentbotx.models.torrent_store import TorrentStore
+from torrentbotx.notifications import Notifier, get_notifier
+from torrentbotx.trackers import get_tracker_by_name
 from torrentbotx.utils import get_logger
 
 logger = get_logger("core.manager")
@@ -13,19 +20,43 @@ logger = get_logger("core.manager")
 class CoreManager:
     def __init__(self, config=None, notifier: Optional[Notifier] = None):
         self.config = config or load_config()
-        self.notifier = notifier or TelegramNotifier(
+        self.notifier = notifier or get_notifier(
+            "telegram",
             bot_token=self.config.get("TG_BOT_TOKEN"),
             chat_id=self.config.get("TG_ALLOWED_CHAT_IDS")
         )
         self.downloaders = self._init_downloaders()
+        self.downloader_timeout = self.config.get("DOWNLOADER_TIMEOUT", 30.0)
+        self._executor = self._build_executor()
+        self.placement = PlacementEngine(self.config.get("PLACEMENT"))
+        self.torrent_store = TorrentStore()
+        self.health_interval = self.config.get("DOWNLOADER_HEALTH_INTERVAL", 30.0)
+        self._stopped = threading.Event()
+        self._health_thread: Optional[threading.Thread] = None
+        if hasattr(self.config, "subscribe"):
+            self.config.subscribe(("PLACEMENT", "DOWNLOADER"), self._on_config_change)
+
+    def _on_config_change(self, changes: dict):
+        """配置热更新：只更新受影响的部分，下载器的连接配置由各下载器自行处理"""
+        if "PLACEMENT" in changes:
+            self.placement = PlacementEngine(self.config.get("PLACEMENT"))
+        self.downloader_timeout = self.config.get("DOWNLOADER_TIMEOUT", 30.0)
+        self.health_interval = self.config.get("DOWNLOADER_HEALTH_INTERVAL", 30.0)
+        if "DOWNLOADERS" in changes or "DOWNLOADER_MAX_WORKERS" in changes:
+            logger.warning("⚠️ DOWNLOADERS、DOWNLOADER_MAX_WORKERS 的修改需要重启后生效")
+
+    def _build_executor(self) -> ThreadPoolExecutor:
+        # 有界线程池：卡住的 RPC 最多占用这些线程，不会无限堆积
+        return ThreadPoolExecutor(max_workers=self.config.get("DOWNLOADER_MAX_WORKERS", 8),
+                                  thread_name_prefix="downloader")
 
     def _init_downloaders(self) -> List:
+        # 构造下载器只读取配置，连接由后台健康检查或首次使用时建立
         types = self.config.get("DOWNLOADERS", "qbittorrent")
         downloader_list = []
         for name in types.split(","):
             try:
-                dtype = DownloaderType.from_name(name.strip())
-                instance = get_downloader_instance(dtype)
+                instance = get_downloader_instance(name.strip())
                 downloader_list.append(instance)
             except Exception as e:
                 logger.error(f"❌ 加载下载器 {name} 失败: {e}")
@@ -41,26 +72,311 @@ class CoreManager:
         if not self.config.get("TG_BOT_TOKEN"):
             logger.warning("⚠️ 未配置 TG_BOT_TOKEN，无法发送 Telegram 通知")
 
+        self._subscribe_completion()
+        if hasattr(self.config, "start_watching"):
+            self.config.start_watching(self.config.get("CONFIG_WATCH_INTERVAL", 2.0))
+        # 下载器在后台并行连接，启动不等待任何 RPC
+        if self._health_thread is None:
+            self._stopped.clear()
+            self._health_thread = threading.Thread(target=self._health_loop, name="downloader-health", daemon=True)
+            self._health_thread.start()
         self.notifier.send_message("CoreManager 启动完成 ✅")
 
-    def execute_download_task(self, params: dict):
+    def stop(self):
+        """停止配置监听、健康检查线程和线程池，之后仍可再次 start 或直接执行任务"""
+        if hasattr(self.config, "stop_watching"):
+            self.config.stop_watching()
+        self._stopped.set()
+        if self._health_thread is not None:
+            self._health_thread.join(timeout=2)
+            self._health_thread = None
+        # 不等待卡住的 RPC；换上新的线程池（线程按需创建），管理器可以继续使用
+        self._executor.shutdown(wait=False)
+        self._executor = self._build_executor()
+
+    def close(self):
+        """停止管理器并释放下载器，取消所有配置变更订阅，之后不应再使用该实例"""
+        self.stop()
+        if hasattr(self.config, "unsubscribe"):
+            self.config.unsubscribe(self._on_config_change)
+        for downloader in self.downloaders:
+            downloader.close()
+
+    def _health_loop(self):
+        """
+        并行连接所有下载器，之后每 health_interval 秒 ping 一次；断开的下载器按各自的退避间隔重连。
+        已连接且设置了 refresh_interval 的下载器同时按该间隔刷新本地状态镜像
+        """
+        pending = {}
+        checked = {}
+        refreshing = {}
+        refreshed = {}
+        while not self._stopped.is_set():
+            now = time.monotonic()
+            for downloader in self.downloaders:
+                interval = downloader.refresh_interval
+                future = refreshing.get(downloader.name)
+                if (interval and downloader.connected and (future is None or future.done())
+                        and now - refreshed.get(downloader.name, 0.0) >= interval):
+                    refreshed[downloader.name] = now
+                    refreshing[downloader.name] = self._executor.submit(downloader.refresh_state)
+
+                future = pending.get(downloader.name)
+                if future is not None and not future.done():
+                    continue
+                if downloader.connected:
+                    due = now - checked.get(downloader.name, 0.0) >= self.health_interval
+                else:
+                    due = downloader.retry_in == 0
+                if due:
+                    checked[downloader.name] = now
+                    pending[downloader.name] = self._executor.submit(downloader.check_health)
+            self._stopped.wait(1.0)
+
+    def refresh_torrent_store(self) -> TorrentStore:
+        """
+        从各下载器的本地镜像刷新列式快照，清理、统计和报告都在快照上完成
+        :return: 刷新后的快照
+        """
+        for downloader in self.downloaders:
+            try:
+                self.torrent_store.replace(downloader.name, downloader.get_snapshot_records())
+            except Exception as e:
+                # 获取失败时保留该下载器上一次的数据
+                logger.error(f"❌ 刷新 {downloader.name} 种子快照失败: {e}")
+        return self.torrent_store
+
+    def sync_torrents_to_db(self, params: dict = None) -> int:
+        """
+        刷新快照并批量同步到数据库种子表，只写入新增或有变化的种子
+        :param params: 可选 chunk_size，每个事务写入的记录数
+        :return: 同步的种子数
+        """
+        # 数据库模块在首次同步时才导入
+        from torrentbotx.db.operations import upsert_torrents
+        store = self.refresh_torrent_store()
+        chunk_size = (params or {}).get("chunk_size", 1000)
+        count = upsert_torrents((row.to_dict() for row in store.rows()), chunk_size=chunk_size)
+        logger.info(f"💾 已同步 {count} 个种子到数据库")
+        return count
+
+    def get_torrent_stats(self, params: dict = None) -> dict:
+        """
+        种子统计：总数、总大小、速率以及按下载器和状态的数量
+        :param params: 未使用
+        :return: 统计字典
+        """
+        return self.refresh_torrent_store().stats()
+
+    def get_downloader_health(self, params: dict = None) -> List[dict]:
+        """
+        下载器连接健康状态
+        :param params: 未使用
+        :return: 每个下载器的 name、state、failures、retry_in、last_error
+        """
+        return [downloader.health for downloader in self.downloaders]
+
+    def _subscribe_completion(self):
+        """订阅支持事件推送的下载器（aria2），下载完成时立即通知"""
+        def notify(status):
+            name = ((status.get("bittorrent") or {}).get("info") or {}).get("name") or status.get("gid")
+            self.notifier.send_message(f"下载完成: {name}")
+
+        for downloader in self.downloaders:
+            monitor = getattr(downloader, "monitor", None)
+            if monitor is None or not hasattr(monitor, "subscribe"):
+                continue
+            # BT 任务在数据下载完成时触发 bt_complete，complete 要等做种结束，只对非 BT 任务通知
+            monitor.subscribe("bt_complete", notify)
+            monitor.subscribe("complete", lambda status: None if status.get("bittorrent") else notify(status))
+
+    @staticmethod
+    def _run_on(downloader, action: Callable) -> DownloaderResult:
+        """在单个下载器上执行操作并计时，action 返回 True/False 或 SKIPPED"""
+        started = time.monotonic()
+        try:
+            outcome = action(downloader)
+            status = SKIPPED if outcome == SKIPPED else (ADDED if outcome else FAILED)
+            return DownloaderResult(downloader.name, status, time.monotonic() - started)
+        except Exception as e:
+            logger.error(f"❌ 下载器 {downloader.name} 执行失败: {e}")
+            return DownloaderResult(downloader.name, FAILED, time.monotonic() - started, error=str(e))
+
+    def _fan_out(self, action: Callable, downloaders: Optional[List] = None) -> List[DownloaderResult]:
+        """
+        在多个下载器上并发执行操作，总耗时取决于最慢的下载器（不超过 downloader_timeout）
+        :param action: 接收下载器实例的函数
+        :param downloaders: 目标下载器，默认为所有下载器
+        :return: 与 downloaders 顺序一致的执行结果
+        """
+        downloaders = self.downloaders if downloaders is None else downloaders
+        futures = [self._executor.submit(self._run_on, downloader, action) for downloader in downloaders]
+        done, _ = wait(futures, timeout=self.downloader_timeout) if futures else (set(), set())
+        results = []
+        for downloader, future in zip(downloaders, futures):
+            if future in done:
+                results.append(future.result())
+            else:
+                # 已经开始的 RPC 无法中断，放弃等待它的结果
+                future.cancel()
+                logger.warning(f"⏱️ 下载器 {downloader.name} 超过 {self.downloader_timeout}s 未响应")
+                results.append(DownloaderResult(downloader.name, TIMEOUT, self.downloader_timeout,
+                                                error=f"超过 {self.downloader_timeout}s 未响应"))
+        return results
+
+    def execute_download_task(self, params: dict) -> DownloadTaskResult:
         torrent_id = params.get("torrent_id")
         if not torrent_id:
             logger.error("🚫 下载任务缺少 Torrent ID 参数")
-            return False
+            return DownloadTaskResult(str(torrent_id), error="缺少 Torrent ID 参数")
 
-        logger.info(f"🔄 正在下载种子：{torrent_id}")
-        success_list = []
-        for downloader in self.downloaders:
-            success = downloader.add_torrent(torrent_id)
-            success_list.append(success)
+        site = params.get("site", "mteam")
+        logger.info(f"🔄 正在下载种子：{site}/{torrent_id}")
+        # 种子文件只下载一次，同一份内容交给所有下载器
+        torrent = fetch_torrent(get_tracker_by_name(site), torrent_id)
+        if torrent is None:
+            self.notifier.send_message(f"获取种子文件失败: {torrent_id}")
+            return DownloadTaskResult(str(torrent_id), error="获取种子文件失败")
+
+        targets = self.placement.choose(self.downloaders, torrent.meta.total_size, params.get("category"))
+        if not targets:
+            self.notifier.send_message(f"没有满足放置策略的下载器: {torrent.name}")
+            return DownloadTaskResult(torrent.name, error="没有满足放置策略的下载器")
+
+        def add(downloader):
+            if downloader.has_torrent(torrent.info_hash):
+                logger.info(f"⏭️ {downloader.name} 中已存在 {torrent.name}，跳过")
+                return SKIPPED
+            added = downloader.add_torrent_file(torrent.data)
+            if added:
+                self.placement.record_added(downloader, torrent.meta.total_size)
+            return added
 
-        if any(success_list):
-            self.notifier.send_message(f"部分下载器已成功添加任务: {torrent_id}")
-            return True
+        result = DownloadTaskResult(torrent.name, self._fan_out(add, targets))
+        if result.success:
+            self.notifier.send_message(f"部分下载器已成功添加任务: {result.summary()}")
         else:
-            self.notifier.send_message(f"所有下载器添加任务失败: {torrent_id}")
-            return False
+            self.notifier.send_message(f"所有下载器添加任务失败: {result.summary()}")
+        return result
+
+    def execute_batch_download_task(self, params: dict) -> List[DownloadTaskResult]:
+        """
+        批量下载：并发获取所有种子文件，每个下载器只调用一次 add_torrents
+        :param params: torrent_ids 种子ID列表，site 站点（默认 mteam），category 可选的分类
+        :return: 与 torrent_ids 一一对应的执行结果
+        """
+        torrent_ids = [str(torrent_id) for torrent_id in params.get("torrent_ids") or []]
+        if not torrent_ids:
+            logger.error("🚫 批量下载任务缺少 Torrent ID 参数")
+            return []
+
+        site = params.get("site", "mteam")
+        tracker = get_tracker_by_name(site)
+        logger.info(f"🔄 正在批量下载 {len(torrent_ids)} 个种子：{site}")
+        fetched: List[Optional[TorrentFile]] = list(
+            self._executor.map(lambda torrent_id: fetch_torrent(tracker, torrent_id), torrent_ids))
+
+        # 同一批次中 infohash 相同的种子只提交一次
+        unique: List[TorrentFile] = list({t.info_hash: t for t in fetched if t is not None}.values())
+
+        # 逐个种子选择目标下载器，再按下载器分组，每个下载器只调用一次 add_torrents
+        category = params.get("category")
+        assignments = {}
+        placements = {}
+        for torrent in unique:
+            targets = self.placement.choose(self.downloaders, torrent.meta.total_size, category)
+            placements[torrent.info_hash] = [downloader.name for downloader in targets]
+            # 先按预计负载计入，使同一批次的种子分散到不同下载器，未添加成功的在提交后撤销
+            for downloader in targets:
+                self.placement.record_added(downloader, torrent.meta.total_size)
+                assignments.setdefault(downloader.name, (downloader, []))[1].append(torrent)
+
+        batch_results = {}
+
+        def add_all(downloader):
+            statuses = {}
+            pending = []
+            for torrent in assignments[downloader.name][1]:
+                if downloader.has_torrent(torrent.info_hash):
+                    logger.info(f"⏭️ {downloader.name} 中已存在 {torrent.name}，跳过")
+                    statuses[torrent.info_hash] = SKIPPED
+                else:
+                    pending.append(torrent)
+            if pending:
+                for torrent, added in zip(pending, downloader.add_torrents([t.data for t in pending])):
+                    statuses[torrent.info_hash] = ADDED if added else FAILED
+            batch_results[downloader.name] = statuses
+            if not pending:
+                return SKIPPED
+            return ADDED in statuses.values()
+
+        targets = [downloader for downloader, _ in assignments.values()]
+        downloader_results = {result.downloader: result for result in self._fan_out(add_all, targets)}
+
+        for name, (downloader, torrents) in assignments.items():
+            statuses = batch_results.get(name) or {}
+            for torrent in torrents:
+                if statuses.get(torrent.info_hash) != ADDED:
+                    self.placement.record_removed(downloader, torrent.meta.total_size)
+
+        results = []
+        for torrent_id, torrent in zip(torrent_ids, fetched):
+            if torrent is None:
+                results.append(DownloadTaskResult(torrent_id, error="获取种子文件失败"))
+                continue
+            if not placements[torrent.info_hash]:
+                results.append(DownloadTaskResult(torrent.name, error="没有满足放置策略的下载器"))
+                continue
+            per_downloader = []
+            for name in placements[torrent.info_hash]:
+                overall = downloader_results[name]
+                status = (batch_results.get(name) or {}).get(torrent.info_hash)
+                if overall.status != TIMEOUT and status is not None:
+                    per_downloader.append(DownloaderResult(name, status, overall.latency))
+                else:
+                    # 超时或批量调用抛出异常，整批视为相同结果
+                    per_downloader.append(overall)
+            results.append(DownloadTaskResult(torrent.name, per_downloader))
+
+        added = sum(1 for result in results if result.success)
+        self.notifier.send_message(f"批量添加任务完成: {added}/{len(results)} 个种子已添加")
+        return results
+
+    def get_current_tasks(self, params: dict) -> List[dict]:
+        """
+        汇总所有下载器的任务，qBittorrent 从本地状态镜像读取
+        :param params: status 可选的状态筛选（qBittorrent 状态名）
+        :return: 含 name、status、progress、downloader 的字典列表
+        """
+        tasks = []
+        for downloader in self.downloaders:
+            try:
+                tasks.extend(downloader.get_tasks())
+            except Exception as e:
+                logger.error(f"❌ 获取 {downloader.name} 任务失败: {e}")
+        status = params.get("status")
+        return [task for task in tasks if status is None or task.get("status") == status]
+
+    def execute_task(self, task_type: str, params: dict):
+        """
+        按任务类型分发，供机器人命令和定时任务调用
+        :param task_type: 任务类型，如 download、batch_download
+        :param params: 任务参数
+        :return: 对应任务的执行结果，未知任务类型返回 None
+        """
+        handlers = {
+            "download": self.execute_download_task,
+            "batch_download": self.execute_batch_download_task,
+            "get_current_tasks": self.get_current_tasks,
+            "downloader_health": self.get_downloader_health,
+            "torrent_stats": self.get_torrent_stats,
+            "sync_torrents": self.sync_torrents_to_db,
+        }
+        handler = handlers.get(task_type)
+        if handler is None:
+            logger.warning(f"⚠️ 未知的任务类型: {task_type}")
+            return None
+        return handler(params)
 
 
 class TorrentManager:
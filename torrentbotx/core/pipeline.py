@@ -0,0 +1,61 @@
+"""
+种子获取流水线
+
+下载任务只从站点下载一次 .torrent 文件，流式解析得到 infohash 和文件信息，
+再把同一份字节交给各个下载器，下载器据 infohash 跳过已经存在的任务。
+"""
+
+from typing import TYPE_CHECKING, Optional
+
+from torrentbotx.utils.bencode import BencodeError, TorrentMeta, parse_torrent
+from torrentbotx.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from torrentbotx.trackers.common import BaseTracker
+
+logger = get_logger("core.pipeline")
+
+
+class TorrentFile:
+    def __init__(self, data: bytes, meta: TorrentMeta, site: Optional[str] = None,
+                 torrent_id: Optional[str] = None):
+        """
+        已下载并解析的种子文件
+        :param data: 种子文件内容
+        :param meta: 解析得到的元信息
+        :param site: 来源站点
+        :param torrent_id: 站点种子ID
+        """
+        self.data = data
+        self.meta = meta
+        self.site = site
+        self.torrent_id = torrent_id
+
+    @property
+    def info_hash(self) -> str:
+        """下载器使用的种子标识"""
+        return self.meta.info_hash
+
+    @property
+    def name(self) -> str:
+        """种子名称，缺失时使用站点种子ID"""
+        return self.meta.name or str(self.torrent_id)
+
+
+def fetch_torrent(tracker: "BaseTracker", torrent_id: str) -> Optional[TorrentFile]:
+    """
+    下载并解析站点种子文件
+    :param tracker: Tracker 实例
+    :param torrent_id: 站点种子ID
+    :return: TorrentFile 实例，下载或解析失败时返回 None
+    """
+    data = tracker.download_torrent(torrent_id)
+    if data is None:
+        return None
+    try:
+        meta = parse_torrent(data)
+    except BencodeError as e:
+        logger.error(f"解析 {tracker.display_name} 种子文件 {torrent_id} 失败: {e}")
+        return None
+    logger.info(f"已获取种子 {meta.name}（{meta.info_hash}，{meta.file_count} 个文件）")
+    return TorrentFile(data, meta, site=tracker.site, torrent_id=str(torrent_id))
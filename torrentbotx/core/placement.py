@@ -0,0 +1,189 @@
+"""
+下载器放置策略
+
+每个种子只添加到评分最高的 replicas 个下载器，而不是复制到所有下载器。评分综合剩余磁盘空间、
+正在下载的任务数、当前下载速率和分类亲和度；负载信息来自各下载器的本地状态镜像，
+并在 state_ttl 内缓存，做放置决策时不再为每个种子单独发起 RPC。
+"""
+
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from torrentbotx.utils.logger import get_logger
+
+logger = get_logger("core.placement")
+
+GB = 1024 ** 3
+
+STRATEGY_ALL = "all"
+STRATEGY_SCORE = "score"
+
+# 各评分项的默认权重，PLACEMENT.weights 中的同名项会覆盖
+DEFAULT_WEIGHTS = {"free_space": 1.0, "active": 1.0, "throughput": 1.0, "category": 2.0}
+
+
+class DownloaderLoad:
+    def __init__(self, free_space: Optional[int] = None, active: int = 0, download_speed: int = 0,
+                 categories: Iterable[str] = ()):
+        """
+        下载器负载快照
+        :param free_space: 下载目录剩余空间（字节），未知时为 None
+        :param active: 正在下载的任务数
+        :param download_speed: 当前总下载速率（字节/秒）
+        :param categories: 下载器中已有的分类
+        """
+        self.free_space = free_space
+        self.active = active
+        self.download_speed = download_speed
+        self.categories = set(categories)
+
+    def to_dict(self) -> dict:
+        return {
+            "free_space": self.free_space,
+            "active": self.active,
+            "download_speed": self.download_speed,
+            "categories": sorted(self.categories),
+        }
+
+
+def _policy_value(policy: Any, key: str, default: Any) -> Any:
+    # 兼容 PlacementPolicy 对象和 YAML 中读出的字典
+    if policy is None:
+        return default
+    if isinstance(policy, dict):
+        return policy.get(key, default)
+    return getattr(policy, key, default)
+
+
+class PlacementEngine:
+    def __init__(self, policy: Any = None):
+        """
+        下载器放置引擎
+        :param policy: 放置策略（config.PlacementPolicy 或同结构的字典），为空时使用默认策略
+        """
+        self.strategy = _policy_value(policy, "strategy", STRATEGY_SCORE)
+        self.replicas = max(int(_policy_value(policy, "replicas", 1)), 1)
+        self.min_free_space = float(_policy_value(policy, "min_free_space", 10.0)) * GB
+        self.state_ttl = float(_policy_value(policy, "state_ttl", 10.0))
+        self.weights = {**DEFAULT_WEIGHTS, **(_policy_value(policy, "weights", None) or {})}
+        self.categories: Dict[str, List[str]] = dict(_policy_value(policy, "categories", None) or {})
+        self._loads: Dict[str, Tuple[float, Optional[DownloaderLoad]]] = {}
+        self._lock = threading.Lock()
+
+    def load_of(self, downloader) -> Optional[DownloaderLoad]:
+        """
+        获取下载器负载，state_ttl 内直接使用缓存
+        :param downloader: 下载器实例
+        :return: 负载快照，未知时返回 None
+        """
+        now = time.monotonic()
+        with self._lock:
+            cached = self._loads.get(downloader.name)
+        if cached and now - cached[0] < self.state_ttl:
+            return cached[1]
+        try:
+            load = downloader.get_load()
+        except Exception as e:
+            logger.error(f"获取下载器 {downloader.name} 负载失败: {e}")
+            load = None
+        if not isinstance(load, DownloaderLoad):
+            load = None
+        with self._lock:
+            self._loads[downloader.name] = (now, load)
+        return load
+
+    def record_added(self, downloader, size: int = 0) -> None:
+        """
+        记录一次添加，更新缓存中的负载，使同一缓存周期内的后续种子分散到其他下载器
+        :param downloader: 下载器实例
+        :param size: 种子大小（字节）
+        """
+        with self._lock:
+            cached = self._loads.get(downloader.name)
+            if not cached or cached[1] is None:
+                return
+            load = cached[1]
+            load.active += 1
+            if load.free_space is not None:
+                load.free_space -= size
+
+    def record_removed(self, downloader, size: int = 0) -> None:
+        """
+        撤销一次 record_added，用于预先计入负载但最终没有添加成功的种子
+        :param downloader: 下载器实例
+        :param size: 种子大小（字节）
+        """
+        with self._lock:
+            cached = self._loads.get(downloader.name)
+            if not cached or cached[1] is None:
+                return
+            load = cached[1]
+            load.active = max(load.active - 1, 0)
+            if load.free_space is not None:
+                load.free_space += size
+
+    def _affinity(self, downloader, load: Optional[DownloaderLoad], category: Optional[str]) -> float:
+        if not category:
+            return 0.0
+        if downloader.name in self.categories.get(category, ()):
+            return 1.0
+        if load is not None and category in load.categories:
+            return 0.5
+        return 0.0
+
+    def score(self, downloaders: List, size: int = 0, category: Optional[str] = None) -> List[Tuple[Any, float]]:
+        """
+        为下载器评分，剩余空间不足的下载器被排除
+        :param downloaders: 候选下载器
+        :param size: 种子大小（字节）
+        :param category: 种子分类
+        :return: (下载器, 分数) 列表，按分数从高到低排列
+        """
+        loads = [(downloader, self.load_of(downloader)) for downloader in downloaders]
+        eligible = []
+        for downloader, load in loads:
+            if load is not None and load.free_space is not None and load.free_space - size < self.min_free_space:
+                logger.info(f"下载器 {downloader.name} 剩余空间不足，跳过")
+                continue
+            eligible.append((downloader, load))
+
+        known = [load for _, load in eligible if load is not None]
+        max_free = max((load.free_space for load in known if load.free_space is not None), default=0)
+        max_active = max((load.active for load in known), default=0)
+        max_speed = max((load.download_speed for load in known), default=0)
+
+        scored = []
+        for downloader, load in eligible:
+            if load is None:
+                # 负载未知时各项取中间值
+                free, active, throughput = 0.5, 0.5, 0.5
+            else:
+                free = load.free_space / max_free if load.free_space is not None and max_free else 0.5
+                active = 1 - load.active / max_active if max_active else 1.0
+                throughput = 1 - load.download_speed / max_speed if max_speed else 1.0
+            total = (self.weights["free_space"] * free + self.weights["active"] * active
+                     + self.weights["throughput"] * throughput
+                     + self.weights["category"] * self._affinity(downloader, load, category))
+            scored.append((downloader, total))
+        # sorted 是稳定排序，同分时保持配置中的下载器顺序
+        return sorted(scored, key=lambda item: item[1], reverse=True)
+
+    def choose(self, downloaders: List, size: int = 0, category: Optional[str] = None) -> List:
+        """
+        选择目标下载器
+        :param downloaders: 候选下载器，不可用的下载器会被排除
+        :param size: 种子大小（字节）
+        :param category: 种子分类
+        :return: 目标下载器列表，没有可用下载器时为空
+        """
+        # 处于重连退避期间的下载器不参与放置
+        downloaders = [downloader for downloader in downloaders if downloader.available]
+        if self.strategy == STRATEGY_ALL:
+            return downloaders
+        if len(downloaders) <= self.replicas and self.min_free_space <= 0:
+            return downloaders
+        chosen = [downloader for downloader, _ in self.score(downloaders, size, category)[:self.replicas]]
+        if not chosen:
+            logger.warning("没有满足放置策略的下载器")
+        return chosen
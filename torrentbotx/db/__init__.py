@@ -1,5 +1,9 @@
-from torrentbotx.db.connection import create_connection
-from torrentbotx.db.models import create_tables
-from torrentbotx.db.operations import (insert_torrent, get_torrent_by_hash, update_task_status)
+from torrentbotx.db.connection import create_connection, get_database, Database
+from torrentbotx.db.models import SCHEMA_VERSION, create_tables, migrate
+from torrentbotx.db.operations import (insert_torrent, upsert_torrents, get_torrent_by_hash, update_task_status,
+                                       get_feed_state, save_feed_state, upsert_tracker_torrents,
+                                       search_tracker_torrents)
 
-__all__ = ['create_connection', 'create_tables', 'insert_torrent', 'get_torrent_by_hash', 'update_task_status']
+__all__ = ['create_connection', 'get_database', 'Database', 'create_tables', 'migrate', 'SCHEMA_VERSION',
+           'insert_torrent', 'upsert_torrents', 'get_torrent_by_hash', 'update_task_status', 'get_feed_state',
+           'save_feed_state', 'upsert_tracker_torrents', 'search_tracker_torrents']
@@ -1,19 +1,187 @@
+"""
+SQLite 连接管理
+
+每个数据库文件只保持一个长期存活的写连接（由锁串行化）和一个只读连接池，
+使用 WAL 模式让读写互不阻塞，APScheduler 的工作线程和机器人所在线程可以同时访问。
+写操作通过 transaction() 上下文管理器执行，异常时自动回滚；读操作通过 read() 借用连接。
+"""
+
+import atexit
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
 
 from torrentbotx.config.config import load_config
 
-config = load_config()
+# 为空时在首次连接时从配置读取，导入本模块不再加载配置
+DB_PATH = None
 
-DB_PATH = config.get('DB_PATH', 'data/torrentbotx.db')
 
+def get_db_path() -> str:
+    """数据库文件路径"""
+    return DB_PATH or load_config().get('DB_PATH', 'data/torrentbotx.db')
 
-def create_connection():
-    """创建和返回数据库连接"""
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        # 使得可以通过列名访问数据
+
+def _pragmas(config) -> Dict[str, object]:
+    return {
+        # 写操作只追加 WAL，读连接不会被写事务阻塞
+        "journal_mode": "WAL",
+        # WAL 模式下 NORMAL 不会损坏数据库，只在断电时可能丢失最后的事务
+        "synchronous": "NORMAL",
+        "busy_timeout": config.get("DB_BUSY_TIMEOUT", 5000),
+        # 负数表示 KiB
+        "cache_size": -int(config.get("DB_CACHE_SIZE_KB", 16384)),
+        "mmap_size": config.get("DB_MMAP_SIZE", 256 * 1024 * 1024),
+        "temp_store": "MEMORY",
+    }
+
+
+class Database:
+    def __init__(self, path: str, readers: int = 4, pragmas: Optional[Dict[str, object]] = None):
+        """
+        单个数据库文件的连接管理器
+        :param path: 数据库文件路径
+        :param readers: 只读连接池的最大连接数
+        :param pragmas: 每个连接打开时设置的 PRAGMA
+        """
+        self.path = path
+        self.max_readers = max(readers, 1)
+        self.pragmas = pragmas if pragmas is not None else _pragmas(load_config())
+        self._writer: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.RLock()
+        self._depth = 0
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._reader_count = 0
+        self._all_readers = []
+        self._reader_lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self, readonly: bool = False) -> sqlite3.Connection:
+        # isolation_level=None：不隐式开启事务，事务边界由 transaction() 显式控制
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
         conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        if readonly:
+            conn.execute("PRAGMA query_only = ON")
         return conn
+
+    @property
+    def writer(self) -> sqlite3.Connection:
+        """写连接，首次使用时打开"""
+        with self._write_lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError(f"数据库 {self.path} 已关闭")
+            if self._writer is None:
+                self._writer = self._connect()
+            return self._writer
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        写事务：BEGIN IMMEDIATE 立即获取写锁，正常退出时提交，异常时回滚；
+        同一线程内嵌套调用时并入外层事务
+        """
+        with self._write_lock:
+            conn = self.writer
+            if self._depth:
+                self._depth += 1
+                try:
+                    yield conn
+                finally:
+                    self._depth -= 1
+                return
+            conn.execute("BEGIN IMMEDIATE")
+            self._depth = 1
+            try:
+                yield conn
+            except BaseException:
+                # 部分错误（如磁盘已满）会让 SQLite 自动回滚，此时再执行 ROLLBACK 会掩盖原始异常
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+            else:
+                conn.execute("COMMIT")
+            finally:
+                self._depth = 0
+
+    @contextmanager
+    def read(self) -> Iterator[sqlite3.Connection]:
+        """
+        借用一个只读连接，连接数达到上限时等待其他线程归还
+        """
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self._reader_lock:
+                if self._closed:
+                    raise sqlite3.ProgrammingError(f"数据库 {self.path} 已关闭")
+                if self._reader_count < self.max_readers:
+                    self._reader_count += 1
+                    try:
+                        conn = self._connect(readonly=True)
+                    except sqlite3.Error:
+                        self._reader_count -= 1
+                        raise
+                    self._all_readers.append(conn)
+            if conn is None:
+                conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            self._readers.put(conn)
+
+    def close(self) -> None:
+        """关闭所有连接"""
+        with self._write_lock, self._reader_lock:
+            self._closed = True
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            for conn in self._all_readers:
+                conn.close()
+            self._all_readers.clear()
+            self._reader_count = 0
+
+
+_databases: Dict[str, Database] = {}
+_databases_lock = threading.Lock()
+
+
+def get_database(path: Optional[str] = None) -> Database:
+    """
+    获取数据库文件对应的连接管理器，同一路径始终返回同一个实例
+    :param path: 数据库文件路径，默认为 get_db_path()
+    :return: Database 实例
+    """
+    path = path or get_db_path()
+    with _databases_lock:
+        database = _databases.get(path)
+        if database is None:
+            config = load_config()
+            database = _databases[path] = Database(path, readers=config.get("DB_READERS", 4),
+                                                   pragmas=_pragmas(config))
+        return database
+
+
+@atexit.register
+def close_all() -> None:
+    """关闭所有数据库连接"""
+    with _databases_lock:
+        for database in _databases.values():
+            database.close()
+        _databases.clear()
+
+
+def create_connection():
+    """创建和返回一个独立的数据库连接（已设置 PRAGMA），调用方负责关闭"""
+    try:
+        return get_database()._connect()
     except sqlite3.Error as e:
         print(f"SQLite 错误: {e}")
         return None
@@ -1,55 +1,168 @@
 import sqlite3
 
-from torrentbotx.db.connection import create_connection
+from torrentbotx.db.connection import get_database
 
 
-def create_tables():
-    """创建数据库表"""
-    conn = create_connection()
-    if conn is None:
-        print("无法连接到数据库")
-        return
+def _create_fts_table(cursor):
+    """创建种子全文索引，优先使用支持中文子串匹配的 trigram 分词器"""
+    for tokenizer in ("trigram", "unicode61"):
+        try:
+            cursor.execute(f'''
+                CREATE VIRTUAL TABLE IF NOT EXISTS tracker_torrents_fts USING fts5(
+                    title, subtitle, content='tracker_torrents', content_rowid='rowid', tokenize='{tokenizer}'
+                )
+            ''')
+            return
+        except sqlite3.OperationalError:
+            # 旧版本 SQLite 不支持 trigram 分词器
+            continue
 
-    try:
-        cursor = conn.cursor()
-
-        # 创建种子表
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS torrents (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                hash TEXT NOT NULL UNIQUE,
-                category TEXT,
-                state TEXT,
-                added_on INTEGER,
-                progress REAL,
-                ratio REAL
-            )
-        ''')
-
-        # 创建任务表
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                torrent_id INTEGER,
-                status TEXT,
-                scheduled_time INTEGER,
-                FOREIGN KEY (torrent_id) REFERENCES torrents(id)
-            )
-        ''')
-
-        # 创建用户表
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT,
-                chat_id INTEGER
-            )
-        ''')
-
-        # 提交更改并关闭连接
-        conn.commit()
-        conn.close()
 
+def _create_initial_schema(cursor):
+    """初始表结构，使用 IF NOT EXISTS 以兼容引入版本号之前创建的数据库"""
+    # 创建种子表
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS torrents (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            hash TEXT NOT NULL UNIQUE,
+            category TEXT,
+            state TEXT,
+            added_on INTEGER,
+            progress REAL,
+            ratio REAL
+        )
+    ''')
+
+    # 创建任务表
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            torrent_id INTEGER,
+            status TEXT,
+            scheduled_time INTEGER,
+            FOREIGN KEY (torrent_id) REFERENCES torrents(id)
+        )
+    ''')
+
+    # 创建用户表
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT,
+            chat_id INTEGER
+        )
+    ''')
+
+    # 创建站点最新种子轮询状态表（高水位标记与条件请求校验值）
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS tracker_feed_state (
+            site TEXT NOT NULL,
+            feed_key TEXT NOT NULL,
+            last_id INTEGER,
+            last_time TEXT,
+            etag TEXT,
+            last_modified TEXT,
+            updated_at INTEGER,
+            PRIMARY KEY (site, feed_key)
+        )
+    ''')
+
+    # 创建站点种子元数据表及其 FTS5 全文索引（外部内容表，由触发器同步）
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS tracker_torrents (
+            site TEXT NOT NULL,
+            torrent_id TEXT NOT NULL,
+            title TEXT,
+            subtitle TEXT,
+            size INTEGER,
+            category TEXT,
+            seeders INTEGER,
+            updated_at INTEGER,
+            PRIMARY KEY (site, torrent_id)
+        )
+    ''')
+    _create_fts_table(cursor)
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS tracker_torrents_ai AFTER INSERT ON tracker_torrents BEGIN
+            INSERT INTO tracker_torrents_fts (rowid, title, subtitle) VALUES (new.rowid, new.title, new.subtitle);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS tracker_torrents_ad AFTER DELETE ON tracker_torrents BEGIN
+            INSERT INTO tracker_torrents_fts (tracker_torrents_fts, rowid, title, subtitle)
+            VALUES ('delete', old.rowid, old.title, old.subtitle);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS tracker_torrents_au AFTER UPDATE OF title, subtitle ON tracker_torrents BEGIN
+            INSERT INTO tracker_torrents_fts (tracker_torrents_fts, rowid, title, subtitle)
+            VALUES ('delete', old.rowid, old.title, old.subtitle);
+            INSERT INTO tracker_torrents_fts (rowid, title, subtitle) VALUES (new.rowid, new.title, new.subtitle);
+        END
+    ''')
+
+
+def _create_query_indexes(cursor):
+    """为机器人和定时任务的常用查询建立索引，索引包含查询用到的其他列以避免回表"""
+    # 按状态查询任务并按计划时间排序
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status, scheduled_time)')
+    # 按种子查询任务及其状态
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_tasks_torrent_id ON tasks (torrent_id, status)')
+    # 状态统计以及按状态和添加时间清理
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_torrents_state ON torrents (state, added_on)')
+    # 按分类统计和筛选
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_torrents_category ON torrents (category, state)')
+    # 按添加时间排序和范围查询
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_torrents_added_on ON torrents (added_on)')
+
+
+# 按顺序执行的迁移，第 n 个迁移完成后 PRAGMA user_version 为 n；只能在末尾追加，不能修改已发布的迁移
+MIGRATIONS = [
+    _create_initial_schema,
+    _create_query_indexes,
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_schema_version(database=None) -> int:
+    """
+    读取数据库当前的结构版本
+    :param database: Database 实例，默认为 get_database()
+    :return: PRAGMA user_version
+    """
+    with (database or get_database()).read() as conn:
+        return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(database=None) -> int:
+    """
+    将数据库结构升级到 SCHEMA_VERSION，每个迁移及其版本号在同一个事务中提交，失败时回滚该迁移
+    :param database: Database 实例，默认为 get_database()
+    :return: 迁移后的版本号
+    """
+    database = database or get_database()
+    # 已是最新版本时只读取一次版本号，不获取写锁
+    version = get_schema_version(database)
+    if version >= SCHEMA_VERSION:
+        if version > SCHEMA_VERSION:
+            print(f"数据库结构版本 {version} 高于程序支持的版本 {SCHEMA_VERSION}")
+        return version
+    while version < SCHEMA_VERSION:
+        with database.transaction() as conn:
+            # 获取写锁后重新读取，其他进程可能已经完成了迁移
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            if version >= SCHEMA_VERSION:
+                break
+            MIGRATIONS[version](conn.cursor())
+            version += 1
+            conn.execute(f'PRAGMA user_version = {version}')
+    return version
+
+
+def create_tables():
+    """创建数据库表并执行未完成的迁移"""
+    try:
+        migrate()
     except sqlite3.Error as e:
         print(f"SQLite 错误: {e}")
@@ -1,55 +1,183 @@
 import sqlite3
+import time
+from itertools import islice
 
-from torrentbotx.db.connection import create_connection
+from torrentbotx.db.connection import get_database
 
 
 def insert_torrent(name, t_hash, category, state, added_on, progress, ratio):
     """插入一个新的种子记录"""
-    conn = create_connection()
-    if conn is None:
-        return
-    try:
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO torrents (name, hash, category, state, added_on, progress, ratio)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (name, t_hash, category, state, added_on, progress, ratio),
-        )
-        conn.commit()
-        conn.close()
+    try:
+        with get_database().transaction() as conn:
+            conn.execute(
+                """
+                INSERT INTO torrents (name, hash, category, state, added_on, progress, ratio)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (name, t_hash, category, state, added_on, progress, ratio),
+            )
     except sqlite3.Error as e:
         print(f"插入种子数据时出错: {e}")
 
 
 def get_torrent_by_hash(t_hash):
     """根据hash获取种子信息"""
-    conn = create_connection()
-    if conn is None:
-        return None
     try:
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM torrents WHERE hash = ?', (t_hash,))
-        row = cursor.fetchone()
-        conn.close()
-        return row
+        with get_database().read() as conn:
+            return conn.execute('SELECT * FROM torrents WHERE hash = ?', (t_hash,)).fetchone()
     except sqlite3.Error as e:
         print(f"查询种子数据时出错: {e}")
         return None
 
 
+# 已存在的种子只在可变列有变化时才更新，未变化的行不产生写入
+_UPSERT_TORRENT_SQL = """
+    INSERT INTO torrents (name, hash, category, state, added_on, progress, ratio)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(hash) DO UPDATE SET
+        name = excluded.name,
+        category = excluded.category,
+        state = excluded.state,
+        progress = excluded.progress,
+        ratio = excluded.ratio
+    WHERE name IS NOT excluded.name
+        OR category IS NOT excluded.category
+        OR state IS NOT excluded.state
+        OR progress IS NOT excluded.progress
+        OR ratio IS NOT excluded.ratio
+"""
+
+
+def upsert_torrents(records, chunk_size=1000):
+    """
+    批量同步下载器快照到种子表，按 hash 插入新种子或更新已变化的种子
+    :param records: 快照记录的可迭代对象（如 get_snapshot_records 的结果或生成器），
+                    包含 hash、name、category、state、added_on、progress、ratio，缺少 hash 的记录会被跳过
+    :param chunk_size: 每个事务写入的记录数，分块提交以免长时间占用写锁
+    :return: 成功写入（含未变化）的记录数
+    """
+    rows = (
+        (record.get("name") or "", record["hash"], record.get("category"), record.get("state"),
+         record.get("added_on"), record.get("progress"), record.get("ratio"))
+        for record in records if record.get("hash")
+    )
+    written = 0
+    try:
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            with get_database().transaction() as conn:
+                conn.executemany(_UPSERT_TORRENT_SQL, chunk)
+            written += len(chunk)
+    except sqlite3.Error as e:
+        print(f"同步种子数据时出错: {e}")
+    return written
+
+
 def update_task_status(task_id, status):
     """更新任务的状态"""
-    conn = create_connection()
-    if conn is None:
-        return
     try:
-        cursor = conn.cursor()
-        cursor.execute(
-            'UPDATE tasks SET status = ? WHERE id = ?', (status, task_id)
-        )
-        conn.commit()
-        conn.close()
+        with get_database().transaction() as conn:
+            conn.execute('UPDATE tasks SET status = ? WHERE id = ?', (status, task_id))
     except sqlite3.Error as e:
         print(f"更新任务状态时出错: {e}")
+
+
+def get_feed_state(site, feed_key):
+    """获取站点最新种子轮询的高水位标记"""
+    try:
+        with get_database().read() as conn:
+            return conn.execute(
+                'SELECT * FROM tracker_feed_state WHERE site = ? AND feed_key = ?', (site, feed_key)
+            ).fetchone()
+    except sqlite3.Error as e:
+        print(f"查询轮询状态时出错: {e}")
+        return None
+
+
+def save_feed_state(site, feed_key, last_id, last_time, etag, last_modified):
+    """保存站点最新种子轮询的高水位标记"""
+    try:
+        with get_database().transaction() as conn:
+            conn.execute(
+                """
+                INSERT INTO tracker_feed_state (site, feed_key, last_id, last_time, etag, last_modified, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(site, feed_key) DO UPDATE SET
+                    last_id = excluded.last_id,
+                    last_time = excluded.last_time,
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    updated_at = excluded.updated_at
+                """,
+                (site, feed_key, last_id, last_time, etag, last_modified, int(time.time())),
+            )
+    except sqlite3.Error as e:
+        print(f"保存轮询状态时出错: {e}")
+
+
+def upsert_tracker_torrents(rows):
+    """
+    批量写入站点种子元数据，已存在的种子更新为最新值
+    :param rows: (site, torrent_id, title, subtitle, size, category, seeders) 元组列表
+    """
+    now = int(time.time())
+    try:
+        with get_database().transaction() as conn:
+            conn.executemany(
+                """
+                INSERT INTO tracker_torrents (site, torrent_id, title, subtitle, size, category, seeders, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(site, torrent_id) DO UPDATE SET
+                    title = excluded.title,
+                    subtitle = excluded.subtitle,
+                    size = excluded.size,
+                    category = excluded.category,
+                    seeders = excluded.seeders,
+                    updated_at = excluded.updated_at
+                """,
+                [(*row, now) for row in rows],
+            )
+    except sqlite3.Error as e:
+        print(f"写入站点种子索引时出错: {e}")
+
+
+def search_tracker_torrents(keyword, sites=None, limit=20):
+    """
+    在本地全文索引中搜索种子，按相关度和做种数排序
+    :param keyword: 搜索关键词
+    :param sites: 限定的站点列表，为空时搜索全部站点
+    :param limit: 最多返回的条数
+    :return: 查询结果行列表
+    """
+    terms = keyword.split()
+    if not terms:
+        return []
+    site_filter = ""
+    params = []
+    if sites:
+        site_filter = f" AND t.site IN ({', '.join('?' for _ in sites)})"
+        params.extend(sites)
+    if min(len(term) for term in terms) >= 3:
+        # 每个词作为短语匹配，双引号需要转义
+        match = " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+        sql = f"""
+            SELECT t.* FROM tracker_torrents_fts f
+            JOIN tracker_torrents t ON t.rowid = f.rowid
+            WHERE tracker_torrents_fts MATCH ?{site_filter}
+            ORDER BY bm25(tracker_torrents_fts), t.seeders DESC
+            LIMIT ?
+        """
+        params = [match, *params, limit]
+    else:
+        # trigram 分词器无法匹配少于 3 个字符的词，退化为 LIKE 查询
+        like = " AND ".join("(t.title LIKE ? OR t.subtitle LIKE ?)" for _ in terms)
+        sql = f"SELECT t.* FROM tracker_torrents t WHERE {like}{site_filter} ORDER BY t.seeders DESC LIMIT ?"
+        params = [*(f"%{term}%" for term in terms for _ in range(2)), *params, limit]
+    try:
+        with get_database().read() as conn:
+            return conn.execute(sql, params).fetchall()
+    except sqlite3.Error as e:
+        print(f"查询站点种子索引时出错: {e}")
+        return []
@@ -1,4 +1,4 @@
-from torrentbotx.downloaders import aria2, qbittorrent, transmission
+# 具体的下载器模块由 get_downloader_instance 按需导入
 from torrentbotx.downloaders.base import get_downloader_instance
 
-__all__ = ["get_downloader_instance"]
\ No newline at end of file
+__all__ = ["get_downloader_instance"]
@@ -1,8 +1,14 @@
+import base64
+from typing import List, Union
+
 import aria2p
+import requests
 
-from torrentbotx.config.config import load_config
-from torrentbotx.downloaders.base import BaseDownloader, register_downloader
+from torrentbotx.core.placement import DownloaderLoad
+from torrentbotx.downloaders.aria2_monitor import Aria2Monitor
+from torrentbotx.downloaders.base import BaseDownloader, register_downloader, with_connection
 from torrentbotx.enums.downloader_type import DownloaderType
+from torrentbotx.models.torrent_store import from_aria2
 from torrentbotx.utils.logger import get_logger
 
 logger = get_logger("downloaders.aria2")
@@ -10,21 +16,45 @@ logger = get_logger("downloaders.aria2")
 
 @register_downloader(DownloaderType.ARIA2)
 class Aria2Downloader(BaseDownloader):
-    def __init__(self):
-        self.config = load_config()
-        self.client = None
-        self.connect()
+    connection_errors = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+    config_prefixes = ("ARIA2_",)
+
+    def __init__(self, config=None):
+        super().__init__(config)
+        # aria2p.Client 构造时不会发起请求；监听器先创建，便于启动时订阅事件
+        self.rpc = self._build_rpc()
+        self.monitor = Aria2Monitor(self.rpc)
+
+    def _build_rpc(self) -> aria2p.Client:
+        return aria2p.Client(host=self.config.get("ARIA2_HOST", "http://localhost"),
+                             port=self.config.get("ARIA2_PORT", 6800))
+
+    def on_config_change(self, changes: dict) -> None:
+        # 监听器保留已有的订阅，只换成指向新地址的客户端
+        self.monitor.stop()
+        self.rpc = self.monitor.client = self._build_rpc()
+        super().on_config_change(changes)
+
+    def close(self) -> None:
+        self.monitor.stop()
+        super().close()
 
     def connect(self):
         try:
-            self.client = aria2p.API(aria2p.Client(
-                host=self.config.get("ARIA2_HOST", "http://localhost"),
-                port=self.config.get("ARIA2_PORT", 6800)))
+            self.rpc.get_version()
+            # 监听线程自带重连，重复调用 start 不会创建新线程
+            if self.config.get("ARIA2_NOTIFICATIONS", True):
+                self.monitor.start()
+            self.client = aria2p.API(self.rpc)
             logger.info("成功连接到 Aria2")
         except Exception as e:
             logger.error(f"连接 Aria2 错误: {e}")
             raise
 
+    def ping(self) -> None:
+        self.client.client.get_version()
+
+    @with_connection
     def add_torrent(self, torrent_url: str) -> bool:
         try:
             self.client.add_torrent(torrent_url)
@@ -33,6 +63,59 @@ class Aria2Downloader(BaseDownloader):
             logger.error(f"添加 Aria2 种子失败: {e}")
             return False
 
+    @with_connection
+    def add_torrent_file(self, torrent_data: bytes) -> bool:
+        try:
+            # aria2p.API.add_torrent 只接受文件路径，直接调用 RPC 传入 base64 内容
+            self.client.client.add_torrent(base64.b64encode(torrent_data).decode("ascii"), [])
+            return True
+        except Exception as e:
+            logger.error(f"添加 Aria2 种子文件失败: {e}")
+            return False
+
+    @with_connection
+    def add_torrents(self, items: List[Union[str, bytes]]) -> List[bool]:
+        """
+        通过一次 system.multicall 添加所有种子
+        :param items: 种子链接或磁力链接（str）或种子文件内容（bytes）
+        :return: 与 items 一一对应的添加结果
+        """
+        if not items:
+            return []
+        client = self.client.client
+        calls = [
+            (client.ADD_TORRENT, [base64.b64encode(item).decode("ascii"), []]) if isinstance(item, bytes)
+            else (client.ADD_URI, [[item]])
+            for item in items
+        ]
+        try:
+            responses = client.multicall2(calls)
+        except Exception as e:
+            logger.error(f"批量添加 {len(items)} 个 Aria2 种子失败: {e}")
+            return [False] * len(items)
+        # 成功的调用返回 [gid]，失败的调用返回 {"faultCode": ..., "faultString": ...}
+        results = []
+        for index, response in enumerate(responses):
+            if isinstance(response, dict):
+                logger.error(f"添加 Aria2 种子失败（第 {index + 1} 个）: {response.get('faultString')}")
+                results.append(False)
+            else:
+                results.append(True)
+        return results
+
+    @with_connection
+    def has_torrent(self, info_hash: str) -> bool:
+        # WebSocket 在线时镜像由通知实时更新，不再拉取完整的下载列表
+        if self.monitor.synced:
+            return self.monitor.has_torrent(info_hash)
+        try:
+            info_hash = info_hash.lower()
+            return any((download.info_hash or "").lower() == info_hash for download in self.client.get_downloads())
+        except Exception as e:
+            logger.error(f"查询 Aria2 种子失败: {e}")
+            return False
+
+    @with_connection
     def get_torrents(self):
         try:
             return self.client.get_downloads()
@@ -40,6 +123,33 @@ class Aria2Downloader(BaseDownloader):
             logger.error(f"获取 Aria2 下载任务失败: {e}")
             return []
 
+    @with_connection
+    def get_tasks(self) -> list:
+        try:
+            self.monitor.reconcile()
+        except Exception as e:
+            logger.error(f"同步 Aria2 下载状态失败: {e}")
+        return [
+            {"name": item.get("name") or item.get("gid"), "status": item.get("status"),
+             "progress": int(item.get("completedLength") or 0) / max(int(item.get("totalLength") or 0), 1),
+             "hash": item.get("infoHash"), "downloader": self.name}
+            for item in self.monitor.get_downloads()
+        ]
+
+    @with_connection
+    def get_snapshot_records(self) -> list:
+        self.monitor.reconcile()
+        return [from_aria2(item) for item in self.monitor.get_downloads()]
+
+    @with_connection
+    def get_load(self) -> DownloaderLoad:
+        # aria2 不提供磁盘剩余空间，只按任务数和速率评分
+        self.monitor.reconcile()
+        active = self.monitor.get_downloads("active")
+        return DownloaderLoad(active=len(active),
+                              download_speed=sum(int(item.get("downloadSpeed") or 0) for item in active))
+
+    @with_connection
     def pause_torrent(self, torrent_id: str) -> bool:
         try:
             self.client.pause(torrent_id)
@@ -48,6 +158,7 @@ class Aria2Downloader(BaseDownloader):
             logger.error(f"暂停 Aria2 下载任务失败: {e}")
             return False
 
+    @with_connection
     def resume_torrent(self, torrent_id: str) -> bool:
         try:
             self.client.unpause(torrent_id)
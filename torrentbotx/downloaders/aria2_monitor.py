@@ -0,0 +1,209 @@
+"""
+aria2 事件监听
+
+通过 aria2 的 WebSocket 通知通道（onDownloadStart、onDownloadComplete、onDownloadError 等）
+实时更新本地状态镜像，完成通知无需等待轮询即可触发。定期对账只调用 getGlobalStat，
+任务数量没有变化时不再拉取下载列表；仅在有活动任务时刷新活动任务的进度。
+"""
+
+import json
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+import websocket
+from aria2p.client import (NOTIFICATION_BT_COMPLETE, NOTIFICATION_COMPLETE, NOTIFICATION_ERROR,
+                           NOTIFICATION_PAUSE, NOTIFICATION_START, NOTIFICATION_STOP, Notification)
+
+from torrentbotx.utils.logger import get_logger
+
+logger = get_logger("downloaders.aria2_monitor")
+
+# 镜像中保存的字段，不请求 files、peers 等大字段
+STATUS_KEYS = ["gid", "status", "totalLength", "completedLength", "downloadSpeed", "uploadSpeed",
+               "uploadLength", "infoHash", "errorMessage", "dir", "bittorrent"]
+EVENTS = ("start", "pause", "stop", "complete", "error", "bt_complete")
+# aria2 通知类型 -> 事件名
+NOTIFICATION_EVENTS = {
+    NOTIFICATION_START: "start",
+    NOTIFICATION_PAUSE: "pause",
+    NOTIFICATION_STOP: "stop",
+    NOTIFICATION_COMPLETE: "complete",
+    NOTIFICATION_ERROR: "error",
+    NOTIFICATION_BT_COMPLETE: "bt_complete",
+}
+
+
+def _name(status: Dict[str, Any]) -> Optional[str]:
+    return ((status.get("bittorrent") or {}).get("info") or {}).get("name")
+
+
+class Aria2Monitor:
+    def __init__(self, client, reconnect_delay: float = 5.0, max_reconnect_delay: float = 300.0,
+                 ws_timeout: int = 5):
+        """
+        aria2 事件监听与状态镜像
+        :param client: aria2p.Client 实例
+        :param reconnect_delay: WebSocket 断开后的初始重连间隔（秒）
+        :param max_reconnect_delay: 重连间隔上限（秒）
+        :param ws_timeout: WebSocket 接收超时（秒），决定 stop 的响应速度
+        """
+        self.client = client
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.ws_timeout = ws_timeout
+
+        self.downloads: Dict[str, Dict[str, Any]] = {}
+        self._global_stat: Optional[Dict[str, Any]] = None
+        self._subscribers: Dict[str, List[Callable]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # 只在 WebSocket 连接打开期间为 True，由监听线程在连接建立后设置、退出时清除
+        self._connected = False
+
+    @property
+    def listening(self) -> bool:
+        """WebSocket 是否正在监听"""
+        return self._connected and self._thread is not None
+
+    @property
+    def synced(self) -> bool:
+        """正在监听且本次连接后已全量对账，此时镜像可以代替下载列表查询"""
+        return self.listening and self._global_stat is not None
+
+    def has_torrent(self, info_hash: str) -> bool:
+        """
+        在镜像中按 infohash 查找未被移除的下载
+        :param info_hash: 种子 infohash
+        """
+        info_hash = info_hash.lower()
+        with self._lock:
+            return any((item.get("infoHash") or "").lower() == info_hash and item.get("status") != "removed"
+                       for item in self.downloads.values())
+
+    def subscribe(self, event: str, callback: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        订阅下载事件
+        :param event: 事件名，见 EVENTS
+        :param callback: 回调函数，参数为该下载的状态字典
+        """
+        if event not in EVENTS:
+            raise ValueError(f"未知的 aria2 事件: {event}")
+        self._subscribers[event].append(callback)
+
+    def handle_event(self, event: str, gid: str) -> None:
+        """
+        处理一条通知：获取该下载的最新状态、更新镜像并触发订阅者
+        :param event: 事件名
+        :param gid: 下载 GID
+        """
+        try:
+            status = self.client.tell_status(gid, STATUS_KEYS)
+        except Exception as e:
+            logger.error(f"获取 aria2 下载 {gid} 状态失败: {e}")
+            return
+        with self._lock:
+            self.downloads[gid] = status
+        for callback in list(self._subscribers[event]):
+            try:
+                callback(status)
+            except Exception as e:
+                logger.error(f"aria2 事件 {event} 回调执行失败: {e}")
+
+    def _listen_once(self) -> None:
+        """
+        打开 WebSocket 并分发通知，直到连接断开或停止监听。
+        不使用 aria2p 的 listen_to_notifications：它在连接建立前就把 listening 置为 True，且断开后不复位
+        """
+        socket = websocket.create_connection(self.client.ws_server, timeout=self.ws_timeout)
+        try:
+            self._connected = True
+            while not self._stopped.is_set():
+                try:
+                    message = socket.recv()
+                except websocket.WebSocketTimeoutException:
+                    continue
+                except websocket.WebSocketConnectionClosedException:
+                    return
+                notification = Notification.get_or_raise(json.loads(message))
+                event = NOTIFICATION_EVENTS.get(notification.type)
+                if event:
+                    self.handle_event(event, notification.gid)
+        finally:
+            self._connected = False
+            socket.close()
+
+    def _listen(self) -> None:
+        delay = self.reconnect_delay
+        while not self._stopped.is_set():
+            try:
+                self._listen_once()
+                delay = self.reconnect_delay
+            except Exception as e:
+                logger.error(f"aria2 WebSocket 监听异常: {e}")
+            # 连接断开期间靠对账兜底，重连后全量刷新一次
+            self._global_stat = None
+            if self._stopped.is_set():
+                break
+            logger.warning(f"aria2 WebSocket 连接断开，{delay:.0f}s 后重连")
+            self._stopped.wait(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def start(self) -> None:
+        """在后台线程开始监听通知"""
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._listen, name="aria2-monitor", daemon=True)
+        self._thread.start()
+        logger.info("已开始监听 aria2 通知")
+
+    def stop(self) -> None:
+        """停止监听"""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.ws_timeout + 1)
+            self._thread = None
+
+    def refresh(self, active_only: bool = False) -> None:
+        """
+        拉取下载列表更新镜像
+        :param active_only: 只刷新活动任务（进度变化），否则刷新全部任务
+        """
+        calls = [(self.client.TELL_ACTIVE, [STATUS_KEYS])]
+        if not active_only:
+            calls += [(self.client.TELL_WAITING, [0, 1000, STATUS_KEYS]),
+                      (self.client.TELL_STOPPED, [0, 1000, STATUS_KEYS])]
+        results = self.client.multicall2(calls)
+        with self._lock:
+            if not active_only:
+                self.downloads.clear()
+            for result in results:
+                # multicall 的成功结果包在单元素列表中，失败时为 {"faultCode", "faultString"}
+                if not isinstance(result, list) or not result:
+                    continue
+                for status in result[0]:
+                    self.downloads[status["gid"]] = status
+
+    def reconcile(self) -> None:
+        """
+        低成本对账：只在任务数量变化或 WebSocket 断开时全量刷新，有活动任务时刷新其进度
+        """
+        stat = self.client.get_global_stat()
+        counts = {key: stat.get(key) for key in ("numActive", "numWaiting", "numStoppedTotal")}
+        if not self.listening or self._global_stat != counts:
+            self.refresh()
+        elif int(counts["numActive"] or 0) > 0:
+            self.refresh(active_only=True)
+        self._global_stat = counts
+
+    def get_downloads(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        读取本地镜像
+        :param status: aria2 状态筛选，如 active、waiting、paused、complete、error
+        :return: 下载状态字典的副本列表
+        """
+        with self._lock:
+            return [dict(item, name=_name(item)) for item in self.downloads.values()
+                    if status is None or item.get("status") == status]
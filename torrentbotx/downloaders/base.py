@@ -1,35 +1,287 @@
+import functools
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Type
+from typing import List, Optional, Union
 
+from torrentbotx.config.config import load_config
 from torrentbotx.enums.downloader_type import DownloaderType
+from torrentbotx.utils.logger import get_logger
+from torrentbotx.utils.plugins import LazyRegistry
 
-_downloader_registry: Dict[DownloaderType, Type["BaseDownloader"]] = {}
+logger = get_logger("downloaders.base")
 
+HEALTH_CONNECTED = "connected"
+HEALTH_DISCONNECTED = "disconnected"
+HEALTH_BACKOFF = "backoff"
 
-def register_downloader(downloader_type: DownloaderType):
+# 下载器模块在第一次创建该类型的实例时才导入（连同 aria2p、qbittorrentapi 等依赖），
+# 第三方下载器可以通过 torrentbotx.downloaders entry point 提供
+_downloader_registry = LazyRegistry("torrentbotx.downloaders", {
+    DownloaderType.ARIA2.value: "torrentbotx.downloaders.aria2",
+    DownloaderType.QBITTORRENT.value: "torrentbotx.downloaders.qbittorrent",
+    DownloaderType.TRANSMISSION.value: "torrentbotx.downloaders.transmission",
+})
+
+
+def _type_name(downloader_type: Union[DownloaderType, str]) -> str:
+    return getattr(downloader_type, "value", downloader_type)
+
+
+def register_downloader(downloader_type: Union[DownloaderType, str]):
     def decorator(cls):
-        _downloader_registry[downloader_type] = cls
+        _downloader_registry.register(_type_name(downloader_type), cls)
+        cls.downloader_type = downloader_type
         return cls
 
     return decorator
 
 
-def get_downloader_instance(downloader_type: DownloaderType):
-    cls = _downloader_registry.get(downloader_type)
+def get_downloader_instance(downloader_type: Union[DownloaderType, str]):
+    cls = _downloader_registry.get(_type_name(downloader_type).lower())
     if not cls:
         raise ValueError(f"未注册下载器类型：{downloader_type}")
     return cls()
 
 
+class DownloaderUnavailable(RuntimeError):
+    def __init__(self, name: str, retry_in: float, error: Optional[str] = None):
+        """
+        下载器连接失败、处于重连退避期间时抛出
+        :param name: 下载器名称
+        :param retry_in: 距离下次重连的秒数
+        :param error: 最近一次连接失败的原因
+        """
+        self.name = name
+        self.retry_in = retry_in
+        self.error = error
+        super().__init__(f"下载器 {name} 不可用，{retry_in:.0f}s 后重连: {error}")
+
+
+def with_connection(method):
+    """
+    装饰需要 RPC 的方法：首次调用时才建立连接，连接类异常会断开连接，下次调用时重连
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self.ensure_connected()
+        try:
+            return method(self, *args, **kwargs)
+        except self.connection_errors as e:
+            self.disconnect(e)
+            raise
+
+    return wrapper
+
+
 class BaseDownloader(ABC):
+    # 由 register_downloader 设置
+    downloader_type: DownloaderType = None
+    # 视为连接断开的异常类型，子类按后端覆盖
+    connection_errors: tuple = (ConnectionError,)
+    # 这些前缀的配置变化时断开连接，下次使用时按新配置重连
+    config_prefixes: tuple = ()
+    # 本地状态镜像需要后台定期刷新的间隔（秒），为 None 时不刷新，见 refresh_state
+    refresh_interval: Optional[float] = None
+    client = None
+
+    def __init__(self, config=None):
+        """
+        只读取配置，不连接下载器；连接在首次使用或 check_health 时建立
+        :param config: 配置对象，默认加载全局配置
+        """
+        self.config = config or load_config()
+        self.client = None
+        self.reconnect_delay = self.config.get("DOWNLOADER_RECONNECT_DELAY", 1.0)
+        self.max_reconnect_delay = self.config.get("DOWNLOADER_MAX_RECONNECT_DELAY", 300.0)
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.next_retry = 0.0
+        self._connect_lock = threading.Lock()
+        if self.config_prefixes and hasattr(self.config, "subscribe"):
+            self.config.subscribe(self.config_prefixes, self.on_config_change)
+
+    def on_config_change(self, changes: dict) -> None:
+        """
+        连接相关配置变化：断开连接并清除退避，下次使用时立即按新配置重连
+        :param changes: 变化的配置项 -> (旧值, 新值)
+        """
+        logger.info(f"下载器 {self.name} 配置已变更（{', '.join(sorted(changes))}），将重新连接")
+        with self._connect_lock:
+            self.disconnect()
+            self.failures = 0
+            self.next_retry = 0.0
+
+    @property
+    def name(self) -> str:
+        """下载器名称，用于日志和结果"""
+        return _type_name(self.downloader_type) if self.downloader_type else type(self).__name__
+
+    @abstractmethod
+    def connect(self):
+        """
+        连接并登录下载器，成功后设置 self.client，失败时抛出异常且不设置 self.client
+        """
+        pass
+
+    @abstractmethod
+    def ping(self) -> None:
+        """
+        发送一次轻量 RPC 检查连接是否正常，失败时抛出异常
+        """
+        pass
+
+    @property
+    def connected(self) -> bool:
+        return self.client is not None
+
+    @property
+    def retry_in(self) -> float:
+        """距离下次允许重连的秒数"""
+        return max(self.next_retry - time.monotonic(), 0.0)
+
+    @property
+    def available(self) -> bool:
+        """已连接，或者不在重连退避期间"""
+        return self.connected or self.retry_in == 0
+
+    @property
+    def health(self) -> dict:
+        """
+        连接健康状态
+        :return: 含 name、state、failures、retry_in、last_error 的字典
+        """
+        if self.connected:
+            state = HEALTH_CONNECTED
+        else:
+            state = HEALTH_BACKOFF if self.retry_in > 0 else HEALTH_DISCONNECTED
+        return {"name": self.name, "state": state, "failures": self.failures,
+                "retry_in": round(self.retry_in, 1), "last_error": self.last_error}
+
+    def _record_failure(self, error: Exception) -> None:
+        self.failures += 1
+        self.last_error = str(error)
+        delay = min(self.reconnect_delay * 2 ** (self.failures - 1), self.max_reconnect_delay)
+        self.next_retry = time.monotonic() + delay
+        logger.warning(f"下载器 {self.name} 连接失败（第 {self.failures} 次），{delay:.0f}s 后重连: {error}")
+
+    def ensure_connected(self) -> None:
+        """
+        未连接时建立连接，多个线程同时调用只连接一次
+        :raises DownloaderUnavailable: 连接失败或处于重连退避期间
+        """
+        if self.client is not None:
+            return
+        with self._connect_lock:
+            if self.client is not None:
+                return
+            if self.retry_in > 0:
+                raise DownloaderUnavailable(self.name, self.retry_in, self.last_error)
+            try:
+                self.connect()
+            except Exception as e:
+                self.client = None
+                self._record_failure(e)
+                raise DownloaderUnavailable(self.name, self.retry_in, self.last_error) from e
+            if self.failures:
+                logger.info(f"下载器 {self.name} 已重新连接")
+            self.failures = 0
+            self.last_error = None
+
+    def disconnect(self, error: Optional[Exception] = None) -> None:
+        """
+        丢弃当前连接，下次使用时按退避间隔重连
+        :param error: 导致断开的异常
+        """
+        self.client = None
+        if error is not None:
+            self._record_failure(error)
+
+    def close(self) -> None:
+        """
+        释放下载器：取消配置变更订阅并断开连接，之后不应再使用该实例
+        """
+        if self.config_prefixes and hasattr(self.config, "unsubscribe"):
+            self.config.unsubscribe(self.on_config_change)
+        self.disconnect()
+
+    def check_health(self) -> bool:
+        """
+        健康检查：未连接时尝试连接，已连接时 ping，失败则断开并进入退避
+        :return: 是否健康
+        """
+        try:
+            self.ensure_connected()
+            self.ping()
+            return True
+        except DownloaderUnavailable:
+            return False
+        except Exception as e:
+            self.disconnect(e)
+            return False
+
+    def refresh_state(self) -> None:
+        """
+        刷新本地状态镜像，已连接时由 CoreManager 的健康检查线程每 refresh_interval 秒调用一次
+        """
+        pass
+
     @abstractmethod
     def add_torrent(self, torrent_url: str) -> bool:
         pass
 
+    @abstractmethod
+    def add_torrent_file(self, torrent_data: bytes) -> bool:
+        """
+        添加种子文件内容，避免每个下载器各自再下载一次
+        :param torrent_data: .torrent 文件内容
+        :return: 是否添加成功
+        """
+        pass
+
+    def add_torrents(self, items: List[Union[str, bytes]]) -> List[bool]:
+        """
+        批量添加种子，子类应覆盖为后端原生的批量接口以减少 RPC 往返
+        :param items: 种子链接（str）或种子文件内容（bytes）
+        :return: 与 items 一一对应的添加结果
+        """
+        return [self.add_torrent_file(item) if isinstance(item, bytes) else self.add_torrent(item) for item in items]
+
+    @abstractmethod
+    def has_torrent(self, info_hash: str) -> bool:
+        """
+        判断下载器中是否已存在该种子
+        :param info_hash: 种子 infohash
+        :return: 是否已存在
+        """
+        pass
+
     @abstractmethod
     def get_torrents(self) -> list:
         pass
 
+    def get_tasks(self) -> List[dict]:
+        """
+        获取任务摘要，供 /qbtasks 等展示使用
+        :return: 含 name、status、progress 的字典列表
+        """
+        return []
+
+    def get_snapshot_records(self) -> List[dict]:
+        """
+        获取所有种子的统一记录，写入 models.TorrentStore 列式快照
+        :return: models.torrent_store 中 from_qbittorrent 等函数返回的记录列表
+        """
+        return []
+
+    def get_load(self):
+        """
+        获取负载快照，供放置策略评分，应从本地状态镜像读取而不是每次拉取完整列表
+        :return: core.placement.DownloaderLoad，负载未知时返回 None
+        """
+        return None
+
     @abstractmethod
     def pause_torrent(self, torrent_id: str) -> bool:
         pass
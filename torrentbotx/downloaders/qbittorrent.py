@@ -1,17 +1,84 @@
+import base64
+import time
+from typing import List, Optional, Union
+from urllib.parse import parse_qs, urlparse
+
 import qbittorrentapi
 
-from torrentbotx.config.config import load_config
-from torrentbotx.downloaders.base import BaseDownloader, register_downloader
+from torrentbotx.core.placement import DownloaderLoad
+from torrentbotx.downloaders.base import BaseDownloader, register_downloader, with_connection
+from torrentbotx.downloaders.qbittorrent_mirror import QBittorrentMirror
 from torrentbotx.enums.downloader_type import DownloaderType
+from torrentbotx.models.torrent_store import from_qbittorrent
+from torrentbotx.utils.bencode import BencodeError, parse_torrent
 from torrentbotx.utils.logger import get_logger
 
 log = get_logger("downloaders.qbittorrent")
 
+# 批量添加后 qBittorrent 异步加载种子，等待种子出现的最长时间（秒）与查询间隔
+ADD_VERIFY_TIMEOUT = 3.0
+ADD_VERIFY_INTERVAL = 0.2
+
+
+def _magnet_hash(uri: str) -> Optional[str]:
+    """
+    从磁力链接中解析 qBittorrent 使用的种子 ID
+    :param uri: 磁力链接
+    :return: 40 位小写十六进制 infohash，不是磁力链接或无法解析时返回 None
+    """
+    if not uri.startswith("magnet:"):
+        return None
+    for xt in parse_qs(urlparse(uri).query).get("xt", []):
+        value = xt.rpartition(":")[2]
+        if xt.startswith("urn:btih:"):
+            if len(value) == 40:
+                return value.lower()
+            if len(value) == 32:
+                try:
+                    return base64.b32decode(value.upper()).hex()
+                except ValueError:
+                    return None
+        elif xt.startswith("urn:btmh:1220") and len(value) == 68:
+            # v2 multihash，qBittorrent 以截断到 40 位的 v2 infohash 作为 ID
+            return value[4:44].lower()
+    return None
+
 
 @register_downloader(DownloaderType.QBITTORRENT)
 class QBittorrentDownloader(BaseDownloader):
-    def get_torrents(self) -> list:
-        pass
+    # qbittorrent-api 在会话过期（403）时会自动重新登录，这里只处理连接失败
+    connection_errors = (qbittorrentapi.APIConnectionError,)
+    config_prefixes = ("QBIT_",)
+
+    @with_connection
+    def get_torrents(self, status_filter: str = "all", category: Optional[str] = None) -> list:
+        """
+        从状态镜像读取种子列表，镜像过期时只同步增量
+        :param status_filter: 状态筛选，如 downloading、seeding、completed
+        :param category: 分类
+        :return: 种子字典列表
+        """
+        self.mirror.refresh()
+        return self.mirror.get_torrents(status_filter, category=category)
+
+    def get_tasks(self) -> list:
+        return [
+            {"name": torrent.get("name"), "status": torrent.get("state"), "progress": torrent.get("progress"),
+             "hash": torrent["hash"], "downloader": self.name}
+            for torrent in self.get_torrents()
+        ]
+
+    def get_snapshot_records(self) -> list:
+        return [from_qbittorrent(torrent) for torrent in self.get_torrents()]
+
+    @with_connection
+    def get_load(self) -> DownloaderLoad:
+        self.mirror.refresh()
+        totals = self.mirror.totals()
+        return DownloaderLoad(free_space=totals["free_space"],
+                              active=len(self.mirror.get_torrents("downloading")),
+                              download_speed=totals["dlspeed"],
+                              categories=list(self.mirror.categories))
 
     def pause_torrent(self, torrent_id: str) -> bool:
         pass
@@ -19,25 +86,38 @@ class QBittorrentDownloader(BaseDownloader):
     def resume_torrent(self, torrent_id: str) -> bool:
         pass
 
-    def __init__(self):
-        self.config = load_config()
-        self.client = None
-        self.connect()
+    def __init__(self, config=None):
+        super().__init__(config)
+        self.mirror = None
+
+    def _requests_args(self) -> dict:
+        # 为 RPC 设置超时，避免响应慢的 qBittorrent 长时间占用线程
+        requests_args = dict(self.config.get("QBIT_REQUESTS_ARGS") or {})
+        if isinstance(requests_args.get("timeout"), list):
+            requests_args["timeout"] = tuple(requests_args["timeout"])
+        return requests_args
 
     def connect(self):
         try:
-            self.client = qbittorrentapi.Client(
+            client = qbittorrentapi.Client(
                 host=self.config.get("QBIT_HOST", "localhost"),
                 port=self.config.get("QBIT_PORT", 8080),
                 username=self.config.get("QBIT_USERNAME", "admin"),
-                password=self.config.get("QBIT_PASSWORD", "adminadmin")
+                password=self.config.get("QBIT_PASSWORD", "adminadmin"),
+                REQUESTS_ARGS=self._requests_args()
             )
-            self.client.auth_log_in()
+            client.auth_log_in()
+            self.mirror = QBittorrentMirror(client, min_interval=self.config.get("QBIT_SYNC_INTERVAL", 2.0))
+            self.client = client
             log.info("成功连接到 qBittorrent")
         except Exception as e:
             log.error(f"连接 qBittorrent 失败: {e}")
             raise
 
+    def ping(self) -> None:
+        self.client.app_version()
+
+    @with_connection
     def add_torrent(self, torrent_url: str) -> bool:
         try:
             self.client.torrents_add(urls=torrent_url)
@@ -46,6 +126,93 @@ class QBittorrentDownloader(BaseDownloader):
             log.error(f"添加种子失败: {e}")
             return False
 
+    @with_connection
+    def add_torrent_file(self, torrent_data: bytes) -> bool:
+        try:
+            self.client.torrents_add(torrent_files=torrent_data)
+            return True
+        except Exception as e:
+            log.error(f"添加种子文件失败: {e}")
+            return False
+
+    @with_connection
+    def add_torrents(self, items: List[Union[str, bytes]]) -> List[bool]:
+        """
+        一次 torrents_add 调用添加所有链接和种子文件
+        :param items: 种子链接（str）或种子文件内容（bytes）
+        :return: 与 items 一一对应的添加结果，无法解析的种子文件不会提交；
+                 能得到 infohash 的种子（种子文件、磁力链接）按添加后是否存在于 qBittorrent 逐个判断，
+                 普通下载链接无法得知 infohash，使用整批的返回结果
+        """
+        results = [False] * len(items)
+        urls, files, submitted = [], [], []
+        hashes = {}
+        for index, item in enumerate(items):
+            if isinstance(item, bytes):
+                try:
+                    hashes[index] = parse_torrent(item).info_hash
+                except BencodeError as e:
+                    log.error(f"跳过无效的种子文件（第 {index + 1} 个）: {e}")
+                    continue
+                files.append(item)
+            else:
+                info_hash = _magnet_hash(item)
+                if info_hash:
+                    hashes[index] = info_hash
+                urls.append(item)
+            submitted.append(index)
+        if not submitted:
+            return results
+
+        try:
+            response = self.client.torrents_add(urls=urls or None, torrent_files=files or None)
+        except Exception as e:
+            log.error(f"批量添加 {len(submitted)} 个种子失败: {e}")
+            return results
+        # qBittorrent 对整批只返回 "Ok." 或 "Fails."，不能说明每个种子是否添加成功
+        accepted = str(response).strip().lower().startswith("ok")
+        if not accepted:
+            log.error(f"批量添加 {len(submitted)} 个种子失败: {response}")
+        present = self._wait_for_hashes(set(hashes.values())) if accepted and hashes else set()
+        for index in submitted:
+            if index in hashes:
+                results[index] = hashes[index] in present
+                if accepted and not results[index]:
+                    log.error(f"种子 {hashes[index]} 提交后未出现在 qBittorrent 中")
+            else:
+                results[index] = accepted
+        return results
+
+    def _wait_for_hashes(self, hashes: set) -> set:
+        """
+        查询添加后实际存在的种子，种子异步加载，未全部出现时在超时前重试
+        :param hashes: 期望存在的 infohash
+        :return: 实际存在的 infohash
+        """
+        deadline = time.monotonic() + ADD_VERIFY_TIMEOUT
+        present = set()
+        while True:
+            try:
+                torrents = self.client.torrents_info(torrent_hashes=sorted(hashes - present))
+                present.update(torrent["hash"].lower() for torrent in torrents)
+            except Exception as e:
+                log.error(f"查询添加结果失败: {e}")
+            if present >= hashes or time.monotonic() >= deadline:
+                return present
+            time.sleep(ADD_VERIFY_INTERVAL)
+
+    @with_connection
+    def has_torrent(self, info_hash: str) -> bool:
+        # 镜像同步正常时直接查镜像（间隔内不发请求，否则只同步增量），同步失败时回退到 torrents_info
+        self.mirror.refresh()
+        if self.mirror.synced:
+            return self.mirror.get_torrent(info_hash) is not None
+        try:
+            return bool(self.client.torrents_info(torrent_hashes=info_hash))
+        except Exception as e:
+            log.error(f"查询种子失败: {e}")
+            return False
+
 
 class QBittorrentManager:
     """精简版的 qBittorrent 管理器, 供单元测试使用."""
@@ -0,0 +1,172 @@
+"""
+qBittorrent 状态镜像
+
+通过 /sync/maindata 的 rid 增量协议在进程内维护 qBittorrent 的种子、分类和标签状态：
+首次同步获取全量数据，之后每次只传输变化的字段。状态、筛选和汇总查询都在本地完成，
+不再每次拉取完整的 torrents_info 列表。
+"""
+
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from torrentbotx.utils.logger import get_logger
+
+log = get_logger("downloaders.qbittorrent_mirror")
+
+DOWNLOADING_STATES = {"downloading", "metaDL", "forcedMetaDL", "forcedDL", "stalledDL", "checkingDL",
+                      "queuedDL", "allocating"}
+SEEDING_STATES = {"uploading", "forcedUP", "stalledUP", "checkingUP", "queuedUP"}
+PAUSED_STATES = {"pausedDL", "pausedUP", "stoppedDL", "stoppedUP"}
+STALLED_STATES = {"stalledDL", "stalledUP"}
+ERRORED_STATES = {"error", "missingFiles"}
+
+
+def _is_active(torrent: Dict[str, Any]) -> bool:
+    return bool(torrent.get("dlspeed") or torrent.get("upspeed"))
+
+
+# 与 qBittorrent WebUI 一致的状态筛选
+STATUS_FILTERS = {
+    "all": lambda t: True,
+    "downloading": lambda t: t.get("state") in DOWNLOADING_STATES,
+    "seeding": lambda t: t.get("state") in SEEDING_STATES,
+    "completed": lambda t: (t.get("progress") or 0) >= 1,
+    "paused": lambda t: t.get("state") in PAUSED_STATES,
+    "active": _is_active,
+    "inactive": lambda t: not _is_active(t),
+    "stalled": lambda t: t.get("state") in STALLED_STATES,
+    "errored": lambda t: t.get("state") in ERRORED_STATES,
+}
+
+
+class QBittorrentMirror:
+    def __init__(self, client, min_interval: float = 1.0):
+        """
+        qBittorrent 状态镜像
+        :param client: qbittorrentapi.Client 实例
+        :param min_interval: 两次同步的最小间隔（秒），间隔内的查询直接读取镜像
+        """
+        self.client = client
+        self.min_interval = min_interval
+
+        self.rid = 0
+        self.torrents: Dict[str, Dict[str, Any]] = {}
+        self.categories: Dict[str, Dict[str, Any]] = {}
+        self.tags: set = set()
+        self.server_state: Dict[str, Any] = {}
+        self.synced_at = 0.0
+        self._sync_failed = False
+        self._lock = threading.RLock()
+
+    @property
+    def synced(self) -> bool:
+        """已同步过且最近一次同步成功，此时镜像可以代替 torrents_info 查询"""
+        return bool(self.synced_at) and not self._sync_failed
+
+    def apply(self, data: Dict[str, Any]) -> None:
+        """
+        合并一次 sync/maindata 响应
+        :param data: 响应内容，full_update 为真时替换全部状态
+        """
+        with self._lock:
+            if data.get("full_update"):
+                self.torrents.clear()
+                self.categories.clear()
+                self.tags.clear()
+                self.server_state.clear()
+
+            for torrent_hash, fields in (data.get("torrents") or {}).items():
+                self.torrents.setdefault(torrent_hash, {"hash": torrent_hash}).update(fields)
+            for torrent_hash in data.get("torrents_removed") or []:
+                self.torrents.pop(torrent_hash, None)
+
+            for name, fields in (data.get("categories") or {}).items():
+                self.categories.setdefault(name, {"name": name}).update(fields)
+            for name in data.get("categories_removed") or []:
+                self.categories.pop(name, None)
+
+            self.tags.update(data.get("tags") or [])
+            self.tags.difference_update(data.get("tags_removed") or [])
+            self.server_state.update(data.get("server_state") or {})
+
+            self.rid = data.get("rid", self.rid)
+            self.synced_at = time.monotonic()
+            self._sync_failed = False
+
+    def sync(self) -> None:
+        """向 qBittorrent 请求自上次同步以来的增量"""
+        with self._lock:
+            rid = self.rid
+        data = self.client.sync_maindata(rid=rid)
+        self.apply(dict(data))
+
+    def refresh(self, max_age: Optional[float] = None) -> bool:
+        """
+        镜像超过 max_age 未同步时同步一次，同步失败时保留旧数据
+        :param max_age: 可接受的数据陈旧时间（秒），为空时使用 min_interval
+        :return: 镜像是否可用
+        """
+        max_age = self.min_interval if max_age is None else max_age
+        if self.synced_at and time.monotonic() - self.synced_at < max_age:
+            return True
+        try:
+            self.sync()
+        except Exception as e:
+            self._sync_failed = True
+            log.error(f"同步 qBittorrent 状态失败: {e}")
+        return bool(self.synced_at)
+
+    def get_torrents(self, status_filter: str = "all", category: Optional[str] = None,
+                     tag: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        在本地筛选种子
+        :param status_filter: 状态筛选，见 STATUS_FILTERS
+        :param category: 分类
+        :param tag: 标签
+        :return: 种子字典的副本列表
+        """
+        match = STATUS_FILTERS.get(status_filter)
+        if match is None:
+            raise ValueError(f"未知的状态筛选: {status_filter}")
+        with self._lock:
+            return [
+                dict(torrent) for torrent in self.torrents.values()
+                if match(torrent)
+                and (category is None or torrent.get("category") == category)
+                and (tag is None or tag in (torrent.get("tags") or "").split(", "))
+            ]
+
+    def get_torrent(self, torrent_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        获取单个种子
+        :param torrent_hash: 种子 hash
+        :return: 种子字典的副本，不存在时返回 None
+        """
+        with self._lock:
+            torrent = self.torrents.get(torrent_hash.lower())
+            return dict(torrent) if torrent else None
+
+    def status_counts(self) -> Dict[str, int]:
+        """
+        按 qBittorrent 状态统计种子数量
+        :return: 状态 -> 数量
+        """
+        with self._lock:
+            return dict(Counter(torrent.get("state") for torrent in self.torrents.values()))
+
+    def totals(self) -> Dict[str, Any]:
+        """
+        汇总种子数量、总大小和当前速率
+        :return: 汇总字典
+        """
+        with self._lock:
+            torrents = list(self.torrents.values())
+            return {
+                "count": len(torrents),
+                "size": sum(torrent.get("size") or 0 for torrent in torrents),
+                "dlspeed": sum(torrent.get("dlspeed") or 0 for torrent in torrents),
+                "upspeed": sum(torrent.get("upspeed") or 0 for torrent in torrents),
+                "free_space": self.server_state.get("free_space_on_disk"),
+            }
@@ -1,8 +1,14 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Union
+
 import transmission_rpc
 
-from torrentbotx.config.config import load_config
-from torrentbotx.downloaders.base import BaseDownloader, register_downloader
+from torrentbotx.core.placement import DownloaderLoad
+from torrentbotx.downloaders.base import BaseDownloader, register_downloader, with_connection
+from torrentbotx.downloaders.transmission_snapshot import (RECENTLY_ACTIVE_WINDOW, STATUS_FIELDS, STATUS_NAMES,
+                                                           TransmissionSnapshot)
 from torrentbotx.enums.downloader_type import DownloaderType
+from torrentbotx.models.torrent_store import from_transmission
 from torrentbotx.utils.logger import get_logger
 
 log = get_logger("downloaders.transmission")
@@ -10,14 +16,23 @@ log = get_logger("downloaders.transmission")
 
 @register_downloader(DownloaderType.TRANSMISSION)
 class TransmissionDownloader(BaseDownloader):
-    def __init__(self):
-        self.config = load_config()
-        self.client = None
-        self.connect()
+    # 批量添加时同时在途的 RPC 数量
+    pipeline_depth = 4
+    # transmission-rpc 会自动处理 409 会话 ID 过期，这里只处理连接失败
+    connection_errors = (transmission_rpc.TransmissionConnectError, transmission_rpc.TransmissionTimeoutError)
+    config_prefixes = ("TRANSMISSION_",)
+    # 后台轮询间隔小于 recently-active 的时间窗口，保证增量轮询不会退化为全量同步
+    refresh_interval = RECENTLY_ACTIVE_WINDOW / 2
+
+    def __init__(self, config=None):
+        super().__init__(config)
+        self.snapshot = None
+        self.download_dir = None
 
     def connect(self):
         try:
-            self.client = transmission_rpc.Client(
+            # 构造 Client 时会请求一次 session-get
+            client = transmission_rpc.Client(
                 username=self.config.get("TRANSMISSION_USER", "admin"),
                 password=self.config.get("TRANSMISSION_PASSWORD", "password"),
                 host=self.config.get("TRANSMISSION_HOST", "127.0.0.1"),
@@ -26,11 +41,19 @@ class TransmissionDownloader(BaseDownloader):
                 timeout=self.config.get("TRANSMISSION_TIME_OUT", 5000),
                 logger=log
             )
+            self.snapshot = TransmissionSnapshot(
+                client, full_sync_interval=self.config.get("TRANSMISSION_FULL_SYNC_INTERVAL", 300.0))
+            self.download_dir = None
+            self.client = client
             log.info("成功连接到 Transmission")
         except Exception as e:
             log.error(f"连接 Transmission 错误: {e}")
             raise
 
+    def ping(self) -> None:
+        self.client.session_stats()
+
+    @with_connection
     def add_torrent(self, torrent_url: str) -> bool:
         try:
             self.client.add_torrent(torrent_url)
@@ -39,13 +62,92 @@ class TransmissionDownloader(BaseDownloader):
             log.error(f"添加种子失败: {e}")
             return False
 
-    def get_torrents(self):
+    @with_connection
+    def add_torrent_file(self, torrent_data: bytes) -> bool:
+        try:
+            self.client.add_torrent(torrent_data)
+            return True
+        except Exception as e:
+            log.error(f"添加种子文件失败: {e}")
+            return False
+
+    @with_connection
+    def add_torrents(self, items: List[Union[str, bytes]]) -> List[bool]:
+        """
+        批量添加种子。Transmission RPC 没有批量接口，通过同一个 keep-alive 会话
+        同时保持 pipeline_depth 个 torrent-add 请求在途，总耗时不再是逐个往返之和
+        :param items: 种子链接（str）或种子文件内容（bytes）
+        :return: 与 items 一一对应的添加结果
+        """
+        if not items:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.pipeline_depth, len(items)),
+                                thread_name_prefix="transmission-add") as executor:
+            return list(executor.map(
+                lambda item: self.add_torrent_file(item) if isinstance(item, bytes) else self.add_torrent(item), items))
+
+    @with_connection
+    def has_torrent(self, info_hash: str) -> bool:
+        try:
+            return bool(self.client.get_torrents(ids=[info_hash], arguments=["id"]))
+        except Exception as e:
+            log.error(f"查询种子失败: {e}")
+            return False
+
+    @with_connection
+    def get_torrents(self, fields: Optional[Iterable[str]] = STATUS_FIELDS, ids=None):
+        """
+        获取种子，只请求调用方需要的字段
+        :param fields: torrent-get 字段列表，为 None 时请求全部字段（包括 peers、files 等大字段）
+        :param ids: 种子 ID 或 hash，为空时获取全部
+        :return: transmission_rpc.Torrent 列表
+        """
         try:
-            return self.client.get_torrents()
+            return self.client.get_torrents(ids=ids, arguments=list(fields) if fields is not None else None)
         except Exception as e:
             log.error(f"获取任务失败: {e}")
             return []
 
+    @with_connection
+    def poll(self) -> list:
+        """
+        增量轮询：只获取最近有变化的种子并合并到本地快照
+        :return: 本次有变化的种子字典列表
+        """
+        try:
+            return self.snapshot.poll()
+        except Exception as e:
+            log.error(f"轮询 Transmission 失败: {e}")
+            return []
+
+    def refresh_state(self) -> None:
+        self.poll()
+
+    def get_tasks(self) -> list:
+        self.poll()
+        return [
+            {"name": torrent.get("name"), "status": STATUS_NAMES.get(torrent.get("status"), "unknown"),
+             "progress": torrent.get("percentDone"), "hash": torrent.get("hashString"), "downloader": self.name}
+            for torrent in self.snapshot.get_torrents()
+        ]
+
+    def get_snapshot_records(self) -> list:
+        self.poll()
+        return [from_transmission(torrent) for torrent in self.snapshot.get_torrents()]
+
+    @with_connection
+    def get_load(self) -> DownloaderLoad:
+        self.poll()
+        torrents = self.snapshot.get_torrents()
+        downloading = self.snapshot.get_torrents("downloading")
+        if self.download_dir is None:
+            self.download_dir = self.client.get_session().download_dir
+        return DownloaderLoad(free_space=self.client.free_space(self.download_dir),
+                              active=len(downloading),
+                              download_speed=sum(torrent.get("rateDownload") or 0 for torrent in downloading),
+                              categories={label for torrent in torrents for label in torrent.get("labels") or []})
+
+    @with_connection
     def pause_torrent(self, torrent_id: str) -> bool:
         try:
             self.client.stop_torrent(torrent_id)
@@ -54,6 +156,7 @@ class TransmissionDownloader(BaseDownloader):
             log.error(f"暂停任务失败: {e}")
             return False
 
+    @with_connection
     def resume_torrent(self, torrent_id: str) -> bool:
         try:
             self.client.start_torrent(torrent_id)
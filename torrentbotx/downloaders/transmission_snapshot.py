@@ -0,0 +1,92 @@
+"""
+Transmission 本地快照
+
+torrent-get 只请求调用方需要的字段，周期轮询使用 recently-active 模式，
+只返回最近有变化的种子以及被删除的种子 ID，合并到本地快照中；
+定期做一次全量同步，纠正可能遗漏的变化；距上次轮询超过 recently-active 的时间窗口时，
+中间的变化和删除已经无法获取，也改为全量同步。CoreManager 的健康检查线程按
+TransmissionDownloader.refresh_interval 在后台轮询，保证按需读取时快照仍在时间窗口内。
+"""
+
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from torrentbotx.utils.logger import get_logger
+
+log = get_logger("downloaders.transmission_snapshot")
+
+# 常用的字段组合，按需选择，避免拉取 peers、trackers、files 等大字段
+STATUS_FIELDS = ("id", "hashString", "name", "status", "percentDone", "error", "errorString")
+RATE_FIELDS = ("id", "hashString", "rateDownload", "rateUpload", "eta", "peersConnected")
+SNAPSHOT_FIELDS = STATUS_FIELDS + RATE_FIELDS[2:] + (
+    "totalSize", "downloadDir", "labels", "uploadRatio", "addedDate", "doneDate")
+
+# Transmission 只返回最近 60 秒内活动过的种子，留出请求耗时的余量
+RECENTLY_ACTIVE_WINDOW = 50.0
+
+# torrent-get 返回的 status 数值
+STATUS_NAMES = {
+    0: "stopped",
+    1: "check pending",
+    2: "checking",
+    3: "download pending",
+    4: "downloading",
+    5: "seed pending",
+    6: "seeding",
+}
+
+
+class TransmissionSnapshot:
+    def __init__(self, client, fields: Iterable[str] = SNAPSHOT_FIELDS, full_sync_interval: float = 300.0):
+        """
+        Transmission 本地快照
+        :param client: transmission_rpc.Client 实例
+        :param fields: 快照保存的字段
+        :param full_sync_interval: 全量同步的间隔（秒），其余轮询只请求 recently-active
+        """
+        self.client = client
+        self.fields = list(dict.fromkeys(("id", "hashString", *fields)))
+        self.full_sync_interval = full_sync_interval
+
+        self.torrents: Dict[int, Dict[str, Any]] = {}
+        self.full_synced_at = 0.0
+        self.polled_at = 0.0
+        self._lock = threading.Lock()
+
+    def full_sync(self) -> None:
+        """全量获取快照字段，替换本地快照"""
+        torrents = self.client.get_torrents(arguments=self.fields)
+        with self._lock:
+            self.torrents = {torrent.fields["id"]: dict(torrent.fields) for torrent in torrents}
+            self.full_synced_at = self.polled_at = time.monotonic()
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """
+        轮询一次：到期或距上次轮询超过 RECENTLY_ACTIVE_WINDOW 时全量同步，否则只合并最近有变化的种子
+        :return: 本次有变化的种子字典列表（全量同步时为全部种子）
+        """
+        now = time.monotonic()
+        if (not self.full_synced_at or now - self.full_synced_at >= self.full_sync_interval
+                or now - self.polled_at >= RECENTLY_ACTIVE_WINDOW):
+            self.full_sync()
+            return self.get_torrents()
+
+        active, removed = self.client.get_recently_active_torrents(arguments=self.fields)
+        with self._lock:
+            self.polled_at = now
+            for torrent in active:
+                self.torrents.setdefault(torrent.fields["id"], {}).update(torrent.fields)
+            for torrent_id in removed:
+                self.torrents.pop(torrent_id, None)
+        return [dict(torrent.fields) for torrent in active]
+
+    def get_torrents(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        读取本地快照
+        :param status: 状态名筛选，见 STATUS_NAMES
+        :return: 种子字典的副本列表
+        """
+        with self._lock:
+            return [dict(torrent) for torrent in self.torrents.values()
+                    if status is None or STATUS_NAMES.get(torrent.get("status")) == status]
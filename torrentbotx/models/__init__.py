@@ -1,6 +1,8 @@
 from torrentbotx.models.category import Category
+from torrentbotx.models.download_result import DownloaderResult, DownloadTaskResult
 from torrentbotx.models.task import Task
 from torrentbotx.models.torrent import Torrent
+from torrentbotx.models.torrent_store import TorrentRow, TorrentStore
 from torrentbotx.models.user import User
 
-__all__ = ["Category", "Task", "Torrent", "User"]
+__all__ = ["Category", "DownloaderResult", "DownloadTaskResult", "Task", "Torrent", "TorrentRow", "TorrentStore", "User"]
@@ -0,0 +1,85 @@
+from typing import List, Optional
+
+ADDED = "added"
+SKIPPED = "skipped"
+FAILED = "failed"
+TIMEOUT = "timeout"
+
+
+class DownloaderResult:
+    def __init__(self, downloader: str, status: str, latency: float, error: Optional[str] = None):
+        """
+        单个下载器的执行结果
+        :param downloader: 下载器名称
+        :param status: 执行状态（added、skipped、failed、timeout）
+        :param latency: 耗时（秒），超时时为等待的时长
+        :param error: 失败原因
+        """
+        self.downloader = downloader
+        self.status = status
+        self.latency = latency
+        self.error = error
+
+    @property
+    def success(self) -> bool:
+        """已添加或下载器中已存在"""
+        return self.status in (ADDED, SKIPPED)
+
+    def to_dict(self) -> dict:
+        """
+        将结果转换为字典
+        :return: 字典形式的执行结果
+        """
+        return {
+            "downloader": self.downloader,
+            "status": self.status,
+            "success": self.success,
+            "latency": self.latency,
+            "error": self.error,
+        }
+
+
+class DownloadTaskResult:
+    def __init__(self, name: str, results: Optional[List[DownloaderResult]] = None, error: Optional[str] = None):
+        """
+        一次下载任务在所有下载器上的执行结果，任一下载器成功时为真
+        :param name: 种子名称或ID
+        :param results: 各下载器的执行结果
+        :param error: 任务整体失败（如种子获取失败）的原因
+        """
+        self.name = name
+        self.results = results or []
+        self.error = error
+
+    @property
+    def success(self) -> bool:
+        """是否至少有一个下载器成功"""
+        return any(result.success for result in self.results)
+
+    def __bool__(self) -> bool:
+        return self.success
+
+    def summary(self) -> str:
+        """
+        生成用于通知的摘要
+        :return: 每个下载器一行的文本
+        """
+        if self.error:
+            return f"{self.name}: {self.error}"
+        lines = [self.name]
+        for result in self.results:
+            line = f"{result.downloader}: {result.status} ({result.latency:.2f}s)"
+            lines.append(f"{line} {result.error}" if result.error else line)
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict:
+        """
+        将结果转换为字典
+        :return: 字典形式的执行结果
+        """
+        return {
+            "name": self.name,
+            "success": self.success,
+            "error": self.error,
+            "results": [result.to_dict() for result in self.results],
+        }
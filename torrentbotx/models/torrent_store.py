@@ -0,0 +1,350 @@
+"""
+跨下载器的种子状态快照（列式存储）
+
+各下载器返回的对象类型不同（qBittorrent 字典、transmission_rpc.Torrent、aria2 状态字典），
+这里统一为一张列式表：数值列使用 array 类型数组，状态、分类、下载器名使用驻留字符串，
+每个种子只占各列中的一个槽位。筛选、排序和汇总直接在列上完成，
+需要单独访问某个种子时使用 __slots__ 的 TorrentRow 视图，不为每个种子创建完整对象。
+"""
+
+import operator
+import sys
+import threading
+from array import array
+from collections import defaultdict
+from itertools import compress
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# 统一的状态名
+DOWNLOADING = "downloading"
+SEEDING = "seeding"
+PAUSED = "paused"
+COMPLETED = "completed"
+QUEUED = "queued"
+CHECKING = "checking"
+ERROR = "error"
+UNKNOWN = "unknown"
+
+# 列名 -> array 类型码
+NUMERIC_COLUMNS = {
+    "size": "q",
+    "progress": "d",
+    "dlspeed": "q",
+    "upspeed": "q",
+    "ratio": "d",
+    "added_on": "q",
+}
+STRING_COLUMNS = ("downloader", "hash", "name", "state", "category")
+# 取值种类很少的列，驻留后所有行共享同一个字符串对象
+INTERNED_COLUMNS = ("downloader", "state", "category")
+
+_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+_QBIT_STATES = {
+    "downloading": DOWNLOADING, "metaDL": DOWNLOADING, "forcedMetaDL": DOWNLOADING, "forcedDL": DOWNLOADING,
+    "stalledDL": DOWNLOADING, "allocating": DOWNLOADING,
+    "uploading": SEEDING, "forcedUP": SEEDING, "stalledUP": SEEDING,
+    "pausedDL": PAUSED, "stoppedDL": PAUSED,
+    "pausedUP": COMPLETED, "stoppedUP": COMPLETED,
+    "queuedDL": QUEUED, "queuedUP": QUEUED,
+    "checkingDL": CHECKING, "checkingUP": CHECKING, "checkingResumeData": CHECKING, "moving": CHECKING,
+    "error": ERROR, "missingFiles": ERROR,
+}
+_TRANSMISSION_STATES = {1: CHECKING, 2: CHECKING, 3: QUEUED, 4: DOWNLOADING, 5: QUEUED, 6: SEEDING}
+_ARIA2_STATES = {"waiting": QUEUED, "paused": PAUSED, "complete": COMPLETED, "error": ERROR}
+
+
+def _intern(value: Optional[str]) -> str:
+    return sys.intern(value or "")
+
+
+def from_qbittorrent(torrent: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    转换 qBittorrent 的种子字典（torrents_info 或状态镜像）
+    :param torrent: 种子字典
+    :return: 统一字段的记录
+    """
+    return {
+        "hash": torrent.get("hash"),
+        "name": torrent.get("name"),
+        "size": torrent.get("size") or 0,
+        "progress": torrent.get("progress") or 0.0,
+        "state": _QBIT_STATES.get(torrent.get("state"), UNKNOWN),
+        "category": torrent.get("category"),
+        "dlspeed": torrent.get("dlspeed") or 0,
+        "upspeed": torrent.get("upspeed") or 0,
+        "ratio": torrent.get("ratio") or 0.0,
+        "added_on": torrent.get("added_on") or 0,
+    }
+
+
+def from_transmission(torrent: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    转换 Transmission 的种子字段（transmission_rpc.Torrent.fields 或本地快照）
+    :param torrent: 种子字段字典
+    :return: 统一字段的记录
+    """
+    progress = torrent.get("percentDone") or 0.0
+    if torrent.get("error"):
+        state = ERROR
+    elif torrent.get("status") == 0:
+        state = COMPLETED if progress >= 1 else PAUSED
+    else:
+        state = _TRANSMISSION_STATES.get(torrent.get("status"), UNKNOWN)
+    labels = torrent.get("labels") or []
+    return {
+        "hash": torrent.get("hashString"),
+        "name": torrent.get("name"),
+        "size": torrent.get("totalSize") or 0,
+        "progress": progress,
+        "state": state,
+        "category": labels[0] if labels else None,
+        "dlspeed": torrent.get("rateDownload") or 0,
+        "upspeed": torrent.get("rateUpload") or 0,
+        # 未上传过时 Transmission 返回 -1
+        "ratio": max(torrent.get("uploadRatio") or 0.0, 0.0),
+        "added_on": torrent.get("addedDate") or 0,
+    }
+
+
+def from_aria2(status: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    转换 aria2 的 tellStatus 结果（aria2 返回的数值均为字符串）
+    :param status: 状态字典
+    :return: 统一字段的记录
+    """
+    total = int(status.get("totalLength") or 0)
+    completed = int(status.get("completedLength") or 0)
+    uploaded = int(status.get("uploadLength") or 0)
+    if status.get("status") == "active":
+        state = SEEDING if status.get("bittorrent") and total and completed >= total else DOWNLOADING
+    else:
+        state = _ARIA2_STATES.get(status.get("status"), UNKNOWN)
+    return {
+        "hash": status.get("infoHash") or status.get("gid"),
+        "name": status.get("name") or ((status.get("bittorrent") or {}).get("info") or {}).get("name"),
+        "size": total,
+        "progress": completed / total if total else 0.0,
+        "state": state,
+        "category": None,
+        "dlspeed": int(status.get("downloadSpeed") or 0),
+        "upspeed": int(status.get("uploadSpeed") or 0),
+        "ratio": uploaded / completed if completed else 0.0,
+        "added_on": 0,
+    }
+
+
+class TorrentRow:
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store: "TorrentStore", index: int):
+        """
+        单个种子的只读视图，按需从各列读取字段
+        :param store: 所属的快照
+        :param index: 行号
+        """
+        self._store = store
+        self._index = index
+
+    def __getattr__(self, column: str) -> Any:
+        try:
+            values = self._store.columns[column]
+        except KeyError:
+            raise AttributeError(column) from None
+        return values[self._index]
+
+    def __repr__(self) -> str:
+        return f"TorrentRow({self.downloader}:{self.hash} {self.name!r} {self.state})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        将视图转换为字典
+        :return: 包含所有列的字典
+        """
+        return {column: values[self._index] for column, values in self._store.columns.items()}
+
+
+class TorrentStore:
+    def __init__(self):
+        """
+        跨下载器的种子快照，(downloader, hash) 唯一
+        """
+        self.columns: Dict[str, Any] = {column: [] for column in STRING_COLUMNS}
+        self.columns.update({column: array(code) for column, code in NUMERIC_COLUMNS.items()})
+        self._index: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def upsert(self, downloader: str, record: Dict[str, Any]) -> int:
+        """
+        插入或更新一个种子
+        :param downloader: 下载器名称
+        :param record: from_qbittorrent 等函数返回的统一记录
+        :return: 行号
+        """
+        key = (_intern(downloader), (record.get("hash") or "").lower())
+        values = {
+            "downloader": key[0],
+            "hash": key[1],
+            "name": record.get("name") or "",
+            "state": _intern(record.get("state") or UNKNOWN),
+            "category": _intern(record.get("category")),
+        }
+        for column, code in NUMERIC_COLUMNS.items():
+            values[column] = float(record.get(column) or 0) if code == "d" else int(record.get(column) or 0)
+
+        with self._lock:
+            index = self._index.get(key)
+            if index is None:
+                index = len(self._index)
+                self._index[key] = index
+                for column, value in values.items():
+                    self.columns[column].append(value)
+            else:
+                for column, value in values.items():
+                    self.columns[column][index] = value
+            return index
+
+    def remove(self, downloader: str, torrent_hash: str) -> bool:
+        """
+        删除一个种子：用最后一行填补空位，不移动其他行
+        :param downloader: 下载器名称
+        :param torrent_hash: 种子 hash
+        :return: 是否存在并已删除
+        """
+        with self._lock:
+            index = self._index.pop((downloader, torrent_hash.lower()), None)
+            if index is None:
+                return False
+            last = len(self._index)
+            if index != last:
+                for values in self.columns.values():
+                    values[index] = values[last]
+                moved = (self.columns["downloader"][index], self.columns["hash"][index])
+                self._index[moved] = index
+            for values in self.columns.values():
+                values.pop()
+            return True
+
+    def replace(self, downloader: str, records: Iterable[Dict[str, Any]]) -> None:
+        """
+        用下载器的完整列表替换它在快照中的所有种子
+        :param downloader: 下载器名称
+        :param records: 统一记录
+        """
+        with self._lock:
+            seen = set()
+            for record in records:
+                self.upsert(downloader, record)
+                seen.add((record.get("hash") or "").lower())
+            stale = [key[1] for key in self._index if key[0] == downloader and key[1] not in seen]
+            for torrent_hash in stale:
+                self.remove(downloader, torrent_hash)
+
+    def select(self, **conditions) -> List[int]:
+        """
+        按列筛选，多个条件为且关系；值为元组时表示 (运算符, 值)，为集合时表示取值之一
+        例如 select(state="seeding", ratio=(">=", 2.0), downloader={"qbittorrent", "transmission"})
+        :return: 满足条件的行号列表
+        """
+        with self._lock:
+            mask = [True] * len(self._index)
+            for column, condition in conditions.items():
+                values = self.columns[column]
+                if isinstance(condition, tuple):
+                    op, target = _OPERATORS[condition[0]], condition[1]
+                    mask = [keep and op(value, target) for keep, value in zip(mask, values)]
+                elif isinstance(condition, (set, frozenset, list)):
+                    targets = set(condition)
+                    mask = [keep and value in targets for keep, value in zip(mask, values)]
+                else:
+                    # 驻留字符串可以直接比较身份，避免逐字符比较
+                    target = _intern(condition) if column in INTERNED_COLUMNS else condition
+                    mask = [keep and (value is target or value == target) for keep, value in zip(mask, values)]
+            return list(compress(range(len(mask)), mask))
+
+    def sort(self, column: str, indexes: Optional[List[int]] = None, reverse: bool = False,
+             limit: Optional[int] = None) -> List[int]:
+        """
+        按列排序
+        :param column: 列名
+        :param indexes: 参与排序的行号，默认全部
+        :param reverse: 是否降序
+        :param limit: 只返回前 limit 个
+        :return: 排序后的行号
+        """
+        with self._lock:
+            values = self.columns[column]
+            indexes = range(len(self._index)) if indexes is None else indexes
+            ordered = sorted(indexes, key=values.__getitem__, reverse=reverse)
+        return ordered[:limit] if limit is not None else ordered
+
+    def sum(self, column: str, indexes: Optional[List[int]] = None) -> float:
+        """
+        对数值列求和
+        :param column: 列名
+        :param indexes: 参与汇总的行号，默认全部
+        """
+        with self._lock:
+            values = self.columns[column]
+            if indexes is None:
+                return sum(values)
+            return sum(map(values.__getitem__, indexes))
+
+    def group_by(self, key: str, column: Optional[str] = None,
+                 indexes: Optional[List[int]] = None) -> Dict[str, float]:
+        """
+        分组汇总
+        :param key: 分组列，如 state、downloader、category
+        :param column: 求和的数值列，为空时统计数量
+        :param indexes: 参与汇总的行号，默认全部
+        :return: 分组值 -> 数量或合计
+        """
+        result: Dict[str, float] = defaultdict(int)
+        with self._lock:
+            keys = self.columns[key]
+            values = self.columns[column] if column else None
+            for index in range(len(self._index)) if indexes is None else indexes:
+                result[keys[index]] += values[index] if values is not None else 1
+        return dict(result)
+
+    def rows(self, indexes: Optional[Iterable[int]] = None) -> List[TorrentRow]:
+        """
+        获取行视图
+        :param indexes: 行号，默认全部
+        :return: TorrentRow 列表
+        """
+        indexes = range(len(self._index)) if indexes is None else indexes
+        return [TorrentRow(self, index) for index in indexes]
+
+    def get(self, downloader: str, torrent_hash: str) -> Optional[TorrentRow]:
+        """
+        按下载器和 hash 获取一行
+        :return: 行视图，不存在时返回 None
+        """
+        index = self._index.get((downloader, torrent_hash.lower()))
+        return TorrentRow(self, index) if index is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        汇总统计，供状态报告使用
+        :return: 总数、总大小、总速率以及按下载器和状态的数量
+        """
+        with self._lock:
+            return {
+                "count": len(self),
+                "size": self.sum("size"),
+                "dlspeed": self.sum("dlspeed"),
+                "upspeed": self.sum("upspeed"),
+                "by_downloader": self.group_by("downloader"),
+                "by_state": self.group_by("state"),
+            }
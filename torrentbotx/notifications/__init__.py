@@ -1,5 +1,11 @@
-from torrentbotx.notifications.notifier import Notifier
-from torrentbotx.notifications.telegram_notifier import TelegramNotifier
+from torrentbotx.notifications.notifier import NOTIFIERS, Notifier, get_notifier
 
 
-__all__ = ['Notifier', 'TelegramNotifier']
+def __getattr__(name):
+    # TelegramNotifier 会导入 python-telegram-bot，只在使用时加载
+    if name == "TelegramNotifier":
+        return NOTIFIERS["telegram"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ['NOTIFIERS', 'Notifier', 'TelegramNotifier', 'get_notifier']
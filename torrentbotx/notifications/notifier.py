@@ -1,7 +1,28 @@
 from abc import ABC, abstractmethod
 
+from torrentbotx.utils.plugins import LazyRegistry
+
+# 通知渠道在第一次创建时才导入（如 python-telegram-bot），
+# 第三方渠道可以通过 torrentbotx.notifiers entry point 提供
+NOTIFIERS = LazyRegistry("torrentbotx.notifiers", {
+    "telegram": "torrentbotx.notifications.telegram_notifier:TelegramNotifier",
+})
+
 
 class Notifier(ABC):
     @abstractmethod
     def send_message(self, message: str):
         pass
+
+
+def get_notifier(name: str, **kwargs) -> Notifier:
+    """
+    按名称创建通知渠道
+    :param name: 渠道名称，如 telegram
+    :param kwargs: 传给渠道构造函数的参数
+    :return: Notifier 实例
+    """
+    cls = NOTIFIERS.get(name)
+    if cls is None:
+        raise ValueError(f"未注册的通知渠道：{name}")
+    return cls(**kwargs)
@@ -1,25 +1,51 @@
-from torrentbotx.trackers.carpt import CarptTracker
-from torrentbotx.trackers.dicmusic import DicMusicTracker
-from torrentbotx.trackers.mteam import MTeamTracker
-from torrentbotx.trackers.ptskit import PTSKitTracker
-
-# Tracker 初始化
-TRACKERS = {
-    "mteam": MTeamTracker,
-    "dicmusic": DicMusicTracker,
-    "carpt": CarptTracker,
-    "ptskit": PTSKitTracker,
+"""
+站点（Tracker）模块
+
+包内的名称按需导入：只使用注册表时不会加载站点模块、requests 和 httpx。
+"""
+
+import importlib
+
+_EXPORTS = {
+    "TRACKERS": "torrentbotx.trackers.registry",
+    "AdaptiveRateLimiter": "torrentbotx.trackers.ratelimit",
+    "BaseTracker": "torrentbotx.trackers.common",
+    "CarptTracker": "torrentbotx.trackers.carpt",
+    "CircuitBreaker": "torrentbotx.trackers.breaker",
+    "CircuitOpenError": "torrentbotx.trackers.breaker",
+    "DEFAULT_SEARCH_CACHE": "torrentbotx.trackers.cache",
+    "DicMusicTracker": "torrentbotx.trackers.dicmusic",
+    "MTeamTracker": "torrentbotx.trackers.mteam",
+    "MergedTorrent": "torrentbotx.trackers.merge",
+    "PTSKitTracker": "torrentbotx.trackers.ptskit",
+    "SearchAllResult": "torrentbotx.trackers.search",
+    "SearchCache": "torrentbotx.trackers.cache",
+    "SearchPageError": "torrentbotx.trackers.common",
+    "TrackerTransport": "torrentbotx.trackers.transport",
+    "async_search_all": "torrentbotx.trackers.search",
+    "get_configured_trackers": "torrentbotx.trackers.registry",
+    "get_default_transport": "torrentbotx.trackers.transport",
+    "get_tracker_by_name": "torrentbotx.trackers.registry",
+    "get_tracker_status": "torrentbotx.trackers.registry",
+    "merge_results": "torrentbotx.trackers.merge",
+    "normalize_site_name": "torrentbotx.trackers.registry",
+    "reset_trackers": "torrentbotx.trackers.registry",
+    "search_all": "torrentbotx.trackers.search",
 }
 
 
-def get_tracker_by_name(name: str):
-    """
-    根据站点名称获取对应的 Tracker 类。
-    :param name: 站点名称，如 "mteam"、"dicmusic" 等。
-    :return: 对应的 Tracker 类实例
-    """
-    tracker_class = TRACKERS.get(name.lower())
-    if tracker_class:
-        return tracker_class()
-    else:
-        raise ValueError(f"不支持的 Tracker : {name}")
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    # 缓存到包命名空间，之后的访问不再经过 __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
+
+
+__all__ = sorted(_EXPORTS)
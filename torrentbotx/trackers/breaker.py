@@ -0,0 +1,122 @@
+"""
+站点熔断器
+
+站点宕机时，每次调用都要等满超时才会失败，机器人和定时任务会被这些请求堵住。
+连续失败达到阈值后熔断器打开，后续请求立即失败；冷却时间过后进入半开状态，
+只放行一个探测请求，由它决定恢复（关闭）还是继续熔断（打开）。
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """熔断器打开时立即抛出，不发送请求"""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} 暂不可用（熔断中，{retry_in:.0f}s 后重试）")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    def __init__(self, name: str = "", failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        """
+        熔断器
+        :param name: 名称，用于日志和错误信息
+        :param failure_threshold: 连续失败多少次后打开
+        :param recovery_timeout: 打开后多久（秒）允许一个探测请求
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.last_error: Optional[str] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        判断是否放行一个请求；半开状态下只有一个调用方会得到 True
+        :return: 是否放行
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.recovery_timeout:
+                    return False
+                self.state = HALF_OPEN
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def before_call(self) -> None:
+        """
+        请求前调用，熔断中时立即抛出 CircuitOpenError
+        """
+        if not self.allow():
+            raise CircuitOpenError(self.name, self.retry_in)
+
+    def record_success(self) -> None:
+        """请求成功，关闭熔断器并清零失败计数"""
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.last_error = None
+            self._probing = False
+
+    def record_failure(self, error: Optional[str] = None) -> None:
+        """
+        请求失败，达到阈值或探测失败时打开熔断器
+        :param error: 失败原因
+        """
+        with self._lock:
+            self.failures += 1
+            self.last_error = error
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+    def abort(self) -> None:
+        """请求被取消，未得出结论，允许其他调用方重新探测"""
+        with self._lock:
+            self._probing = False
+
+    @property
+    def retry_in(self) -> float:
+        """距离允许探测还需等待的秒数"""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.recovery_timeout - (time.monotonic() - self.opened_at))
+
+    @property
+    def available(self) -> bool:
+        """站点当前是否可能可用（关闭，或冷却时间已过可以探测）"""
+        return self.state == CLOSED or (self.state == OPEN and self.retry_in == 0) or (
+            self.state == HALF_OPEN and not self._probing)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """
+        熔断器状态
+        :return: 当前状态、连续失败次数、距离探测的秒数及最近一次失败原因
+        """
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_in": round(self.retry_in, 1),
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,240 @@
+"""
+站点搜索结果缓存
+
+按 (站点, 规范化关键词, 页码, 每页数量) 缓存 search_torrents 的结果：
+容量受限的 LRU、按站点配置的 TTL，过期但仍在 stale 窗口内的条目会先返回旧值，
+同时在后台线程中刷新。
+"""
+
+import functools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from torrentbotx.utils.logger import get_logger
+from torrentbotx.utils.string_utils import normalize_whitespace
+
+logger = get_logger("trackers.cache")
+
+FRESH = "fresh"
+STALE = "stale"
+
+
+class TTLCache:
+    def __init__(self, max_entries: int = 256, ttl: float = 60.0, stale_ttl: float = 0.0):
+        """
+        线程安全的 LRU + TTL 缓存
+        :param max_entries: 最大条目数，超过时淘汰最久未使用的条目
+        :param ttl: 默认新鲜期（秒）
+        :param stale_ttl: 新鲜期结束后仍可返回旧值的时长（秒）
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: "OrderedDict[Hashable, list]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, key: Hashable) -> Tuple[Any, Optional[str]]:
+        """
+        查询缓存并更新命中统计
+        :param key: 缓存键
+        :return: (值, 状态)，状态为 FRESH、STALE 或 None（未命中）
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, fresh_until, stale_until = entry
+                if now < fresh_until:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value, FRESH
+                if now < stale_until:
+                    self._entries.move_to_end(key)
+                    self.stale_hits += 1
+                    return value, STALE
+                del self._entries[key]
+            self.misses += 1
+            return None, None
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        获取新鲜的缓存值
+        :param key: 缓存键
+        :param default: 未命中或已过期时返回的默认值
+        :return: 缓存值
+        """
+        value, state = self.lookup(key)
+        return value if state == FRESH else default
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        写入缓存
+        :param key: 缓存键
+        :param value: 缓存值
+        :param ttl: 本条目的新鲜期，为空时使用默认值
+        """
+        if self.max_entries <= 0:
+            return
+        fresh_until = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = [value, fresh_until, fresh_until + self.stale_ttl]
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """删除指定缓存条目"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """清空缓存（不重置统计）"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        缓存统计信息
+        :return: 命中、旧值命中、未命中、淘汰次数及当前条目数
+        """
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+        }
+
+
+class SearchCache(TTLCache):
+    def __init__(self, max_entries: int = 256, ttl: float = 60.0, stale_ttl: float = 300.0,
+                 site_ttls: Optional[Dict[str, float]] = None, refresh_workers: int = 2):
+        """
+        搜索结果缓存，支持按站点设置 TTL 与后台刷新旧值
+        :param max_entries: 最大条目数
+        :param ttl: 默认新鲜期（秒）
+        :param stale_ttl: 过期后仍可返回旧值的时长（秒）
+        :param site_ttls: 站点 -> 新鲜期，覆盖默认值
+        :param refresh_workers: 后台刷新线程数
+        """
+        super().__init__(max_entries=max_entries, ttl=ttl, stale_ttl=stale_ttl)
+        self.site_ttls: Dict[str, float] = dict(site_ttls or {})
+        self.refresh_workers = refresh_workers
+        self.refreshes = 0
+        self._refreshing = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @staticmethod
+    def make_key(site: str, keyword: str, page: int, page_size: int) -> Tuple[str, str, int, int]:
+        """
+        生成缓存键，关键词忽略大小写与多余空白
+        :return: (站点, 规范化关键词, 页码, 每页数量)
+        """
+        return site, normalize_whitespace(keyword).casefold(), page, page_size
+
+    def configure(self, max_entries: Optional[int] = None, ttl: Optional[float] = None,
+                  stale_ttl: Optional[float] = None) -> None:
+        """
+        调整缓存参数，未传入的参数保持不变
+        """
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if ttl is not None:
+            self.ttl = ttl
+        if stale_ttl is not None:
+            self.stale_ttl = stale_ttl
+
+    def set_site_ttl(self, site: str, ttl: float) -> None:
+        """
+        设置站点的新鲜期
+        :param site: 站点标识
+        :param ttl: 新鲜期（秒）
+        """
+        self.site_ttls[site] = ttl
+
+    def get_or_load(self, key: Tuple[str, str, int, int], loader: Callable[[], Any]) -> Any:
+        """
+        读取缓存，未命中时同步加载；命中旧值时立即返回并在后台刷新
+        :param key: make_key 生成的缓存键
+        :param loader: 加载函数，返回 None 表示失败，不写入缓存
+        :return: 搜索结果
+        """
+        value, state = self.lookup(key)
+        if state == STALE:
+            self.refresh_in_background(key, loader)
+        if state is not None:
+            return value
+        return self.load(key, loader)
+
+    def load(self, key: Tuple[str, str, int, int], loader: Callable[[], Any]) -> Any:
+        """
+        调用加载函数并写入缓存
+        :return: 加载结果
+        """
+        value = loader()
+        if value is not None:
+            self.put(key, value, ttl=self.site_ttls.get(key[0]))
+        return value
+
+    def refresh_in_background(self, key: Tuple[str, str, int, int], loader: Callable[[], Any]) -> None:
+        """
+        在后台线程刷新缓存条目，同一个键同时只会有一个刷新任务
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.refresh_workers,
+                                                    thread_name_prefix="search-cache")
+            self.refreshes += 1
+        self._executor.submit(self._refresh, key, loader)
+
+    def _refresh(self, key, loader) -> None:
+        try:
+            self.load(key, loader)
+        except Exception as e:
+            logger.error(f"后台刷新搜索缓存失败 {key}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        stats = super().stats
+        stats["refreshes"] = self.refreshes
+        return stats
+
+
+# 进程内共享的搜索缓存，所有 Tracker 默认使用
+DEFAULT_SEARCH_CACHE = SearchCache()
+
+
+def cached_search(func):
+    """
+    search_torrents 的缓存装饰器，使用实例的 search_cache 属性，为 None 时不缓存。
+    原始函数保存在 uncached 属性上，供需要绕过缓存的调用方使用。
+    """
+
+    @functools.wraps(func)
+    def wrapper(self, keyword: str, page: int = 1, page_size: int = 5):
+        cache = self.search_cache
+        if cache is None:
+            return func(self, keyword, page, page_size)
+        key = cache.make_key(self.site, keyword, page, page_size)
+        return cache.get_or_load(key, functools.partial(func, self, keyword, page, page_size))
+
+    wrapper.uncached = func
+    return wrapper
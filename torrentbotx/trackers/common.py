@@ -1,11 +1,250 @@
 # trackers/common.py
 
-from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, Optional
+from urllib.parse import urlparse
 
+import httpx
+import requests
 
-class BaseTracker(ABC):
-    @abstractmethod
+from torrentbotx.trackers.breaker import CircuitBreaker, CircuitOpenError
+from torrentbotx.trackers.cache import DEFAULT_SEARCH_CACHE, STALE, SearchCache, TTLCache, cached_search
+from torrentbotx.trackers.ratelimit import THROTTLE_STATUS, AdaptiveRateLimiter, parse_retry_after
+from torrentbotx.trackers.singleflight import SingleFlight
+from torrentbotx.trackers.transport import TrackerTransport, get_default_transport
+from torrentbotx.utils.logger import get_logger
+
+logger = get_logger("trackers.common")
+
+
+class SearchPageError(RuntimeError):
+    """翻页扫描中某一页请求失败，与扫描到最后一页区分开"""
+
+    def __init__(self, site: str, page: int):
+        super().__init__(f"{site} 搜索第 {page} 页失败")
+        self.site = site
+        self.page = page
+
+
+class FeedPage:
+    def __init__(self, items: list, etag: Optional[str] = None, last_modified: Optional[str] = None,
+                 not_modified: bool = False):
+        """
+        最新种子列表的一页
+        :param items: 种子列表
+        :param etag: 响应的 ETag
+        :param last_modified: 响应的 Last-Modified
+        :param not_modified: 站点返回 304，内容未变化
+        """
+        self.items = items
+        self.etag = etag
+        self.last_modified = last_modified
+        self.not_modified = not_modified
+
+
+class BaseTracker:
+    """
+    站点适配器基类，实现 M-Team 风格 API 的请求、限流、缓存与解析。
+    子类只需声明站点标识、默认地址和接口路径，响应格式不同时覆盖 parse_response。
+    """
+
+    # 站点标识（与 TRACKERS 中的键一致）及日志中展示的名称，由子类覆盖
+    site: str = ""
+    display_name: str = ""
+    default_base_url: str = ""
+    # 接口路径
+    search_path: str = "/api/torrent/search"
+    detail_path: str = "/api/torrent/detail"
+    download_path: str = "/api/torrent/genDlToken"
+    # 最新种子列表使用的排序参数（按发布时间倒序）
+    latest_sort: Dict[str, str] = {"sortField": "CREATED_DATE", "sortDirection": "DESC"}
+    # 搜索结果缓存，设为 None 可关闭缓存
+    search_cache: Optional[SearchCache] = DEFAULT_SEARCH_CACHE
+    # 种子详情短期缓存的新鲜期（秒）与容量，批量获取详情的默认并发数
+    details_cache_ttl: float = 30
+    details_cache_size: int = 1024
+    details_max_workers: int = 8
+    # 详情接口限流器的默认速率（次/秒）与突发容量，一次批量获取 50 个详情不会被搜索的限流拖慢
+    details_rate_limit: float = 10.0
+    details_burst: int = 50
+    # 本地全文索引（LocalIndex），为 None 时不写入索引，由注册表按配置设置
+    local_index = None
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 rate_limiter: Optional[AdaptiveRateLimiter] = None,
+                 transport: Optional[TrackerTransport] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 details_limiter: Optional[AdaptiveRateLimiter] = None):
+        """
+        :param api_key: 站点 API Key
+        :param base_url: 站点 API 地址，为空时使用 default_base_url
+        :param rate_limiter: 限流器，为空时使用默认参数创建，由该实例的所有调用方共享
+        :param transport: HTTP 传输层，为空时使用进程内共享的连接池
+        :param circuit_breaker: 熔断器，为空时使用默认参数创建
+        :param details_limiter: 详情接口的限流器，突发容量更大，批量获取详情时不必按搜索的速率逐个排队；
+                                为空时使用默认参数创建
+        """
+        self.api_key = api_key
+        self.base_url = (base_url or self.default_base_url).rstrip("/")
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter()
+        self.details_limiter = details_limiter or AdaptiveRateLimiter(
+            rate=self.details_rate_limit, burst=self.details_burst, max_concurrency=self.details_max_workers)
+        self.transport = transport or get_default_transport()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(self.display_name or self.site)
+        self.details_cache = TTLCache(max_entries=self.details_cache_size, ttl=self.details_cache_ttl)
+        self._details_flight = SingleFlight()
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """站点请求头（API Key 按请求携带，连接池由所有站点共享）"""
+        return {"x-api-key": self.api_key} if self.api_key else {}
+
+    def build_search_payload(self, keyword: str, page: int, page_size: int) -> Dict[str, Any]:
+        """
+        构造搜索请求体
+        :return: 请求 JSON
+        """
+        return {
+            "keyword": keyword,
+            "pageNumber": page,
+            "pageSize": page_size,
+        }
+
+    def parse_response(self, data: Dict[str, Any], action: str, require_data: bool = False) -> Optional[Any]:
+        """
+        解析站点响应，失败时记录日志并返回 None
+        :param data: 响应 JSON
+        :param action: 操作名称，用于日志
+        :param require_data: data 字段为空时是否视为失败
+        :return: 响应中的 data 字段
+        """
+        if data.get("message", "").upper() != 'SUCCESS' or "data" not in data or (require_data and not data["data"]):
+            default = '无Token' if require_data else '未知错误'
+            logger.warning(f"{self.display_name} {action}失败: {data.get('message', default)}")
+            return None
+        return data["data"]
+
+    def _post(self, url: str, headers: Optional[Dict[str, str]] = None,
+              limiter: Optional[AdaptiveRateLimiter] = None, **kwargs) -> requests.Response:
+        """
+        经过熔断器和限流器发送 POST 请求，见 _send
+        """
+        return self._send("POST", url, headers, limiter, **kwargs)
+
+    def _send(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+              limiter: Optional[AdaptiveRateLimiter] = None, **kwargs) -> requests.Response:
+        """
+        经过熔断器和限流器发送请求，遇到 429/503 时按 Retry-After 等待后重试
+        :param method: 请求方法，"POST" 或 "GET"
+        :param url: 请求地址
+        :param headers: 额外的请求头
+        :param limiter: 使用的限流器，为空时使用站点的 rate_limiter
+        :param kwargs: 传给 requests 的其他参数
+        :return: 响应对象，调用方自行检查状态码
+        :raises CircuitOpenError: 站点熔断中
+        """
+        limiter = limiter or self.rate_limiter
+        for attempt in range(limiter.max_retries + 1):
+            self.circuit_breaker.before_call()
+            acquired = False
+            try:
+                # 在 try 内等待限流，等待期间被中断时也要归还熔断器的半开探测名额
+                limiter.acquire()
+                acquired = True
+                send = self.transport.post if method == "POST" else self.transport.get
+                response = send(url, headers={**self.headers, **(headers or {})}, **kwargs)
+            except requests.exceptions.RequestException as e:
+                limiter.release()
+                self.circuit_breaker.record_failure(str(e))
+                raise
+            except BaseException:
+                if acquired:
+                    limiter.release()
+                self.circuit_breaker.abort()
+                raise
+            limiter.release(response.status_code, parse_retry_after(response.headers.get("Retry-After")))
+            self._record_status(response.status_code)
+            if response.status_code not in THROTTLE_STATUS:
+                break
+            logger.warning(f"{self.display_name} 返回 {response.status_code}，"
+                           f"{limiter.retry_delay:.1f}s 后重试（第 {attempt + 1} 次）")
+        return response
+
+    async def _async_post(self, client: httpx.AsyncClient, url: str, headers: Optional[Dict[str, str]] = None,
+                          **kwargs) -> httpx.Response:
+        """
+        _post 的异步版本，使用同一个熔断器和限流器
+        :param client: httpx 异步客户端
+        :param url: 请求地址
+        :param headers: 额外的请求头
+        :param kwargs: 传给 httpx 的其他参数
+        :return: 响应对象
+        :raises CircuitOpenError: 站点熔断中
+        """
+        limiter = self.rate_limiter
+        for attempt in range(limiter.max_retries + 1):
+            self.circuit_breaker.before_call()
+            acquired = False
+            try:
+                # 在 try 内等待限流：等待期间被取消时同样归还半开探测名额，否则熔断器会一直拒绝请求
+                await limiter.async_acquire()
+                acquired = True
+                response = await client.post(url, headers={**self.headers, **(headers or {})}, **kwargs)
+            except httpx.HTTPError as e:
+                limiter.release()
+                self.circuit_breaker.record_failure(str(e))
+                raise
+            except BaseException:
+                # 被取消（例如超过多站点搜索的截止时间）不代表站点故障
+                if acquired:
+                    limiter.release()
+                self.circuit_breaker.abort()
+                raise
+            limiter.release(response.status_code, parse_retry_after(response.headers.get("Retry-After")))
+            self._record_status(response.status_code)
+            if response.status_code not in THROTTLE_STATUS:
+                break
+            logger.warning(f"{self.display_name} 返回 {response.status_code}，"
+                           f"{limiter.retry_delay:.1f}s 后重试（第 {attempt + 1} 次）")
+        return response
+
+    def _record_status(self, status_code: int) -> None:
+        """根据响应状态码更新熔断器，5xx 视为站点故障"""
+        if status_code >= 500:
+            self.circuit_breaker.record_failure(f"HTTP {status_code}")
+        else:
+            self.circuit_breaker.record_success()
+
+    @property
+    def available(self) -> bool:
+        """站点当前是否可用（未熔断），不发送请求"""
+        return self.circuit_breaker.available
+
+    def _request(self, path: str, action: str, require_data: bool = False, **kwargs) -> Optional[Any]:
+        """
+        请求站点接口并解析响应，网络或解析错误时记录日志并返回 None
+        :param path: 接口路径
+        :param action: 操作名称，用于日志
+        :param require_data: data 字段为空时是否视为失败
+        :param kwargs: 传给 _post 的其他参数（包括可选的 limiter）
+        :return: 响应中的 data 字段
+        """
+        try:
+            response = self._post(f"{self.base_url}{path}", **kwargs)
+            response.raise_for_status()
+            return self.parse_response(response.json(), action, require_data)
+        except CircuitOpenError as e:
+            logger.warning(f"{self.display_name} {action}失败: {e}")
+            return None
+        except requests.exceptions.RequestException as e:
+            logger.error(f"请求 {self.display_name} {action}时出错: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"解析 {self.display_name} {action}响应时出错: {e}")
+            return None
+
+    @cached_search
     def search_torrents(self, keyword: str, page: int = 1, page_size: int = 5) -> Optional[Dict[str, Any]]:
         """
         搜索种子
@@ -14,22 +253,277 @@ class BaseTracker(ABC):
         :param page_size: 每页的种子数量
         :return: 搜索结果字典
         """
-        pass
+        result = self._request(self.search_path, "搜索种子", json=self.build_search_payload(keyword, page, page_size))
+        if result is not None:
+            self._index_items(result.get("data") or [])
+        return result
 
-    @abstractmethod
     def get_torrent_details(self, torrent_id: str) -> Optional[Dict[str, Any]]:
         """
         获取种子的详细信息
         :param torrent_id: 种子ID
         :return: 种子详细信息
         """
-        pass
+        result = self._request(self.detail_path, "获取种子详情", limiter=self.details_limiter, data={"id": torrent_id})
+        if result is not None:
+            self._index_items([result])
+        return result
+
+    def _index_items(self, items: list) -> None:
+        """将经过本实例的种子写入本地全文索引"""
+        if self.local_index is not None and items:
+            self.local_index.add(self.site, items)
 
-    @abstractmethod
     def get_download_link(self, torrent_id: str) -> Optional[str]:
         """
         获取种子的下载链接
         :param torrent_id: 种子ID
         :return: 下载链接
         """
-        pass
+        return self._request(self.download_path, "获取下载链接", require_data=True, data={"id": torrent_id})
+
+    def download_torrent(self, torrent_id: str) -> Optional[bytes]:
+        """
+        获取下载链接并下载种子文件，只下载一次，由调用方把内容交给各个下载器
+        :param torrent_id: 种子ID
+        :return: 种子文件内容，失败时返回 None
+        """
+        link = self.get_download_link(torrent_id)
+        if not link:
+            return None
+        try:
+            if urlparse(link).hostname == urlparse(self.base_url).hostname:
+                response = self._send("GET", link)
+            else:
+                # 站点返回的可能是 CDN 等其他主机的签名链接：不携带站点的 API Key，
+                # 也不计入站点的限流器和熔断器，CDN 故障不会熔断站点接口
+                response = self.transport.get(link)
+            response.raise_for_status()
+            return response.content
+        except requests.exceptions.RequestException as e:
+            logger.error(f"下载 {self.display_name} 种子文件 {torrent_id} 时出错: {e}")
+            return None
+
+    def fetch_latest(self, page: int = 1, page_size: int = 50, etag: Optional[str] = None,
+                     last_modified: Optional[str] = None) -> Optional["FeedPage"]:
+        """
+        获取最新发布的种子列表，携带 ETag/Last-Modified 发送条件请求
+        :param page: 页码
+        :param page_size: 每页的种子数量
+        :param etag: 上次响应的 ETag
+        :param last_modified: 上次响应的 Last-Modified
+        :return: FeedPage 实例，请求失败时返回 None
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        payload = {**self.build_search_payload("", page, page_size), **self.latest_sort}
+        try:
+            response = self._post(f"{self.base_url}{self.search_path}", headers=headers, json=payload)
+            if response.status_code == 304:
+                return FeedPage([], etag, last_modified, not_modified=True)
+            response.raise_for_status()
+            data = self.parse_response(response.json(), "获取最新种子")
+        except CircuitOpenError as e:
+            logger.warning(f"{self.display_name} 获取最新种子失败: {e}")
+            return None
+        except requests.exceptions.RequestException as e:
+            logger.error(f"请求 {self.display_name} 获取最新种子时出错: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"解析 {self.display_name} 获取最新种子响应时出错: {e}")
+            return None
+        if data is None:
+            return None
+        return FeedPage((data or {}).get("data") or [], response.headers.get("ETag"),
+                        response.headers.get("Last-Modified"))
+
+    def get_torrent_details_cached(self, torrent_id: str) -> Optional[Dict[str, Any]]:
+        """
+        获取种子详情，优先读取短期缓存；同一 ID 的并发请求会合并为一次
+        :param torrent_id: 种子ID
+        :return: 种子详细信息
+        """
+        torrent_id = str(torrent_id)
+        details = self.details_cache.get(torrent_id)
+        if details is not None:
+            return details
+
+        def load():
+            result = self.get_torrent_details(torrent_id)
+            if result is not None:
+                self.details_cache.put(torrent_id, result)
+            return result
+
+        return self._details_flight.do(torrent_id, load)
+
+    def get_torrent_details_many(self, torrent_ids: Iterable[str],
+                                 max_workers: Optional[int] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        批量获取种子详情：去重、读取缓存，其余 ID 以有限并发同时请求。
+        详情请求经过 details_limiter 而不是搜索使用的 rate_limiter：默认突发 50 次，
+        50 个未缓存的 ID 只受并发数约束，约为 50 / details_max_workers 次往返
+        :param torrent_ids: 种子ID列表
+        :param max_workers: 最大并发数，为空时使用 details_max_workers
+        :return: 种子ID -> 种子详细信息（失败为 None），顺序与输入一致
+        """
+        ids = list(dict.fromkeys(str(torrent_id) for torrent_id in torrent_ids))
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        missing = []
+        for torrent_id in ids:
+            details = self.details_cache.get(torrent_id)
+            if details is None:
+                missing.append(torrent_id)
+            results[torrent_id] = details
+
+        if missing:
+            workers = min(max_workers or self.details_max_workers, len(missing))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{self.site}-details") as executor:
+                for torrent_id, details in zip(missing, executor.map(self.get_torrent_details_cached, missing)):
+                    results[torrent_id] = details
+        return results
+
+    @staticmethod
+    def _is_last_page(data: Optional[Dict[str, Any]], items: list, page: int, page_size: int) -> bool:
+        """根据搜索结果判断是否已经是最后一页"""
+        if not items or len(items) < page_size:
+            return True
+        try:
+            total_pages = int(data.get("totalPages") or 0)
+        except (TypeError, ValueError):
+            total_pages = 0
+        return 0 < total_pages <= page
+
+    def iter_search(self, keyword: str, max_results: Optional[int] = None, page_size: int = 50,
+                    start_page: int = 1) -> Iterator[Dict[str, Any]]:
+        """
+        逐条产出搜索结果，处理当前页的同时在后台预取下一页。
+        扫描大量页面时绕过搜索缓存，避免挤掉用户的常用搜索。
+        :param keyword: 搜索关键词
+        :param max_results: 最多产出的种子数量，为空时扫描到最后一页
+        :param page_size: 每页的种子数量
+        :param start_page: 起始页码
+        :return: 种子字典迭代器，调用方提前 break 时停止翻页
+        :raises SearchPageError: 某一页请求失败（已产出之前各页的结果）
+        """
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{self.site}-prefetch")
+        page = start_page
+        yielded = 0
+        future = executor.submit(self.search_torrents_uncached, keyword, page, page_size)
+        try:
+            while future is not None:
+                data = future.result()
+                if data is None:
+                    # 请求失败不能当作空页处理，否则扫描会被静默截断
+                    raise SearchPageError(self.site, page)
+                items = data.get("data") or []
+                done = self._is_last_page(data, items, page, page_size) or (
+                    max_results is not None and yielded + len(items) >= max_results)
+                page += 1
+                future = None if done else executor.submit(self.search_torrents_uncached, keyword, page, page_size)
+                for item in items:
+                    if max_results is not None and yielded >= max_results:
+                        return
+                    yield item
+                    yielded += 1
+        finally:
+            if future is not None:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    async def aiter_search(self, keyword: str, max_results: Optional[int] = None, page_size: int = 50,
+                           start_page: int = 1,
+                           client: Optional[httpx.AsyncClient] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        iter_search 的异步版本，下一页的请求与当前页的处理并发进行
+        :param keyword: 搜索关键词
+        :param max_results: 最多产出的种子数量，为空时扫描到最后一页
+        :param page_size: 每页的种子数量
+        :param start_page: 起始页码
+        :param client: httpx 异步客户端，为空时使用传输层为当前事件循环共享的客户端
+        :return: 种子字典异步迭代器
+        :raises SearchPageError: 某一页请求失败（已产出之前各页的结果）
+        """
+        client = client or self.transport.get_async_client()
+
+        def fetch(page_number):
+            return asyncio.create_task(self.async_search_torrents(
+                keyword, page_number, page_size, client=client, use_cache=False))
+
+        page = start_page
+        yielded = 0
+        task = fetch(page)
+        try:
+            while task is not None:
+                data = await task
+                if data is None:
+                    raise SearchPageError(self.site, page)
+                items = data.get("data") or []
+                done = self._is_last_page(data, items, page, page_size) or (
+                    max_results is not None and yielded + len(items) >= max_results)
+                page += 1
+                task = None if done else fetch(page)
+                for item in items:
+                    if max_results is not None and yielded >= max_results:
+                        return
+                    yield item
+                    yielded += 1
+        finally:
+            if task is not None:
+                task.cancel()
+
+    def search_torrents_uncached(self, keyword: str, page: int = 1, page_size: int = 5) -> Optional[Dict[str, Any]]:
+        """
+        绕过搜索缓存直接请求站点
+        :param keyword: 搜索关键词
+        :param page: 页码
+        :param page_size: 每页的种子数量
+        :return: 搜索结果字典
+        """
+        search = type(self).search_torrents
+        return getattr(search, "uncached", search)(self, keyword, page, page_size)
+
+    async def async_search_torrents(self, keyword: str, page: int = 1, page_size: int = 5,
+                                    client: Optional[httpx.AsyncClient] = None,
+                                    use_cache: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        异步搜索种子，供多站点并发搜索使用
+        :param keyword: 搜索关键词
+        :param page: 页码
+        :param page_size: 每页的种子数量
+        :param client: httpx 异步客户端，为空时使用传输层为当前事件循环共享的客户端
+        :param use_cache: 是否读写搜索缓存
+        :return: 搜索结果字典
+        """
+        cache = self.search_cache if use_cache else None
+        if cache is not None:
+            key = cache.make_key(self.site, keyword, page, page_size)
+            value, state = cache.lookup(key)
+            if state == STALE:
+                cache.refresh_in_background(key, lambda: self.search_torrents_uncached(keyword, page, page_size))
+            if state is not None:
+                return value
+
+        client = client or self.transport.get_async_client()
+        url = f"{self.base_url}{self.search_path}"
+        try:
+            response = await self._async_post(client, url, json=self.build_search_payload(keyword, page, page_size))
+            response.raise_for_status()
+            result = self.parse_response(response.json(), "搜索种子")
+        except CircuitOpenError as e:
+            logger.warning(f"{self.display_name} 搜索种子失败: {e}")
+            return None
+        except httpx.HTTPError as e:
+            logger.error(f"请求 {self.display_name} 搜索种子时出错: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"解析 {self.display_name} 搜索种子响应时出错: {e}")
+            return None
+        if result is not None:
+            # SQLite 写入放到线程中执行，不阻塞事件循环
+            await asyncio.to_thread(self._index_items, result.get("data") or [])
+            if cache is not None:
+                cache.put(key, result, ttl=cache.site_ttls.get(self.site))
+        return result
@@ -0,0 +1,87 @@
+"""
+站点最新种子增量轮询
+
+每个 (站点, 订阅) 在数据库中保存高水位标记（已见过的最大种子 ID/时间）以及上次响应的
+ETag/Last-Modified，轮询时发送条件请求，只产出真正新增的种子。
+"""
+
+from typing import Any, Dict, List, Optional
+
+from torrentbotx.db.operations import get_feed_state, save_feed_state
+from torrentbotx.trackers.common import BaseTracker
+from torrentbotx.utils.logger import get_logger
+
+logger = get_logger("trackers.feed")
+
+
+def torrent_sort_id(item: Dict[str, Any]) -> int:
+    """
+    获取种子的数字 ID，用于与高水位标记比较
+    :param item: 种子字典
+    :return: 数字 ID，无法解析时为 0
+    """
+    try:
+        return int(item.get("id") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class FeedPoller:
+    def __init__(self, tracker: BaseTracker, feed_key: str = "latest", page_size: int = 50,
+                 max_pages: int = 5, emit_initial: bool = False):
+        """
+        站点最新种子轮询器
+        :param tracker: Tracker 实例
+        :param feed_key: 订阅标识，同一站点的不同订阅分别保存高水位标记
+        :param page_size: 每页的种子数量
+        :param max_pages: 单次轮询最多追赶的页数
+        :param emit_initial: 首次轮询（尚无高水位标记）时是否产出当前所有种子
+        """
+        self.tracker = tracker
+        self.feed_key = feed_key
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.emit_initial = emit_initial
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """
+        轮询一次，返回自上次轮询以来新增的种子（按 ID 升序）
+        :return: 新种子列表
+        """
+        site = self.tracker.site
+        state = get_feed_state(site, self.feed_key)
+        last_id: Optional[int] = state["last_id"] if state else None
+        etag = state["etag"] if state else None
+        last_modified = state["last_modified"] if state else None
+
+        first = self.tracker.fetch_latest(1, self.page_size, etag=etag, last_modified=last_modified)
+        if first is None:
+            return []
+        if first.not_modified:
+            logger.debug(f"{site}/{self.feed_key} 最新种子未变化")
+            return []
+
+        new_items = [item for item in first.items if last_id is None or torrent_sort_id(item) > last_id]
+        # 整页都是新种子时继续向后翻页，直到追上高水位标记
+        page = 1
+        page_items = first.items
+        while (last_id is not None and page < self.max_pages and len(page_items) >= self.page_size
+               and all(torrent_sort_id(item) > last_id for item in page_items)):
+            page += 1
+            next_page = self.tracker.fetch_latest(page, self.page_size)
+            if next_page is None:
+                break
+            page_items = next_page.items
+            new_items.extend(item for item in page_items if torrent_sort_id(item) > last_id)
+
+        high_water = max([torrent_sort_id(item) for item in first.items] + [last_id or 0])
+        newest = max(first.items, key=torrent_sort_id, default=None)
+        last_time = (newest or {}).get("createdDate") or (state["last_time"] if state else None)
+        save_feed_state(site, self.feed_key, high_water, last_time, first.etag, first.last_modified)
+
+        if last_id is None and not self.emit_initial:
+            logger.info(f"{site}/{self.feed_key} 首次轮询，记录高水位标记 {high_water}")
+            return []
+        # 翻页期间有新种子发布时页面会整体后移，按 ID 去重
+        unique = {torrent_sort_id(item): item for item in new_items}
+        return [unique[torrent_id] for torrent_id in sorted(unique)]
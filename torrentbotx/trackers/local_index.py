@@ -0,0 +1,129 @@
+"""
+站点种子本地全文索引
+
+经过 search_torrents / get_torrent_details 的种子都会写入 torrentbotx.db 中的 FTS5 索引，
+local_search 优先在本地毫秒级返回结果，未命中或需要最新数据时才请求站点；
+在事件循环中（如 Telegram 机器人）使用 async_local_search。
+"""
+
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from torrentbotx.db.operations import search_tracker_torrents, upsert_tracker_torrents
+from torrentbotx.trackers.common import BaseTracker
+from torrentbotx.trackers.search import DEFAULT_SEARCH_DEADLINE, SearchAllResult, async_search_all, search_all
+from torrentbotx.utils.logger import get_logger
+
+logger = get_logger("trackers.local_index")
+
+
+def _to_int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def to_index_row(site: str, item: Dict[str, Any]) -> Optional[Tuple]:
+    """
+    将站点返回的种子转换为索引行
+    :param site: 站点标识
+    :param item: 站点返回的种子字典
+    :return: (site, torrent_id, title, subtitle, size, category, seeders)，缺少 ID 时返回 None
+    """
+    torrent_id = item.get("id")
+    if torrent_id is None:
+        return None
+    status = item.get("status") if isinstance(item.get("status"), dict) else {}
+    seeders = item.get("seeders", status.get("seeders"))
+    return (
+        site,
+        str(torrent_id),
+        item.get("name") or item.get("title"),
+        item.get("smallDescr") or item.get("subtitle"),
+        _to_int(item.get("size")),
+        None if item.get("category") is None else str(item.get("category")),
+        _to_int(seeders),
+    )
+
+
+def _row_to_dict(row) -> Dict[str, Any]:
+    return {key: row[key] for key in row.keys()}
+
+
+class LocalIndex:
+    """种子元数据本地索引"""
+
+    def add(self, site: str, items: Iterable[Dict[str, Any]]) -> None:
+        """
+        写入（或更新）一批种子
+        :param site: 站点标识
+        :param items: 站点返回的种子字典
+        """
+        rows = [row for row in (to_index_row(site, item) for item in items) if row is not None]
+        if not rows:
+            return
+        try:
+            upsert_tracker_torrents(rows)
+        except Exception as e:
+            logger.error(f"写入本地种子索引失败: {e}")
+
+    def search(self, keyword: str, sites: Optional[Sequence[str]] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        在本地索引中搜索
+        :param keyword: 搜索关键词
+        :param sites: 限定的站点列表
+        :param limit: 最多返回的条数
+        :return: 种子字典列表
+        """
+        return [_row_to_dict(row) for row in search_tracker_torrents(keyword, sites=sites, limit=limit)]
+
+
+def local_search(keyword: str, limit: int = 20, fresh: bool = False,
+                 trackers: Optional[Sequence[BaseTracker]] = None,
+                 index: Optional[LocalIndex] = None,
+                 deadline: float = DEFAULT_SEARCH_DEADLINE) -> List[Dict[str, Any]]:
+    """
+    优先从本地索引搜索，本地无结果或要求最新数据时回退到并发搜索所有站点
+    :param keyword: 搜索关键词
+    :param limit: 最多返回的条数
+    :param fresh: 是否跳过本地索引直接请求站点
+    :param trackers: 参与远程搜索的 Tracker 列表，为空时使用配置中的全部站点
+    :param index: 本地索引，为空时使用默认实例
+    :param deadline: 远程搜索的截止时间（秒）
+    :return: 与本地索引字段一致的种子字典列表
+    """
+    index = index or LocalIndex()
+    sites = [tracker.site for tracker in trackers] if trackers else None
+    if not fresh:
+        results = index.search(keyword, sites=sites, limit=limit)
+        if results:
+            return results
+
+    remote = search_all(keyword, page_size=limit, deadline=deadline, trackers=trackers)
+    return _remote_results(remote, limit)
+
+
+async def async_local_search(keyword: str, limit: int = 20, fresh: bool = False,
+                             trackers: Optional[Sequence[BaseTracker]] = None,
+                             index: Optional[LocalIndex] = None,
+                             deadline: float = DEFAULT_SEARCH_DEADLINE) -> List[Dict[str, Any]]:
+    """
+    local_search 的异步版本，可以在运行中的事件循环内调用：本地查询在线程中执行，远程搜索使用 async_search_all
+    参数与返回值见 local_search
+    """
+    index = index or LocalIndex()
+    sites = [tracker.site for tracker in trackers] if trackers else None
+    if not fresh:
+        results = await asyncio.to_thread(index.search, keyword, sites=sites, limit=limit)
+        if results:
+            return results
+
+    remote = await async_search_all(keyword, page_size=limit, deadline=deadline, trackers=trackers)
+    return _remote_results(remote, limit)
+
+
+def _remote_results(remote: SearchAllResult, limit: int) -> List[Dict[str, Any]]:
+    rows = [to_index_row(item["site"], item) for item in remote.items]
+    keys = ("site", "torrent_id", "title", "subtitle", "size", "category", "seeders")
+    return [dict(zip(keys, row)) for row in rows if row is not None][:limit]
@@ -0,0 +1,145 @@
+"""
+跨站点重复种子识别与结果合并
+
+同一资源经常同时出现在多个站点。按 infohash（已知时）以及规范化标题 + 总大小生成指纹，
+通过哈希分组（而不是两两比较）把重复结果合并为一条，并列出所有提供该资源的站点，
+站点按促销和做种数排序。
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+_SEPARATORS = re.compile(r"[\W_]+", re.UNICODE)
+
+# 促销类型的优先级，数值越大越优先
+PROMOTION_RANK = {
+    "FREE": 3,
+    "_2X_FREE": 3,
+    "PERCENT_50": 2,
+    "_2X_PERCENT_50": 2,
+    "PERCENT_70": 1,
+    "PERCENT_30": 1,
+    "_2X": 1,
+}
+
+
+def normalize_title(title: Optional[str]) -> str:
+    """
+    规范化标题：忽略大小写，把 . _ - 空格等分隔符统一为单个空格
+    :param title: 原始标题
+    :return: 规范化后的标题
+    """
+    return _SEPARATORS.sub(" ", (title or "").casefold()).strip()
+
+
+def _status(item: Dict[str, Any]) -> Dict[str, Any]:
+    status = item.get("status")
+    return status if isinstance(status, dict) else {}
+
+
+def _infohash(item: Dict[str, Any]) -> Optional[str]:
+    value = item.get("infoHash") or item.get("info_hash") or item.get("infohash")
+    return value.lower() if isinstance(value, str) and value else None
+
+
+def _size(item: Dict[str, Any]) -> Optional[int]:
+    try:
+        return int(item.get("size"))
+    except (TypeError, ValueError):
+        return None
+
+
+def fingerprints(item: Dict[str, Any]) -> List[str]:
+    """
+    计算种子的指纹键，infohash 与 标题+大小 任意一个相同即视为同一资源
+    :param item: 站点返回的种子字典
+    :return: 指纹键列表
+    """
+    keys = []
+    infohash = _infohash(item)
+    if infohash:
+        keys.append(f"ih:{infohash}")
+    title = normalize_title(item.get("name") or item.get("title"))
+    size = _size(item)
+    if title and size:
+        keys.append(f"ts:{title}:{size}")
+    return keys
+
+
+def source_rank(item: Dict[str, Any]) -> tuple:
+    """
+    站点来源的排序键：先按促销，再按做种数
+    :param item: 站点返回的种子字典
+    :return: 排序键，越大越优先
+    """
+    status = _status(item)
+    promotion = PROMOTION_RANK.get(str(status.get("discount") or item.get("discount") or "").upper(), 0)
+    try:
+        seeders = int(item.get("seeders", status.get("seeders")) or 0)
+    except (TypeError, ValueError):
+        seeders = 0
+    return promotion, seeders
+
+
+class MergedTorrent:
+    __slots__ = ("sources",)
+
+    def __init__(self):
+        """合并后的资源，sources 为各站点返回的原始种子（带 site 字段）"""
+        self.sources: List[Dict[str, Any]] = []
+
+    @property
+    def best(self) -> Dict[str, Any]:
+        """促销和做种数最优的来源"""
+        return max(self.sources, key=source_rank)
+
+    @property
+    def sites(self) -> List[str]:
+        """提供该资源的站点，按来源优先级排序"""
+        return list(dict.fromkeys(item.get("site") for item in self.ranked_sources()))
+
+    def ranked_sources(self) -> List[Dict[str, Any]]:
+        """按促销和做种数排序的所有来源"""
+        return sorted(self.sources, key=source_rank, reverse=True)
+
+    def to_dict(self) -> dict:
+        """
+        转换为字典，以最优来源的字段为主，附加所有站点
+        :return: 字典形式的合并结果
+        """
+        return {**self.best, "sites": self.sites, "duplicates": len(self.sources)}
+
+
+def merge_results(items: Iterable[Dict[str, Any]]) -> List[MergedTorrent]:
+    """
+    合并多站点搜索结果中的重复资源，复杂度与结果数量成线性关系
+    :param items: 带 site 字段的种子字典
+    :return: 合并后的资源列表，顺序为各资源首次出现的顺序
+    """
+    groups: List[Optional[MergedTorrent]] = []
+    # 指纹键 -> 分组下标；分组被合并后通过 redirect 找到最终分组
+    index: Dict[str, int] = {}
+    redirect: Dict[int, int] = {}
+
+    def resolve(group_id: int) -> int:
+        while group_id in redirect:
+            group_id = redirect[group_id]
+        return group_id
+
+    for item in items:
+        keys = fingerprints(item)
+        found = sorted({resolve(index[key]) for key in keys if key in index})
+        if found:
+            target = found[0]
+            # 一个种子同时命中多个分组（例如一个按 infohash、一个按标题+大小），合并这些分组
+            for other in found[1:]:
+                groups[target].sources.extend(groups[other].sources)
+                groups[other] = None
+                redirect[other] = target
+        else:
+            target = len(groups)
+            groups.append(MergedTorrent())
+        groups[target].sources.append(item)
+        for key in keys:
+            index[key] = target
+    return [group for group in groups if group is not None]
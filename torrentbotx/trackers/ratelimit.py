@@ -0,0 +1,139 @@
+"""
+站点自适应限流
+
+每个 Tracker 实例持有一个限流器，由该实例的所有调用方共享：
+令牌桶限制请求速率，AIMD 并发窗口在收到 429/503 时减半并遵守 Retry-After，
+响应恢复正常后逐步加回并发。
+"""
+
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+THROTTLE_STATUS = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    解析 Retry-After 响应头
+    :param value: 秒数或 HTTP 日期
+    :return: 需要等待的秒数，无法解析时返回 None
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateLimiter:
+    def __init__(self, rate: float = 2.0, burst: int = 5, max_concurrency: int = 4,
+                 min_concurrency: int = 1, max_retries: int = 2,
+                 initial_backoff: float = 1.0, max_backoff: float = 60.0):
+        """
+        令牌桶 + AIMD 并发窗口限流器
+        :param rate: 每秒补充的令牌数（持续请求速率）
+        :param burst: 令牌桶容量（允许的突发请求数）
+        :param max_concurrency: 并发窗口上限
+        :param min_concurrency: 并发窗口下限
+        :param max_retries: 被限流时的最大重试次数
+        :param initial_backoff: 未提供 Retry-After 时的初始退避时间（秒）
+        :param max_backoff: 退避时间上限（秒）
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_retries = max_retries
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+
+        self.concurrency = float(max_concurrency)
+        self.in_flight = 0
+        self.throttled = 0
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._backoff = initial_backoff
+        self._cond = threading.Condition()
+
+    def _try_acquire(self) -> float:
+        """
+        尝试占用一个请求名额
+        :return: 0 表示成功，否则为建议的等待秒数
+        """
+        now = time.monotonic()
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self.in_flight >= int(self.concurrency):
+            # 等待其他请求释放名额，release 时会唤醒同步等待者
+            return 0.05
+        if self._tokens < 1:
+            return (1 - self._tokens) / self.rate
+        self._tokens -= 1
+        self.in_flight += 1
+        return 0.0
+
+    def acquire(self) -> None:
+        """阻塞直到获得请求名额"""
+        with self._cond:
+            while True:
+                wait = self._try_acquire()
+                if not wait:
+                    return
+                self._cond.wait(wait)
+
+    async def async_acquire(self) -> None:
+        """异步等待直到获得请求名额，可被取消"""
+        while True:
+            with self._cond:
+                wait = self._try_acquire()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def release(self, status_code: Optional[int] = None, retry_after: Optional[float] = None) -> None:
+        """
+        释放请求名额并根据响应调整并发窗口
+        :param status_code: HTTP 状态码，请求未得到响应时为 None
+        :param retry_after: Retry-After 指定的等待秒数
+        """
+        with self._cond:
+            self.in_flight = max(0, self.in_flight - 1)
+            if status_code in THROTTLE_STATUS:
+                self.throttled += 1
+                self.concurrency = max(self.min_concurrency, self.concurrency / 2)
+                delay = retry_after if retry_after is not None else self._backoff
+                self._blocked_until = max(self._blocked_until, time.monotonic() + min(delay, self.max_backoff))
+                self._backoff = min(self._backoff * 2, self.max_backoff)
+            elif status_code is not None and status_code < 400:
+                # 每个成功响应增加 1/窗口，约等于每轮请求增加一个并发
+                self.concurrency = min(self.max_concurrency, self.concurrency + 1 / self.concurrency)
+                self._backoff = self.initial_backoff
+            self._cond.notify_all()
+
+    @property
+    def retry_delay(self) -> float:
+        """距离限流解除还需等待的秒数"""
+        return max(0.0, self._blocked_until - time.monotonic())
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """
+        限流器状态
+        :return: 当前并发窗口、进行中的请求数、被限流次数及剩余等待时间
+        """
+        return {
+            "concurrency": self.concurrency,
+            "in_flight": self.in_flight,
+            "throttled": self.throttled,
+            "retry_delay": self.retry_delay,
+        }
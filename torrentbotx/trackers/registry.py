@@ -0,0 +1,158 @@
+"""
+Tracker 注册表
+
+按站点保存长期存活的 Tracker 实例，所有实例共用同一个传输层连接池，
+避免每次调用都新建实例和 TCP/TLS 连接。
+"""
+
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from torrentbotx.config.config import load_config
+from torrentbotx.trackers.cache import DEFAULT_SEARCH_CACHE
+from torrentbotx.trackers.ratelimit import AdaptiveRateLimiter
+from torrentbotx.utils.logger import get_logger
+from torrentbotx.utils.plugins import LazyRegistry
+
+if TYPE_CHECKING:
+    from torrentbotx.trackers.common import BaseTracker
+
+logger = get_logger("trackers.registry")
+
+# Tracker 初始化：站点模块（及 requests、httpx）在第一次创建该站点实例时才导入，
+# 第三方站点可以通过 torrentbotx.trackers entry point 提供
+TRACKERS = LazyRegistry("torrentbotx.trackers", {
+    "mteam": "torrentbotx.trackers.mteam:MTeamTracker",
+    "dicmusic": "torrentbotx.trackers.dicmusic:DicMusicTracker",
+    "carpt": "torrentbotx.trackers.carpt:CarptTracker",
+    "ptskit": "torrentbotx.trackers.ptskit:PTSKitTracker",
+})
+
+# 这些配置变化时，下次获取 Tracker 会按新配置重建
+CONFIG_PREFIXES = ("PT_SITES", "SEARCH_CACHE_", "TRACKER_", "LOCAL_INDEX_")
+
+_instances: Dict[str, "BaseTracker"] = {}
+_configured: Optional[List[str]] = None
+_subscribed: set = set()
+_lock = threading.RLock()
+
+
+def normalize_site_name(name: str) -> str:
+    """
+    规范化站点名称，使 "M-Team"、"m_team" 等写法都能对应到 TRACKERS 的键。
+    :param name: 站点名称
+    :return: 规范化后的站点名称
+    """
+    return "".join(ch for ch in name.lower() if ch not in "-_ ")
+
+
+def _on_config_change(changes) -> None:
+    global _configured
+    logger.info(f"站点配置已变更（{', '.join(sorted(changes))}），下次使用时重建 Tracker")
+    with _lock:
+        _configured = None
+
+
+def _build_trackers(config) -> None:
+    """根据配置创建传输层与所有站点实例，调用方需持有 _lock"""
+    global _configured
+    from torrentbotx.trackers.breaker import CircuitBreaker
+    from torrentbotx.trackers.transport import TrackerTransport, set_default_transport
+
+    if hasattr(config, "subscribe") and id(config) not in _subscribed:
+        config.subscribe(CONFIG_PREFIXES, _on_config_change)
+        _subscribed.add(id(config))
+    set_default_transport(TrackerTransport.from_config(config))
+    DEFAULT_SEARCH_CACHE.configure(
+        max_entries=config.get("SEARCH_CACHE_SIZE"),
+        ttl=config.get("SEARCH_CACHE_TTL"),
+        stale_ttl=config.get("SEARCH_CACHE_STALE_TTL"),
+    )
+    local_index = None
+    if config.get("LOCAL_INDEX_ENABLED", True):
+        # 本地索引依赖数据库模块，只在启用时导入
+        from torrentbotx.trackers.local_index import LocalIndex
+        local_index = LocalIndex()
+
+    _instances.clear()
+    configured = []
+    for item in config.get("PT_SITES", []) or []:
+        tracker_class = TRACKERS.get(normalize_site_name(item.name))
+        if not tracker_class:
+            logger.warning(f"未知的 PT 站点配置，已忽略: {item.name}")
+            continue
+        if item.cache_ttl is not None:
+            DEFAULT_SEARCH_CACHE.set_site_ttl(tracker_class.site, item.cache_ttl)
+        rate_limiter = AdaptiveRateLimiter(
+            rate=item.rate_limit,
+            burst=item.rate_burst,
+            max_concurrency=item.max_concurrency,
+        )
+        details_limiter = AdaptiveRateLimiter(
+            rate=item.details_rate_limit,
+            burst=item.details_burst,
+            max_concurrency=tracker_class.details_max_workers,
+        )
+        circuit_breaker = CircuitBreaker(
+            name=tracker_class.display_name,
+            failure_threshold=item.failure_threshold,
+            recovery_timeout=item.recovery_timeout,
+        )
+        tracker = tracker_class(api_key=item.api_key, base_url=item.api_url, rate_limiter=rate_limiter,
+                                circuit_breaker=circuit_breaker, details_limiter=details_limiter)
+        tracker.local_index = local_index
+        _instances[tracker_class.site] = tracker
+        configured.append(tracker_class.site)
+    _configured = configured
+
+
+def get_configured_trackers(config=None, refresh: bool = False) -> List["BaseTracker"]:
+    """
+    获取配置中 PT_SITES 对应的 Tracker 实例，首次调用时创建，之后复用。
+    :param config: 配置对象，为空时自动加载
+    :param refresh: 是否按配置重新创建所有实例
+    :return: Tracker 实例列表，未知站点会被忽略
+    """
+    with _lock:
+        if _configured is None or refresh:
+            _build_trackers(config or load_config())
+        return [_instances[site] for site in _configured]
+
+
+def get_tracker_by_name(name: str) -> "BaseTracker":
+    """
+    根据站点名称获取对应的 Tracker 实例，同一站点始终返回同一个实例。
+    :param name: 站点名称，如 "mteam"、"dicmusic" 等。
+    :return: 对应的 Tracker 类实例
+    """
+    site = normalize_site_name(name)
+    tracker_class = TRACKERS.get(site)
+    if not tracker_class:
+        raise ValueError(f"不支持的 Tracker : {name}")
+    with _lock:
+        if _configured is None:
+            _build_trackers(load_config())
+        tracker = _instances.get(site)
+        if tracker is None:
+            # 未在 PT_SITES 中配置的站点使用默认参数创建
+            tracker = _instances[site] = tracker_class()
+        return tracker
+
+
+def get_tracker_status() -> Dict[str, dict]:
+    """
+    获取已配置站点的熔断器状态，不发送任何请求
+    :return: 站点 -> 熔断器状态字典（含 display_name）
+    """
+    return {
+        tracker.site: {"display_name": tracker.display_name, **tracker.circuit_breaker.stats}
+        for tracker in get_configured_trackers()
+    }
+
+
+def reset_trackers() -> None:
+    """清空注册表，下次获取时重新创建实例"""
+    global _configured
+    with _lock:
+        _instances.clear()
+        _configured = None
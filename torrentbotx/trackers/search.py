@@ -0,0 +1,143 @@
+"""
+多站点并发搜索
+
+所有已配置站点通过同一个 httpx 异步客户端并发搜索，在截止时间内返回已到达的结果，
+未按时返回的站点会被标记为超时，整体延迟由最快的站点决定，而不是所有站点延迟之和。
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+
+from torrentbotx.trackers.common import BaseTracker
+from torrentbotx.trackers.merge import MergedTorrent, merge_results
+from torrentbotx.trackers.registry import get_configured_trackers
+from torrentbotx.trackers.transport import get_default_transport
+from torrentbotx.utils.logger import get_logger
+
+logger = get_logger("trackers.search")
+
+DEFAULT_SEARCH_DEADLINE = 10.0
+
+
+class SearchAllResult:
+    def __init__(self):
+        """
+        多站点搜索结果
+        results: 站点 -> 该站点返回的搜索结果
+        timed_out: 截止时间内未返回的站点
+        failed: 请求或解析失败的站点
+        elapsed: 实际耗时（秒）
+        """
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.timed_out: List[str] = []
+        self.failed: List[str] = []
+        self.elapsed: float = 0.0
+
+    @property
+    def items(self) -> List[Dict[str, Any]]:
+        """
+        合并后的种子列表，每一项都带有来源站点字段 "site"
+        :return: 种子字典列表
+        """
+        merged = []
+        for site, data in self.results.items():
+            for item in data.get("data") or []:
+                merged.append({**item, "site": site})
+        return merged
+
+    @property
+    def merged(self) -> List[MergedTorrent]:
+        """
+        跨站点去重后的资源列表，同一资源只保留一条并列出所有提供它的站点
+        :return: MergedTorrent 列表
+        """
+        return merge_results(self.items)
+
+    @property
+    def complete(self) -> bool:
+        """所有站点均在截止时间内成功返回"""
+        return not self.timed_out and not self.failed
+
+    def to_dict(self) -> dict:
+        """
+        将搜索结果转换为字典
+        :return: 字典形式的搜索结果
+        """
+        return {
+            "items": self.items,
+            "merged": [entry.to_dict() for entry in self.merged],
+            "timed_out": self.timed_out,
+            "failed": self.failed,
+            "elapsed": self.elapsed,
+        }
+
+
+async def async_search_all(keyword: str, page: int = 1, page_size: int = 5,
+                           deadline: float = DEFAULT_SEARCH_DEADLINE,
+                           trackers: Optional[Sequence[BaseTracker]] = None,
+                           client: Optional[httpx.AsyncClient] = None) -> SearchAllResult:
+    """
+    并发搜索所有站点，截止时间到达后返回已完成的部分结果
+    :param keyword: 搜索关键词
+    :param page: 页码
+    :param page_size: 每页的种子数量
+    :param deadline: 截止时间（秒）
+    :param trackers: 参与搜索的 Tracker 列表，为空时使用配置中的全部站点
+    :param client: httpx 异步客户端，为空时各站点使用传输层为当前事件循环共享的客户端
+    :return: SearchAllResult 实例
+    """
+    if trackers is None:
+        trackers = get_configured_trackers()
+
+    result = SearchAllResult()
+    if not trackers:
+        logger.warning("未配置任何 PT 站点，跳过搜索")
+        return result
+
+    started = time.monotonic()
+    tasks = {
+        asyncio.create_task(tracker.async_search_torrents(keyword, page, page_size, client=client)): tracker.site
+        for tracker in trackers
+    }
+    done, pending = await asyncio.wait(tasks, timeout=deadline)
+    for task in pending:
+        task.cancel()
+        result.timed_out.append(tasks[task])
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+        logger.warning(f"以下站点搜索超时（{deadline}s）: {', '.join(result.timed_out)}")
+
+    for task in done:
+        site = tasks[task]
+        data = None if task.exception() else task.result()
+        if data is None:
+            result.failed.append(site)
+        else:
+            result.results[site] = data
+
+    result.elapsed = time.monotonic() - started
+    return result
+
+
+def search_all(keyword: str, page: int = 1, page_size: int = 5,
+               deadline: float = DEFAULT_SEARCH_DEADLINE,
+               trackers: Optional[Sequence[BaseTracker]] = None) -> SearchAllResult:
+    """
+    async_search_all 的同步入口，不能在运行中的事件循环内调用
+    :param keyword: 搜索关键词
+    :param page: 页码
+    :param page_size: 每页的种子数量
+    :param deadline: 截止时间（秒）
+    :param trackers: 参与搜索的 Tracker 列表，为空时使用配置中的全部站点
+    :return: SearchAllResult 实例
+    """
+    async def run():
+        # asyncio.run 每次都会新建事件循环，使用随循环关闭的临时客户端
+        async with get_default_transport().new_async_client() as client:
+            return await async_search_all(keyword, page, page_size, deadline=deadline, trackers=trackers,
+                                          client=client)
+
+    return asyncio.run(run())
@@ -0,0 +1,46 @@
+"""
+进行中请求合并（singleflight）
+
+同一个键同时只执行一次加载函数，其余并发调用方等待并共享这次调用的结果。
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """
+        执行 func，若同一个键已有进行中的调用则等待其结果
+        :param key: 合并请求使用的键
+        :param func: 加载函数
+        :return: 加载结果，加载函数抛出的异常会传递给所有等待者
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def in_flight(self) -> int:
+        """当前进行中的调用数量"""
+        return len(self._calls)
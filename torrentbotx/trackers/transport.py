@@ -0,0 +1,185 @@
+"""
+站点共享 HTTP 传输层
+
+所有 Tracker 共用一个带连接池的 requests.Session（以及每个事件循环一个 httpx.AsyncClient），
+复用 keep-alive 连接，协商 gzip/brotli 压缩，连接超时与读取超时分开配置。
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Optional, Tuple
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+from torrentbotx.utils.logger import get_logger
+
+logger = get_logger("trackers.transport")
+
+
+class TrackerTransport:
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 20,
+                 connect_timeout: float = 5.0, read_timeout: float = 20.0,
+                 max_retries: int = 2, keepalive_expiry: float = 60.0):
+        """
+        :param pool_connections: 连接池缓存的主机数量
+        :param pool_maxsize: 每个主机的最大连接数
+        :param connect_timeout: 建立连接的超时时间（秒）
+        :param read_timeout: 读取响应的超时时间（秒）
+        :param max_retries: 建立连接失败时的重试次数（不会重试已发出的 POST）
+        :param keepalive_expiry: 异步客户端空闲连接的保活时间（秒）
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.keepalive_expiry = keepalive_expiry
+        # urllib3 的 ACCEPT_ENCODING 在安装了 brotli（见 requirements.txt）时包含 br，httpx 同样依赖它解码 br 响应
+        self.headers = {"Accept-Encoding": ACCEPT_ENCODING}
+        self._lock = threading.Lock()
+        self._async_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        self.session = self._build_session()
+
+    @classmethod
+    def from_config(cls, config) -> "TrackerTransport":
+        """
+        根据配置创建传输层
+        :param config: 配置对象
+        :return: TrackerTransport 实例
+        """
+        return cls(
+            pool_connections=config.get("TRACKER_POOL_CONNECTIONS", 10),
+            pool_maxsize=config.get("TRACKER_POOL_MAXSIZE", 20),
+            connect_timeout=config.get("TRACKER_CONNECT_TIMEOUT", 5.0),
+            read_timeout=config.get("TRACKER_READ_TIMEOUT", 20.0),
+            max_retries=config.get("TRACKER_MAX_RETRIES", 2),
+        )
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        """requests 使用的 (连接超时, 读取超时)"""
+        return self.connect_timeout, self.read_timeout
+
+    def _build_session(self) -> requests.Session:
+        session = requests.Session()
+        retry = Retry(total=self.max_retries, connect=self.max_retries, read=0, status=0, backoff_factor=0.3)
+        adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize,
+                              max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(self.headers)
+        return session
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """
+        通过共享连接池发送 POST 请求
+        :param url: 请求地址
+        :param kwargs: 传给 requests 的其他参数
+        :return: 响应对象
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.post(url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        通过共享连接池发送 GET 请求
+        :param url: 请求地址
+        :param kwargs: 传给 requests 的其他参数
+        :return: 响应对象
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def new_async_client(self) -> httpx.AsyncClient:
+        """
+        创建与共享配置一致的 httpx 异步客户端，由调用方负责关闭
+        :return: httpx.AsyncClient 实例
+        """
+        return httpx.AsyncClient(
+            headers=self.headers,
+            timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+            # 与同步连接池保持一致：最多 pool_connections 个主机，每个主机 pool_maxsize 个连接
+            limits=httpx.Limits(max_connections=self.pool_maxsize * self.pool_connections,
+                                max_keepalive_connections=self.pool_maxsize,
+                                keepalive_expiry=self.keepalive_expiry),
+            transport=httpx.AsyncHTTPTransport(retries=self.max_retries),
+        )
+
+    def get_async_client(self) -> httpx.AsyncClient:
+        """
+        获取当前事件循环共享的异步客户端（httpx 客户端不能跨事件循环使用）
+        :return: httpx.AsyncClient 实例
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None or client.is_closed:
+                client = self._async_clients[loop] = self.new_async_client()
+            return client
+
+    async def aclose(self) -> None:
+        """关闭同步连接池和所有异步客户端，当前事件循环的客户端直接等待关闭"""
+        current = asyncio.get_running_loop()
+        self.close(skip_loop=current)
+        with self._lock:
+            client = self._async_clients.pop(current, None)
+        if client is not None:
+            await client.aclose()
+
+    def close(self, skip_loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """
+        关闭同步连接池，并在各异步客户端所属的事件循环中调度关闭
+        :param skip_loop: 不处理该事件循环的客户端（由 aclose 自行等待关闭）
+        """
+        self.session.close()
+        with self._lock:
+            clients = [(loop, client) for loop, client in self._async_clients.items() if loop is not skip_loop]
+            for loop, _ in clients:
+                self._async_clients.pop(loop, None)
+        for loop, client in clients:
+            if client.is_closed or loop.is_closed():
+                # 事件循环已关闭时连接已随之释放
+                continue
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if loop is running:
+                loop.create_task(client.aclose())
+            elif loop.is_running():
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            else:
+                loop.run_until_complete(client.aclose())
+
+
+_default_transport: Optional[TrackerTransport] = None
+_default_lock = threading.Lock()
+
+
+def get_default_transport() -> TrackerTransport:
+    """
+    获取进程内共享的传输层，首次调用时使用默认参数创建
+    :return: TrackerTransport 实例
+    """
+    global _default_transport
+    with _default_lock:
+        if _default_transport is None:
+            _default_transport = TrackerTransport()
+        return _default_transport
+
+
+def set_default_transport(transport: TrackerTransport) -> None:
+    """
+    替换进程内共享的传输层，并关闭被替换的传输层的连接池
+    :param transport: 新的传输层
+    """
+    global _default_transport
+    with _default_lock:
+        previous, _default_transport = _default_transport, transport
+    if previous is not None and previous is not transport:
+        previous.close()
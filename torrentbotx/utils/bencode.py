@@ -0,0 +1,297 @@
+"""
+流式 bencode 解析
+
+种子文件只需要少量字段（名称、总大小、文件数、tracker），而 pieces、piece layers 和
+多文件列表可能有几十 MB。这里按偏移量遍历原始字节，只解码需要的值，其余值直接跳过，
+不会构造巨大的嵌套字典；infohash 直接对原始 info 片段做哈希，无需重新编码。
+"""
+
+import hashlib
+from typing import Any, Iterator, List, Optional, Tuple
+
+_DICT = ord("d")
+_LIST = ord("l")
+_INT = ord("i")
+_END = ord("e")
+_COLON = b":"
+
+
+class BencodeError(ValueError):
+    """bencode 数据格式错误"""
+
+
+def _read_int(data: bytes, pos: int) -> Tuple[int, int]:
+    """读取 pos 处的整数，返回 (值, 结束位置)"""
+    end = data.find(b"e", pos)
+    if end < 0:
+        raise BencodeError(f"整数未结束: {pos}")
+    try:
+        return int(data[pos + 1:end]), end + 1
+    except ValueError:
+        raise BencodeError(f"无效的整数: {pos}") from None
+
+
+def _read_string_bounds(data: bytes, pos: int) -> Tuple[int, int]:
+    """读取 pos 处字符串内容的 (起始, 结束) 位置"""
+    colon = data.find(_COLON, pos)
+    if colon < 0:
+        raise BencodeError(f"字符串长度未结束: {pos}")
+    try:
+        length = int(data[pos:colon])
+    except ValueError:
+        raise BencodeError(f"无效的字符串长度: {pos}") from None
+    end = colon + 1 + length
+    if length < 0 or end > len(data):
+        raise BencodeError(f"字符串超出数据范围: {pos}")
+    return colon + 1, end
+
+
+def skip_value(data: bytes, pos: int) -> int:
+    """
+    跳过 pos 处的一个值（可以是嵌套的字典或列表），不解码任何内容
+    :param data: bencode 数据
+    :param pos: 值的起始位置
+    :return: 值的结束位置
+    """
+    depth = 0
+    size = len(data)
+    while True:
+        if pos >= size:
+            raise BencodeError("数据意外结束")
+        c = data[pos]
+        if c == _DICT or c == _LIST:
+            depth += 1
+            pos += 1
+            continue
+        if c == _END:
+            if depth == 0:
+                raise BencodeError(f"多余的结束符: {pos}")
+            depth -= 1
+            pos += 1
+        elif c == _INT:
+            end = data.find(b"e", pos)
+            if end < 0:
+                raise BencodeError(f"整数未结束: {pos}")
+            pos = end + 1
+        elif 48 <= c <= 57:
+            pos = _read_string_bounds(data, pos)[1]
+        else:
+            raise BencodeError(f"无效的类型标记 {chr(c)!r}: {pos}")
+        if depth == 0:
+            return pos
+
+
+def iter_dict(data: bytes, pos: int) -> Iterator[Tuple[bytes, int, int]]:
+    """
+    遍历 pos 处的字典，值保持未解码状态
+    :param data: bencode 数据
+    :param pos: 字典的起始位置（'d'）
+    :return: (键, 值起始位置, 值结束位置) 迭代器
+    """
+    if data[pos] != _DICT:
+        raise BencodeError(f"期望字典: {pos}")
+    pos += 1
+    while True:
+        if pos >= len(data):
+            raise BencodeError("字典未结束")
+        if data[pos] == _END:
+            return
+        key_start, key_end = _read_string_bounds(data, pos)
+        value_end = skip_value(data, key_end)
+        yield data[key_start:key_end], key_end, value_end
+        pos = value_end
+
+
+def iter_list(data: bytes, pos: int) -> Iterator[Tuple[int, int]]:
+    """
+    遍历 pos 处的列表，元素保持未解码状态
+    :param data: bencode 数据
+    :param pos: 列表的起始位置（'l'）
+    :return: (元素起始位置, 元素结束位置) 迭代器
+    """
+    if data[pos] != _LIST:
+        raise BencodeError(f"期望列表: {pos}")
+    pos += 1
+    while True:
+        if pos >= len(data):
+            raise BencodeError("列表未结束")
+        if data[pos] == _END:
+            return
+        end = skip_value(data, pos)
+        yield pos, end
+        pos = end
+
+
+def _decode(data: bytes, pos: int) -> Tuple[Any, int]:
+    c = data[pos]
+    if c == _INT:
+        return _read_int(data, pos)
+    if 48 <= c <= 57:
+        start, end = _read_string_bounds(data, pos)
+        return data[start:end], end
+    if c == _LIST:
+        items = []
+        for start, end in iter_list(data, pos):
+            items.append(_decode(data, start)[0])
+            pos = end
+        return items, (pos + 1 if items else pos + 2)
+    if c == _DICT:
+        result = {}
+        end = pos + 1
+        for key, start, end in iter_dict(data, pos):
+            result[key] = _decode(data, start)[0]
+        return result, end + 1
+    raise BencodeError(f"无效的类型标记 {chr(c)!r}: {pos}")
+
+
+def decode(data: bytes, pos: int = 0) -> Any:
+    """
+    完整解码 pos 处的一个值，只应用于体积较小的值
+    :param data: bencode 数据
+    :param pos: 值的起始位置
+    :return: 解码结果（字符串保持为 bytes）
+    """
+    try:
+        return _decode(data, pos)[0]
+    except IndexError:
+        raise BencodeError("数据意外结束") from None
+
+
+class TorrentMeta:
+    def __init__(self, name: Optional[str], total_size: int, file_count: int, piece_length: Optional[int],
+                 info_hash_v1: Optional[str], info_hash_v2: Optional[str], announce: Optional[str],
+                 private: bool = False):
+        """
+        种子元信息
+        :param name: 种子名称
+        :param total_size: 所有文件的总大小（字节）
+        :param file_count: 文件数量
+        :param piece_length: 分块大小
+        :param info_hash_v1: v1 infohash（SHA-1，40 位十六进制），纯 v2 种子为 None
+        :param info_hash_v2: v2 infohash（SHA-256，64 位十六进制），v1 种子为 None
+        :param announce: 主 tracker 地址
+        :param private: 是否为私有种子
+        """
+        self.name = name
+        self.total_size = total_size
+        self.file_count = file_count
+        self.piece_length = piece_length
+        self.info_hash_v1 = info_hash_v1
+        self.info_hash_v2 = info_hash_v2
+        self.announce = announce
+        self.private = private
+
+    @property
+    def info_hash(self) -> str:
+        """下载器使用的种子标识：v1 infohash，纯 v2 种子为截断到 40 位的 v2 infohash"""
+        return self.info_hash_v1 or self.info_hash_v2[:40]
+
+    def to_dict(self) -> dict:
+        """
+        将元信息转换为字典
+        :return: 字典形式的元信息
+        """
+        return {
+            "name": self.name,
+            "total_size": self.total_size,
+            "file_count": self.file_count,
+            "piece_length": self.piece_length,
+            "info_hash": self.info_hash,
+            "info_hash_v1": self.info_hash_v1,
+            "info_hash_v2": self.info_hash_v2,
+            "announce": self.announce,
+            "private": self.private,
+        }
+
+
+def _text(value: Any) -> Optional[str]:
+    return value.decode("utf-8", errors="replace") if isinstance(value, bytes) else None
+
+
+def _sum_v1_files(data: bytes, pos: int) -> Tuple[int, int]:
+    """统计 v1 多文件列表的总大小与文件数，不解码路径"""
+    total = count = 0
+    for start, _ in iter_list(data, pos):
+        for key, value_start, _ in iter_dict(data, start):
+            if key == b"length":
+                total += _read_int(data, value_start)[0]
+                count += 1
+    return total, count
+
+
+def _sum_v2_file_tree(data: bytes, pos: int) -> Tuple[int, int]:
+    """统计 v2 file tree 的总大小与文件数，文件节点为键为空字符串的字典"""
+    total = count = 0
+    stack: List[int] = [pos]
+    while stack:
+        for key, value_start, _ in iter_dict(data, stack.pop()):
+            if key == b"":
+                for leaf_key, leaf_start, _ in iter_dict(data, value_start):
+                    if leaf_key == b"length":
+                        total += _read_int(data, leaf_start)[0]
+                        count += 1
+            elif data[value_start] == _DICT:
+                stack.append(value_start)
+    return total, count
+
+
+def parse_torrent(data: bytes) -> TorrentMeta:
+    """
+    解析种子文件，计算 infohash 并统计文件信息
+    :param data: 种子文件内容
+    :return: TorrentMeta 实例
+    :raises BencodeError: 数据不是有效的种子文件
+    """
+    if isinstance(data, (bytearray, memoryview)):
+        data = bytes(data)
+    if not data or data[0] != _DICT:
+        raise BencodeError("不是有效的种子文件")
+
+    try:
+        info_bounds = None
+        announce = None
+        for key, start, end in iter_dict(data, 0):
+            if key == b"info":
+                info_bounds = (start, end)
+            elif key == b"announce":
+                announce = _text(decode(data, start))
+        if info_bounds is None or data[info_bounds[0]] != _DICT:
+            raise BencodeError("种子文件缺少 info 字典")
+
+        info_start, info_end = info_bounds
+        fields = {}
+        for key, start, end in iter_dict(data, info_start):
+            if key in (b"name", b"length", b"piece length", b"meta version", b"private"):
+                fields[key] = decode(data, start)
+            elif key in (b"files", b"file tree"):
+                fields[key] = start
+            elif key == b"pieces":
+                fields[key] = True
+
+        if b"length" in fields:
+            total_size, file_count = fields[b"length"], 1
+        elif b"files" in fields:
+            total_size, file_count = _sum_v1_files(data, fields[b"files"])
+        elif b"file tree" in fields:
+            total_size, file_count = _sum_v2_file_tree(data, fields[b"file tree"])
+        else:
+            total_size, file_count = 0, 0
+    except IndexError:
+        raise BencodeError("数据意外结束") from None
+
+    # 直接对原始 info 片段做哈希，避免重新编码带来的字段顺序等差异
+    info = memoryview(data)[info_start:info_end]
+    is_v2 = fields.get(b"meta version") == 2
+    info_hash_v1 = hashlib.sha1(info).hexdigest() if not is_v2 or b"pieces" in fields else None
+    info_hash_v2 = hashlib.sha256(info).hexdigest() if is_v2 else None
+
+    return TorrentMeta(
+        name=_text(fields.get(b"name")),
+        total_size=total_size,
+        file_count=file_count,
+        piece_length=fields.get(b"piece length"),
+        info_hash_v1=info_hash_v1,
+        info_hash_v2=info_hash_v2,
+        announce=announce,
+        private=fields.get(b"private") == 1,
+    )
@@ -0,0 +1,92 @@
+"""
+延迟加载的插件注册表
+
+注册表只保存 "名称 -> 模块路径" 的映射，第一次按名称获取时才导入对应模块，
+未配置的下载器、站点和通知渠道不会被导入。第三方包可以通过 entry points
+（group 为注册表的 group）提供额外的实现，格式与内置映射相同："package.module:attr"。
+"""
+
+import importlib
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+
+from torrentbotx.utils.logger import get_logger
+
+logger = get_logger("utils.plugins")
+
+
+class LazyRegistry:
+    def __init__(self, group: str, modules: Optional[Dict[str, str]] = None):
+        """
+        延迟加载的注册表
+        :param group: entry points 分组名，如 torrentbotx.downloaders
+        :param modules: 名称 -> "模块路径:属性"；省略属性时导入模块，由模块自行调用 register 注册
+        """
+        self.group = group
+        self.modules: Dict[str, str] = dict(modules or {})
+        self._loaded: Dict[str, Any] = {}
+        self._entry_points_loaded = False
+        self._lock = threading.RLock()
+
+    def register(self, name: str, obj: Any) -> None:
+        """
+        直接注册已加载的实现
+        :param name: 名称
+        :param obj: 实现（通常是类）
+        """
+        with self._lock:
+            self._loaded[name] = obj
+
+    def _load_entry_points(self) -> None:
+        if self._entry_points_loaded:
+            return
+        self._entry_points_loaded = True
+        # importlib.metadata 会扫描已安装的包，只在内置映射中找不到名称时才调用
+        from importlib.metadata import entry_points
+        for entry_point in entry_points(group=self.group):
+            self.modules.setdefault(entry_point.name, entry_point.value)
+
+    def _resolve(self, name: str) -> Any:
+        path = self.modules.get(name)
+        if path is None:
+            self._load_entry_points()
+            path = self.modules.get(name)
+        if path is None:
+            return None
+        module_name, _, attr = path.partition(":")
+        module = importlib.import_module(module_name)
+        if attr:
+            self._loaded[name] = getattr(module, attr)
+        return self._loaded.get(name)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """
+        按名称获取实现，首次获取时导入对应模块
+        :param name: 名称
+        :param default: 不存在时的返回值
+        """
+        with self._lock:
+            if name not in self._loaded:
+                self._resolve(name)
+            return self._loaded.get(name, default)
+
+    def __getitem__(self, name: str) -> Any:
+        obj = self.get(name)
+        if obj is None:
+            raise KeyError(name)
+        return obj
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.modules or name in self._loaded
+
+    def names(self) -> List[str]:
+        """所有内置和已注册的名称（不导入任何模块）"""
+        return list(dict.fromkeys([*self.modules, *self._loaded]))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names())
+
+    def loaded(self) -> Dict[str, Any]:
+        """已经导入的实现"""
+        with self._lock:
+            return dict(self._loaded)